@@ -203,4 +203,5 @@ class ProcDataModel(QtCore.QAbstractTableModel):
 
         else:
             return False
+        self.prj.cur.proc.modified()
         return True
@@ -8,6 +8,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib import rc_context
 
+from hyo2.ssm2.app.gui.soundspeedmanager.widgets.decimation import decimate
 from hyo2.ssm2.app.gui.soundspeedmanager.widgets.widget import AbstractWidget
 from hyo2.ssm2.app.gui.soundspeedmanager.widgets.navtoolbar import NavToolbar
 
@@ -59,6 +60,9 @@ class DataPlots(AbstractWidget):
         self.dot_style = "x"
         self.dot_ms = 1
         self.dot_alpha = 0.6
+        self.lod_points_per_pixel = 4  # level of detail for the decimated data lines
+        self.lod_data = dict()  # data line -> full (x, y) arrays
+        self.blit_background = None
 
         # outline ui
         self.top_widget = QtWidgets.QWidget()
@@ -76,6 +80,7 @@ class DataPlots(AbstractWidget):
             self.c.setFocusPolicy(QtCore.Qt.ClickFocus)  # key for press events!!!
             self.c.setFocus()
             self.vbox.addWidget(self.c)
+            self.c.mpl_connect('draw_event', self.on_draw)
 
             # axes
             self.speed_ax = self.f.add_subplot(131)
@@ -509,6 +514,7 @@ class DataPlots(AbstractWidget):
                 self._draw_speed()
                 self._draw_temp()
                 self._draw_sal()
+                self._init_lod()
                 self.is_drawn = True
 
             self._draw_grid()
@@ -521,28 +527,22 @@ class DataPlots(AbstractWidget):
         with rc_context(self.rc_context):
             # speed
             if self.speed_sis:
-                self.speed_sis.set_xdata(self.lib.cur.sis.speed[self.svi])
-                self.speed_sis.set_ydata(self.lib.cur.sis.depth[self.svi])
+                self._set_lod_data(self.speed_sis, self.lib.cur.sis.speed[self.svi], self.lib.cur.sis.depth[self.svi])
             if self.speed_valid:
-                self.speed_valid.set_xdata(self.lib.cur.proc.speed[self.vi])
-                self.speed_valid.set_ydata(self.lib.cur.proc.depth[self.vi])
+                self._set_lod_data(self.speed_valid, self.lib.cur.proc.speed[self.vi], self.lib.cur.proc.depth[self.vi])
             if self.speed_invalid:
-                self.speed_invalid.set_xdata(self.lib.cur.proc.speed[self.ii])
-                self.speed_invalid.set_ydata(self.lib.cur.proc.depth[self.ii])
+                self._set_lod_data(self.speed_invalid, self.lib.cur.proc.speed[self.ii],
+                                   self.lib.cur.proc.depth[self.ii])
             # temp
             if self.temp_valid:
-                self.temp_valid.set_xdata(self.lib.cur.proc.temp[self.vi])
-                self.temp_valid.set_ydata(self.lib.cur.proc.depth[self.vi])
+                self._set_lod_data(self.temp_valid, self.lib.cur.proc.temp[self.vi], self.lib.cur.proc.depth[self.vi])
             if self.temp_invalid:
-                self.temp_invalid.set_xdata(self.lib.cur.proc.temp[self.ii])
-                self.temp_invalid.set_ydata(self.lib.cur.proc.depth[self.ii])
+                self._set_lod_data(self.temp_invalid, self.lib.cur.proc.temp[self.ii], self.lib.cur.proc.depth[self.ii])
             # sal
             if self.sal_valid:
-                self.sal_valid.set_xdata(self.lib.cur.proc.sal[self.vi])
-                self.sal_valid.set_ydata(self.lib.cur.proc.depth[self.vi])
+                self._set_lod_data(self.sal_valid, self.lib.cur.proc.sal[self.vi], self.lib.cur.proc.depth[self.vi])
             if self.sal_invalid:
-                self.sal_invalid.set_xdata(self.lib.cur.proc.sal[self.ii])
-                self.sal_invalid.set_ydata(self.lib.cur.proc.depth[self.ii])
+                self._set_lod_data(self.sal_invalid, self.lib.cur.proc.sal[self.ii], self.lib.cur.proc.depth[self.ii])
 
             if not self.lib.use_sis():  # in case that SIS was disabled
                 return
@@ -659,6 +659,53 @@ class DataPlots(AbstractWidget):
         with rc_context(self.rc_context):
             self.c.draw_idle()
 
+    def _lod_lines(self):
+        """The data lines that are decimated and redrawn by blitting"""
+        return [line for line in (self.speed_sis, self.speed_valid, self.speed_invalid, self.temp_valid,
+                                  self.temp_invalid, self.sal_valid, self.sal_invalid) if line is not None]
+
+    def _init_lod(self):
+        self.lod_data = dict()
+        for line in self._lod_lines():
+            line.set_animated(True)  # drawn by on_draw and blit_data
+            self._set_lod_data(line, line.get_xdata(), line.get_ydata())
+
+        # the axes share the depth: the lines are decimated again on each zoom/pan
+        self.speed_ax.callbacks.connect('ylim_changed', self.on_depth_limits_changed)
+
+    def _set_lod_data(self, line, x, y):
+        """Store the full data of the line, and only display the samples required at the current level of detail"""
+        self.lod_data[line] = (np.asarray(x), np.asarray(y))
+        self._apply_lod(line)
+
+    def _apply_lod(self, line):
+        x, y = self.lod_data[line]
+        max_points = max(int(line.axes.bbox.height * self.lod_points_per_pixel), 100)
+        ids = decimate(values=x, depths=y, depth_range=line.axes.get_ylim(), max_points=max_points)
+        line.set_data(x[ids], y[ids])
+
+    def on_depth_limits_changed(self, _):
+        for line in self.lod_data:
+            self._apply_lod(line)
+
+    def on_draw(self, _):
+        """Store the background for blitting, then add the animated data lines"""
+        self.blit_background = self.c.copy_from_bbox(self.f.bbox)
+        for line in self.lod_data:
+            self.f.draw_artist(line)
+
+    def blit_data(self):
+        """Incremental redraw of the data lines only (e.g., after a flag edit)"""
+        if self.blit_background is None:
+            self.c.draw_idle()
+            return
+
+        self.c.restore_region(self.blit_background)
+        for line in self.lod_data:
+            self.f.draw_artist(line)
+        self.c.blit(self.f.bbox)
+        self.c.flush_events()
+
     def update_validity_indices(self):
         self.svi = self.lib.cur.sis_thinned  # sis valid indices (thinned!)
         self.vi = self.lib.cur.proc_valid  # proc valid indices
@@ -0,0 +1,44 @@
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def decimate(values: np.ndarray, depths: np.ndarray, depth_range: Optional[tuple] = None,
+             max_points: int = 2000) -> np.ndarray:
+    """Return the (sorted) indices of the samples to draw for a profile plot of values vs. depths
+
+    Only the samples within the passed depth range (plus the first sample outside on each side, so that the line
+    still crosses the viewport border) are selected. If they are more than max_points, the samples are split in
+    consecutive buckets and only the first, the last, the min and the max value of each bucket are kept. This
+    preserves the spikes that the user may want to flag.
+    """
+    values = np.asarray(values)
+    depths = np.asarray(depths)
+    nr_samples = values.shape[0]
+
+    if depth_range is None:
+        ids = np.arange(nr_samples)
+    else:
+        top, bottom = min(depth_range), max(depth_range)
+        inside = (depths >= top) & (depths <= bottom)
+        visible = inside.copy()
+        visible[:-1] |= inside[1:]
+        visible[1:] |= inside[:-1]
+        ids = np.flatnonzero(visible)
+
+    if ids.shape[0] <= max_points:
+        return ids
+
+    nr_buckets = max(max_points // 4, 1)
+    bucket = (np.arange(ids.shape[0]) * nr_buckets) // ids.shape[0]
+    starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+    ends = np.append(starts[1:], ids.shape[0]) - 1
+
+    # sorted by bucket and value: the first and the last entry of each bucket are its min and max
+    order = np.lexsort((values[ids], bucket))
+    keep = np.concatenate((starts, ends, order[starts], order[ends]))
+
+    return ids[np.unique(keep)]
@@ -651,9 +651,10 @@ class NavToolbar(NavigationToolbar2QT):
             x_selected = np.logical_and(self.prj.cur.proc.sal > min_xd, self.prj.cur.proc.sal < max_xd)
         selected = np.logical_and(y_selected, x_selected)
         self.prj.cur.proc.flag[np.logical_and(self.plot_win.vi, selected)] = Dicts.flags['user']
+        self.prj.cur.proc.modified()
         self.plot_win.update_data()
+        self.plot_win.blit_data()  # only the data lines are redrawn
 
-        self.canvas.draw_idle()
         self._xypress = None
         self._flag_start = None
         self._flag_end = None
@@ -797,9 +798,10 @@ class NavToolbar(NavigationToolbar2QT):
             x_selected = np.logical_and(self.prj.cur.proc.sal > min_xd, self.prj.cur.proc.sal < max_xd)
         selected = np.logical_and(y_selected, x_selected)
         self.prj.cur.proc.flag[np.logical_and(self.plot_win.ii, selected)] = Dicts.flags['valid']
+        self.prj.cur.proc.modified()
         self.plot_win.update_data()
+        self.plot_win.blit_data()  # only the data lines are redrawn
 
-        self.canvas.draw_idle()
         self._xypress = None
         self._flag_start = None
         self._flag_end = None
@@ -946,7 +948,7 @@ class NavToolbar(NavigationToolbar2QT):
         # logger.debug("plot flagged: %s" % flagged_flag)
         self.plot_win.set_invalid_visibility(flagged_flag)
 
-        self.canvas.draw_idle()
+        self.plot_win.blit_data()
 
     def grid_plot(self):
         grid_flag = self._actions['grid_plot'].isChecked()
@@ -96,6 +96,7 @@ class MainWin(QtWidgets.QMainWindow):
     def reload_settings(self):
         logger.debug("reload settings")
         try:
+            self.db.reload_settings()  # write the applied changes before the library reads them
             self.lib.reload_settings_from_db()
         except RuntimeError as e:
             msg = "Issue in reloading settings\n%s" % e
@@ -3,7 +3,10 @@ import os
 from enum import IntEnum
 import logging
 from typing import Optional, TYPE_CHECKING
+
+import numpy as np
 from netCDF4 import Dataset, num2date
+from scipy.spatial import cKDTree
 
 from hyo2.ssm2.lib.base.geodesy import Geodesy
 from hyo2.ssm2.lib.profile.dicts import Dicts
@@ -84,6 +87,9 @@ class RegOfsOffline:
         self._temp = None
         self._sal = None
 
+        self._tree = None
+        self._tree_key = None
+
     def query(self, nc_path: str, lat: float, lon: float) -> Optional[ProfileList]:
         if not os.path.exists(nc_path):
             raise RuntimeError('Unable to locate %s' % nc_path)
@@ -137,18 +143,7 @@ class RegOfsOffline:
             progress.end()
             return None
 
-        min_dist = 100000.0
-        min_idx = None
-        for idx, _ in enumerate(self._lats):
-            nc_lat = self._lats[idx]
-            nc_lon = self._lons[idx]
-            if nc_lon > 180.0:
-                nc_lon = nc_lon - 360.0
-            nc_dist = self.g.distance(nc_lon, nc_lat, lon, lat)
-            # logger.debug('loc: %.6f, %.6f -> %.6f' % (nc_lat, nc_lon, nc_dist))
-            if nc_dist < min_dist:
-                min_dist = nc_dist
-                min_idx = idx
+        min_idx, min_dist = self._nearest_node(nc_path=nc_path, lat=lat, lon=lon)
         if min_dist >= 10000.0:
             logger.error("location too far from model nodes: %.f" % min_dist)
             self.clear_data()
@@ -193,6 +188,53 @@ class RegOfsOffline:
         progress.end()
         return profiles
 
+    # nearest node
+
+    candidates = 8  # nearest nodes (by chord length) evaluated with the geodesic distance
+
+    @classmethod
+    def _ecef(cls, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Earth-centered, earth-fixed coordinates on the WGS84 ellipsoid"""
+        a = 6378137.0
+        e2 = 6.69437999014e-3
+        lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+        lon_rad = np.radians(np.asarray(lons, dtype=np.float64))
+        n = a / np.sqrt(1.0 - e2 * np.sin(lat_rad) ** 2)
+        return np.column_stack((n * np.cos(lat_rad) * np.cos(lon_rad),
+                                n * np.cos(lat_rad) * np.sin(lon_rad),
+                                n * (1.0 - e2) * np.sin(lat_rad)))
+
+    def _node_tree(self, nc_path: str) -> cKDTree:
+        """Spatial index of the mesh nodes, built once per offline file and only kept in memory"""
+        nc_stat = os.stat(nc_path)
+        key = (os.path.abspath(nc_path), nc_stat.st_size, nc_stat.st_mtime, self._lats.size)
+        if (self._tree is not None) and (self._tree_key == key):
+            return self._tree
+
+        self._tree = cKDTree(self._ecef(self._lats, self._lons))
+        self._tree_key = key
+        logger.debug('built node index: %s' % nc_path)
+        return self._tree
+
+    def _nearest_node(self, nc_path: str, lat: float, lon: float) -> tuple:
+        """Return the index of the closest mesh node and its geodesic distance"""
+        tree = self._node_tree(nc_path=nc_path)
+        k = min(self.candidates, tree.n)
+        _, candidates = tree.query(self._ecef([lat], [lon])[0], k=k)
+        candidates = np.atleast_1d(candidates)
+
+        min_dist = 100000.0
+        min_idx = None
+        for idx in candidates:
+            nc_lon = self._lons[idx]
+            if nc_lon > 180.0:
+                nc_lon = nc_lon - 360.0
+            nc_dist = self.g.distance(nc_lon, self._lats[idx], lon, lat)
+            if nc_dist < min_dist:
+                min_dist = nc_dist
+                min_idx = int(idx)
+        return min_idx, min_dist
+
     def clear_data(self) -> None:
         """Delete the data and reset the last loaded day"""
         logger.debug("clearing data")
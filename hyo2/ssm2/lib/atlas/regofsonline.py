@@ -226,6 +226,7 @@ class RegOfsOnline(AbstractAtlas):
         temp_in_situ = np.zeros(self._d.size)
         d = np.zeros(self._d.size)
         sal = np.zeros(self._d.size)
+        has_values = np.zeros(self._d.size, dtype=bool)
         num_values = 0
         for i in range(self._d.size):
 
@@ -252,12 +253,9 @@ class RegOfsOnline(AbstractAtlas):
             temp_pot[i] = t_closest
             sal[i] = s_closest
             d[i] = self._d[i]
-
-            # Calculate in-situ temperature
-            p = Oc.d2p(d[i], lat)
-            temp_in_situ[i] = Oc.in_situ_temp(s=sal[i], t=t_closest, p=p, pr=self._ref_p)
-            # logger.info("%02d: %6.1f %6.1f > T/S/Dist: %3.1f %3.1f %3.1f [pot.temp. %3.1f]"
-            #             % (i, d[i], p, temp_in_situ[i], s_closest, d_closest, t_closest))
+            has_values[i] = True
+            # logger.info("%02d: %6.1f > T/S/Dist: %3.1f %3.1f %3.1f"
+            #             % (i, d[i], t_closest, s_closest, d_closest))
 
             num_values += 1
 
@@ -265,6 +263,10 @@ class RegOfsOnline(AbstractAtlas):
             logger.info("no data from lookup!")
             return None
 
+        # Calculate in-situ temperature (for all the levels at once)
+        p = Oc.d2p(d[has_values], lat)
+        temp_in_situ[has_values] = Oc.in_situ_temp(s=sal[has_values], t=temp_pot[has_values], p=p, pr=self._ref_p)
+
         # ind = np.nanargmin(distances[0])
         # ind2 = np.unravel_index(ind, distances[0].shape)
         # switching to the query location
@@ -1,5 +1,4 @@
 import os
-import math
 import numpy as np
 from netCDF4 import Dataset
 import logging
@@ -9,6 +8,7 @@ from typing import Union, TYPE_CHECKING
 from hyo2.abc2.lib.onedrive import OneDrive
 
 from hyo2.ssm2.lib.atlas.abstract import AbstractAtlas
+from hyo2.ssm2.lib.atlas.woagridcache import WoaGridCache
 from hyo2.ssm2.lib.profile.profile import Profile
 from hyo2.ssm2.lib.profile.profilelist import ProfileList
 from hyo2.ssm2.lib.profile.dicts import Dicts
@@ -35,7 +35,13 @@ class Woa09(AbstractAtlas):
         self.s_seasonal = None
         self.landsea = None
         # self.basin = None
+        self.cache = WoaGridCache(data_folder=self.data_folder,
+                                  extra_names=['t_an_annual', 'depth_annual', 'time_monthly', 'time_seasonal'])
 
+        self.lat = None
+        self.lon = None
+        self.time_monthly = None
+        self.time_seasonal = None
         self.lat_step = None
         self.lon_step = None
         self.lat_0 = None
@@ -77,7 +83,30 @@ class Woa09(AbstractAtlas):
             return False
 
     def load_grids(self) -> bool:
-        """Load atlas grids"""
+        """Load atlas grids (from the memory-mapped cache, if converted)"""
+        if self.cache.load():
+            self.landsea = self.cache.landsea
+            self.lat = self.cache.lat
+            self.lon = self.cache.lon
+            self.time_monthly = self.cache.extras['time_monthly']
+            self.time_seasonal = self.cache.extras['time_seasonal']
+            self.num_levels = self.cache.depth.size
+
+        elif not self._load_netcdf_grids():
+            return False
+
+        # What's our grid interval in lat/long
+        self.lat_step = self.lat[1] - self.lat[0]
+        self.lat_0 = self.lat[0]
+        self.lon_step = self.lon[1] - self.lon[0]
+        self.lon_0 = self.lon[0]
+        logger.debug("0(%.3f, %.3f); step(%.3f, %.3f); depths: %s"
+                     % (self.lat_0, self.lon_0, self.lat_step, self.lon_step, self.num_levels))
+
+        self.has_data_loaded = True
+        return True
+
+    def _load_netcdf_grids(self) -> bool:
         try:
             self.t_annual = Dataset(os.path.join(self.data_folder, "temperature_annual_1deg.nc"))
             self.t_monthly = Dataset(os.path.join(self.data_folder, "temperature_monthly_1deg.nc"))
@@ -93,48 +122,73 @@ class Woa09(AbstractAtlas):
             logger.error("issue in reading the netCDF data: %s" % e)
             return False
 
-        # What's our grid interval in lat/long
-        self.lat_step = self.t_monthly.variables['lat'][1] - self.t_monthly.variables['lat'][0]
-        self.lat_0 = self.t_monthly.variables['lat'][0]
-        self.lon_step = self.t_monthly.variables['lon'][1] - self.t_monthly.variables['lon'][0]
-        self.lon_0 = self.t_monthly.variables['lon'][0]
+        self.lat = self.t_monthly.variables['lat'][:]
+        self.lon = self.t_monthly.variables['lon'][:]
+        self.time_monthly = self.t_monthly.variables['time'][:]
+        self.time_seasonal = self.t_seasonal.variables['time'][:]
         # How many depth levels do we have?
         self.num_levels = self.t_seasonal.variables['depth'].size
-        logger.debug("0(%.3f, %.3f); step(%.3f, %.3f); depths: %s"
-                     % (self.lat_0, self.lon_0, self.lat_step, self.lon_step, self.num_levels))
+        return True
 
+    def convert_grids(self) -> bool:
+        """One-time conversion of the netCDF grids to the memory-mapped cache"""
+        self.clear_data()
+        if not self._load_netcdf_grids():
+            return False
         self.has_data_loaded = True
-        return True
+
+        sources = [(self.t_monthly, self.s_monthly, i) for i in range(12)] + \
+                  [(self.t_seasonal, self.s_seasonal, i) for i in range(4)]
+        extras = {
+            't_an_annual': self.t_annual.variables['t_an'][0],
+            'depth_annual': self.t_annual.variables['depth'][:],
+            'time_monthly': self.time_monthly,
+            'time_seasonal': self.time_seasonal
+        }
+        success = self.cache.convert(sources=sources, lat=self.lat, lon=self.lon, landsea=self.landsea,
+                                     extras=extras)
+
+        self.clear_data()
+        return success
+
+    def _profile(self, name: str, period_idx: int, lat_idx: int, lon_idx: int) -> np.ndarray:
+        """Retrieve a grid profile (12 monthly periods, then 4 seasonal ones), with the missing values as NaN"""
+        if self.cache.is_loaded:
+            profile = self.cache.profile(name, period_idx, lat_idx, lon_idx)
+        else:
+            if period_idx < 12:
+                ds = self.t_monthly if name.startswith('t') else self.s_monthly
+            else:
+                ds = self.t_seasonal if name.startswith('t') else self.s_seasonal
+            profile = ds.variables[name][period_idx % 12, :, lat_idx, lon_idx]
+        return np.ma.filled(profile.astype(np.float64), np.nan)
+
+    def _seasonal_depth(self) -> np.ndarray:
+        if self.cache.is_loaded:
+            return self.cache.period_depth(12)
+        return self.t_seasonal.variables['depth'][:]
 
     def get_depth(self, lat: float, lon: float) -> float:
         """This helper method retrieve the max valid depth based on location"""
         lat_idx, lon_idx = self.grid_coords(lat, lon)
-        t_profile = self.t_annual.variables['t_an'][0, :, lat_idx, lon_idx]
-        index = 0
-        for sample in range(t_profile.size):
-            if t_profile[sample] != 9.96921E36:  # null value
-                index = sample
-        return self.t_annual.variables['depth'][index]
+        if self.cache.is_loaded:
+            t_profile = np.ma.masked_invalid(self.cache.extras['t_an_annual'][:, lat_idx, lon_idx])
+            depth = self.cache.extras['depth_annual']
+        else:
+            t_profile = self.t_annual.variables['t_an'][0, :, lat_idx, lon_idx]
+            depth = self.t_annual.variables['depth'][:]
+        t_profile = np.ma.filled(t_profile.astype(np.float64), np.nan)
+        valid_idx = np.nonzero(~np.isnan(t_profile) & (t_profile != 9.96921E36))[0]  # null value
+        index = valid_idx[-1] if valid_idx.size > 0 else 0
+        return depth[index]
 
     def calc_month_idx(self, jday: int) -> None:
         """Calculate the month index based on the julian day"""
-        min_value = 367
-        i = 0
-        for d in self.t_monthly.variables['time'][:]:
-            if math.fabs(d - jday) < min_value:
-                min_value = math.fabs(d - jday)
-                self.month_idx = int(i)
-            i += 1
+        self.month_idx = int(np.argmin(np.abs(self.time_monthly - jday)))
 
     def calc_season_idx(self, jday: int) -> None:
         """Calculate the season index based on the julian day"""
-        min_value = 367
-        i = 0
-        for d in self.t_seasonal.variables['time'][:]:
-            if math.fabs(d - jday) < min_value:
-                min_value = math.fabs(d - jday)
-                self.season_idx = int(i)
-            i += 1
+        self.season_idx = int(np.argmin(np.abs(self.time_seasonal - jday)))
 
     def grid_coords(self, lat: float, lon: float) -> tuple:
         """This does a nearest neighbour lookup"""
@@ -204,8 +258,8 @@ class Woa09(AbstractAtlas):
 
             for this_lon_index in lon_offsets:
 
-                if this_lon_index >= self.t_monthly.variables['lon'].size:
-                    this_lon_index -= self.t_monthly.variables['lon'].size
+                if this_lon_index >= self.lon.size:
+                    this_lon_index -= self.lon.size
 
                 # Check to see if we're at sea or on land
                 if self.landsea[this_lat_index][this_lon_index] == 1:
@@ -213,8 +267,7 @@ class Woa09(AbstractAtlas):
                     continue
 
                 # calculate the distance to the grid node
-                dist = self.g.distance(lon, lat, self.t_monthly.variables['lon'][this_lon_index],
-                                       self.t_monthly.variables['lat'][this_lat_index])
+                dist = self.g.distance(lon, lat, self.lon[this_lon_index], self.lat[this_lat_index])
 
                 # Keep track of the closest valid grid node to report the pseudo-cast position
                 if dist < min_dist:
@@ -223,17 +276,17 @@ class Woa09(AbstractAtlas):
                     lon_idx = this_lon_index
 
                 # Extract monthly temperature and salinity profile for this location
-                t_profile = self.t_monthly.variables['t_an'][self.month_idx, :, this_lat_index, this_lon_index]
-                s_profile = self.s_monthly.variables['s_an'][self.month_idx, :, this_lat_index, this_lon_index]
+                t_profile = self._profile('t_an', self.month_idx, this_lat_index, this_lon_index)
+                s_profile = self._profile('s_an', self.month_idx, this_lat_index, this_lon_index)
                 # Extract seasonal temperature and salinity profile for this location
-                t_profile2 = self.t_seasonal.variables['t_an'][self.season_idx, :, this_lat_index, this_lon_index]
-                s_profile2 = self.s_seasonal.variables['s_an'][self.season_idx, :, this_lat_index, this_lon_index]
+                t_profile2 = self._profile('t_an', 12 + self.season_idx, this_lat_index, this_lon_index)
+                s_profile2 = self._profile('s_an', 12 + self.season_idx, this_lat_index, this_lon_index)
 
                 # Now do the same for the standard deviation profiles
-                t_sd_profile = self.t_monthly.variables['t_sd'][self.month_idx, :, this_lat_index, this_lon_index]
-                s_sd_profile = self.s_monthly.variables['s_sd'][self.month_idx, :, this_lat_index, this_lon_index]
-                t_sd_profile2 = self.t_seasonal.variables['t_sd'][self.season_idx, :, this_lat_index, this_lon_index]
-                s_sd_profile2 = self.s_seasonal.variables['s_sd'][self.season_idx, :, this_lat_index, this_lon_index]
+                t_sd_profile = self._profile('t_sd', self.month_idx, this_lat_index, this_lon_index)
+                s_sd_profile = self._profile('s_sd', self.month_idx, this_lat_index, this_lon_index)
+                t_sd_profile2 = self._profile('t_sd', 12 + self.season_idx, this_lat_index, this_lon_index)
+                s_sd_profile2 = self._profile('s_sd', 12 + self.season_idx, this_lat_index, this_lon_index)
 
                 # Overwrite the top of the seasonal profiles with the monthly profiles
                 t_profile2[0:t_profile.size] = t_profile
@@ -243,30 +296,26 @@ class Woa09(AbstractAtlas):
 
                 # For each element in the profile, only keep those whose distance is closer than values
                 # found from previous iterations (maintain the closest value at each depth level)
-                for i in range(t_profile2.size):
-                    if (dist < dist_arr[i]) and (t_profile2[i] < 50.0) and \
-                            (s_profile2[i] < 500.0) and (s_profile2[i] >= 0):
-                        t[i] = t_profile2[i]
-                        s[i] = s_profile2[i]
-                        dist_arr[i] = dist
+                # (the comparisons with missing values, as NaN, are always False)
+                with np.errstate(invalid='ignore'):
+                    closer = (dist < dist_arr) & (t_profile2 < 50.0) & (s_profile2 < 500.0) & (s_profile2 >= 0)
+                t[closer] = t_profile2[closer]
+                s[closer] = s_profile2[closer]
+                dist_arr[closer] = dist
 
                 # Now do the same thing for the temperature standard deviations
-                for i in range(t_sd_profile2.size):
-                    if (dist < dist_t_sd[i]) and (t_sd_profile2[i] < 50.0) and (t_sd_profile2[i] > -2):
-                        t_min[i] = t_profile2[i] - t_sd_profile2[i]
-                        if t_min[i] < -2.0:  # can't have overly cold water
-                            t_min[i] = -2.0
-                        t_max[i] = t_profile2[i] + t_sd_profile2[i]
-                        dist_t_sd[i] = dist
+                with np.errstate(invalid='ignore'):
+                    closer = (dist < dist_t_sd) & (t_sd_profile2 < 50.0) & (t_sd_profile2 > -2)
+                    t_min[closer] = np.maximum(t_profile2[closer] - t_sd_profile2[closer], -2.0)  # no overly cold water
+                t_max[closer] = t_profile2[closer] + t_sd_profile2[closer]
+                dist_t_sd[closer] = dist
 
                 # Now do the same thing for the salinity standard deviations
-                for i in range(s_sd_profile2.size):
-                    if (dist < dist_s_sd[i]) and (s_sd_profile2[i] < 500.0) and (s_sd_profile2[i] >= 0):
-                        s_min[i] = s_profile2[i] - s_sd_profile2[i]
-                        if s_min[i] < 0:  # Can't have a negative salinity
-                            s_min[i] = 0
-                        s_max[i] = s_profile2[i] + s_sd_profile2[i]
-                        dist_s_sd[i] = dist
+                with np.errstate(invalid='ignore'):
+                    closer = (dist < dist_s_sd) & (s_sd_profile2 < 500.0) & (s_sd_profile2 >= 0)
+                    s_min[closer] = np.maximum(s_profile2[closer] - s_sd_profile2[closer], 0)  # no negative salinity
+                s_max[closer] = s_profile2[closer] + s_sd_profile2[closer]
+                dist_s_sd[closer] = dist
 
                 num_visited += 1
 
@@ -292,7 +341,7 @@ class Woa09(AbstractAtlas):
                                hour=dtstamp.hour, minute=dtstamp.minute, second=dtstamp.second)
         ssp.meta.original_path = "WOA09_%s" % dtstamp.strftime("%Y%m%d_%H%M%S")
         ssp.init_data(num_values)
-        ssp.data.depth = self.t_seasonal.variables['depth'][0:num_values]
+        ssp.data.depth = self._seasonal_depth()[0:num_values]
         ssp.data.temp = t[valid]
         ssp.data.sal = s[valid]
         ssp.calc_data_speed()
@@ -317,7 +366,7 @@ class Woa09(AbstractAtlas):
                                    hour=dtstamp.hour, minute=dtstamp.minute, second=dtstamp.second)
         if num_values > 0:
             ssp_min.init_data(num_values)
-            ssp_min.data.depth = self.t_seasonal.variables['depth'][0:num_values]
+            ssp_min.data.depth = self._seasonal_depth()[0:num_values]
             ssp_min.data.temp = t_min[valid][0:num_values]
             ssp_min.data.sal = s_min[valid][0:num_values]
             ssp_min.calc_data_speed()
@@ -336,7 +385,7 @@ class Woa09(AbstractAtlas):
                                    hour=dtstamp.hour, minute=dtstamp.minute, second=dtstamp.second)
         if num_values > 0:
             ssp_max.init_data(num_values)
-            ssp_max.data.depth = self.t_seasonal.variables['depth'][0:num_values].astype(np.float64)
+            ssp_max.data.depth = self._seasonal_depth()[0:num_values].astype(np.float64)
             ssp_max.data.temp = t_max[valid][0:num_values]
             ssp_max.data.sal = s_max[valid][0:num_values]
             ssp_max.calc_data_speed()
@@ -374,7 +423,12 @@ class Woa09(AbstractAtlas):
             if self.s_seasonal:
                 self.s_seasonal.close()
             self.s_seasonal = None
+            self.cache.clear()
             self.landsea = None
+            self.lat = None
+            self.lon = None
+            self.time_monthly = None
+            self.time_seasonal = None
             # self.basin = None
             self.lat_step = None
             self.lon_step = None
@@ -9,6 +9,7 @@ from typing import Union, TYPE_CHECKING
 from hyo2.abc2.lib.onedrive import OneDrive
 
 from hyo2.ssm2.lib.atlas.abstract import AbstractAtlas
+from hyo2.ssm2.lib.atlas.woagridcache import WoaGridCache
 from hyo2.ssm2.lib.profile.profile import Profile
 from hyo2.ssm2.lib.profile.profilelist import ProfileList
 from hyo2.ssm2.lib.profile.dicts import Dicts
@@ -31,6 +32,7 @@ class Woa18(AbstractAtlas):
         self.t = list()
         self.s = list()
         self.landsea = None
+        self.cache = WoaGridCache(data_folder=self.data_folder)
 
         self.lat = None
         self.lon = None
@@ -81,7 +83,18 @@ class Woa18(AbstractAtlas):
             return False
 
     def load_grids(self) -> bool:
-        """Load atlas grids"""
+        """Load atlas grids (from the memory-mapped cache, if converted)"""
+        if self.cache.load():
+            self.lat = self.cache.lat
+            self.lon = self.cache.lon
+            self.landsea = self.cache.landsea
+            self.num_levels = self.cache.depth.size
+            self.has_data_loaded = True
+            return True
+
+        return self._load_netcdf_grids()
+
+    def _load_netcdf_grids(self) -> bool:
         try:
             for i in range(1, 17):
                 t_path = os.path.join(self.data_folder, "temp", "woa18_decav_t%02d_04.nc" % i)
@@ -115,15 +128,40 @@ class Woa18(AbstractAtlas):
         self.has_data_loaded = True
         return True
 
+    def convert_grids(self) -> bool:
+        """One-time conversion of the netCDF grids to the memory-mapped cache"""
+        self.clear_data()
+        if not self._load_netcdf_grids():
+            return False
+
+        sources = [(self.t[i], self.s[i], 0) for i in range(16)]
+        success = self.cache.convert(sources=sources, lat=self.lat, lon=self.lon, landsea=self.landsea)
+
+        self.clear_data()
+        return success
+
+    def _profile(self, name: str, period_idx: int, lat_idx: int, lon_idx: int) -> np.ndarray:
+        """Retrieve a grid profile, with the missing values as NaN"""
+        if self.cache.is_loaded:
+            profile = self.cache.profile(name, period_idx, lat_idx, lon_idx)
+        elif name.startswith('t'):
+            profile = self.t[period_idx].variables[name][0, :, lat_idx, lon_idx]
+        else:
+            profile = self.s[period_idx].variables[name][0, :, lat_idx, lon_idx]
+        return np.ma.filled(profile.astype(np.float64), np.nan)
+
+    def _depth(self, period_idx: int) -> np.ndarray:
+        if self.cache.is_loaded:
+            return self.cache.period_depth(period_idx)
+        return self.t[period_idx].variables['depth'][:]
+
     def get_depth(self, lat: float, lon: float) -> float:
         """This helper method retrieve the max valid depth based on location"""
         lat_idx, lon_idx = self.grid_coords(lat, lon)
-        t_profile = self.t[0].variables['t_an'][0, :, lat_idx, lon_idx]
-        index = 0
-        for sample in range(t_profile.size):
-            if t_profile[sample] != 9.96921E36:  # null value
-                index = sample
-        return self.t[0].variables['depth'][index]
+        t_profile = self._profile('t_an', 0, lat_idx, lon_idx)
+        valid_idx = np.nonzero(~np.isnan(t_profile) & (t_profile != 9.96921E36))[0]  # null value
+        index = valid_idx[-1] if valid_idx.size > 0 else 0
+        return self._depth(0)[index]
 
     def calc_indices(self, month: int) -> None:
         """Calculate the month index based on the julian day"""
@@ -229,17 +267,17 @@ class Woa18(AbstractAtlas):
                     lon_idx = this_lon_index
 
                 # Extract monthly temperature and salinity profile for this location
-                t_profile = self.t[self.month_idx].variables['t_an'][0, :, this_lat_index, this_lon_index]
-                s_profile = self.s[self.month_idx].variables['s_an'][0, :, this_lat_index, this_lon_index]
+                t_profile = self._profile('t_an', self.month_idx, this_lat_index, this_lon_index)
+                s_profile = self._profile('s_an', self.month_idx, this_lat_index, this_lon_index)
                 # Extract seasonal temperature and salinity profile for this location
-                t_profile2 = self.t[self.season_idx].variables['t_an'][0, :, this_lat_index, this_lon_index]
-                s_profile2 = self.s[self.season_idx].variables['s_an'][0, :, this_lat_index, this_lon_index]
+                t_profile2 = self._profile('t_an', self.season_idx, this_lat_index, this_lon_index)
+                s_profile2 = self._profile('s_an', self.season_idx, this_lat_index, this_lon_index)
 
                 # Now do the same for the standard deviation profiles
-                t_sd_profile = self.t[self.month_idx].variables['t_sd'][0, :, this_lat_index, this_lon_index]
-                s_sd_profile = self.s[self.month_idx].variables['s_sd'][0, :, this_lat_index, this_lon_index]
-                t_sd_profile2 = self.t[self.season_idx].variables['t_sd'][0, :, this_lat_index, this_lon_index]
-                s_sd_profile2 = self.s[self.season_idx].variables['s_sd'][0, :, this_lat_index, this_lon_index]
+                t_sd_profile = self._profile('t_sd', self.month_idx, this_lat_index, this_lon_index)
+                s_sd_profile = self._profile('s_sd', self.month_idx, this_lat_index, this_lon_index)
+                t_sd_profile2 = self._profile('t_sd', self.season_idx, this_lat_index, this_lon_index)
+                s_sd_profile2 = self._profile('s_sd', self.season_idx, this_lat_index, this_lon_index)
 
                 # Overwrite the top of the seasonal profiles with the monthly profiles
                 t_profile2[0:t_profile.size] = t_profile
@@ -250,35 +288,26 @@ class Woa18(AbstractAtlas):
                 # For each element in the profile, only keep those whose distance is closer than values
                 # found from previous iterations (maintain the closest value at each depth level)
                 # logger.debug("profile sz: %d\n%s" % (t_profile2.size, t_profile2))
-                for i in range(t_profile2.size):
-                    if dist >= dist_arr[i]:
-                        continue
-                    if (t_profile2[i] < 50.0) and (s_profile2[i] < 500.0) and (s_profile2[i] >= 0):
-                        t[i] = t_profile2[i]
-                        s[i] = s_profile2[i]
-                        dist_arr[i] = dist
+                # (the comparisons with missing values, as NaN, are always False)
+                with np.errstate(invalid='ignore'):
+                    closer = (dist < dist_arr) & (t_profile2 < 50.0) & (s_profile2 < 500.0) & (s_profile2 >= 0)
+                t[closer] = t_profile2[closer]
+                s[closer] = s_profile2[closer]
+                dist_arr[closer] = dist
 
                 # Now do the same thing for the temperature standard deviations
-                for i in range(t_sd_profile2.size):
-                    if dist >= dist_t_sd[i]:
-                        continue
-                    if (t_sd_profile2[i] < 50.0) and (t_sd_profile2[i] > -2):
-                        t_min[i] = t_profile2[i] - t_sd_profile2[i]
-                        if t_min[i] < -2.0:  # can't have overly cold water
-                            t_min[i] = -2.0
-                        t_max[i] = t_profile2[i] + t_sd_profile2[i]
-                        dist_t_sd[i] = dist
+                with np.errstate(invalid='ignore'):
+                    closer = (dist < dist_t_sd) & (t_sd_profile2 < 50.0) & (t_sd_profile2 > -2)
+                    t_min[closer] = np.maximum(t_profile2[closer] - t_sd_profile2[closer], -2.0)  # no overly cold water
+                t_max[closer] = t_profile2[closer] + t_sd_profile2[closer]
+                dist_t_sd[closer] = dist
 
                 # Now do the same thing for the salinity standard deviations
-                for i in range(s_sd_profile2.size):
-                    if dist >= dist_s_sd[i]:
-                        continue
-                    if (s_sd_profile2[i] < 500.0) and (s_sd_profile2[i] >= 0):
-                        s_min[i] = s_profile2[i] - s_sd_profile2[i]
-                        if s_min[i] < 0:  # Can't have a negative salinity
-                            s_min[i] = 0
-                        s_max[i] = s_profile2[i] + s_sd_profile2[i]
-                        dist_s_sd[i] = dist
+                with np.errstate(invalid='ignore'):
+                    closer = (dist < dist_s_sd) & (s_sd_profile2 < 500.0) & (s_sd_profile2 >= 0)
+                    s_min[closer] = np.maximum(s_profile2[closer] - s_sd_profile2[closer], 0)  # no negative salinity
+                s_max[closer] = s_profile2[closer] + s_sd_profile2[closer]
+                dist_s_sd[closer] = dist
 
                 num_visited += 1
 
@@ -302,7 +331,7 @@ class Woa18(AbstractAtlas):
         ssp.meta.utc_time = dt(year=dtstamp.year, month=dtstamp.month, day=dtstamp.day,
                                hour=dtstamp.hour, minute=dtstamp.minute, second=dtstamp.second)
         ssp.init_data(num_values)
-        ssp.data.depth = self.t[self.season_idx].variables['depth'][0:num_values]
+        ssp.data.depth = self._depth(self.season_idx)[0:num_values]
         ssp.data.temp = t[valid]
         ssp.data.sal = s[valid]
         ssp.calc_data_speed()
@@ -327,7 +356,7 @@ class Woa18(AbstractAtlas):
                                    hour=dtstamp.hour, minute=dtstamp.minute, second=dtstamp.second)
         if num_values > 0:
             ssp_min.init_data(num_values)
-            ssp_min.data.depth = self.t[self.season_idx].variables['depth'][0:num_values]
+            ssp_min.data.depth = self._depth(self.season_idx)[0:num_values]
             ssp_min.data.temp = t_min[valid][0:num_values]
             ssp_min.data.sal = s_min[valid][0:num_values]
             ssp_min.calc_data_speed()
@@ -346,7 +375,7 @@ class Woa18(AbstractAtlas):
         ssp.meta.original_path = "WOA18_%s" % dtstamp.strftime("%Y%m%d_%H%M%S")
         if num_values > 0:
             ssp_max.init_data(num_values)
-            ssp_max.data.depth = self.t[self.season_idx].variables['depth'][0:num_values].astype(np.float64)
+            ssp_max.data.depth = self._depth(self.season_idx)[0:num_values].astype(np.float64)
             ssp_max.data.temp = t_max[valid][0:num_values]
             ssp_max.data.sal = s_max[valid][0:num_values]
             ssp_max.calc_data_speed()
@@ -380,6 +409,7 @@ class Woa18(AbstractAtlas):
                 if self.s[i]:
                     self.s[i].close()
             self.s = list()
+            self.cache.clear()
             self.landsea = None
             self.lat = None
             self.lon = None
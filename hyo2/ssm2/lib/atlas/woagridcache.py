@@ -0,0 +1,134 @@
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class WoaGridCache:
+    """Flat, memory-mapped copy of the WOA grids
+
+    Each grid (t_an, t_sd, s_an, s_sd) is stored as a .npy file laid out as (period, depth, lat, lon), with
+    the periods ordered as the atlas indices them (12 months, then 4 seasons). The monthly periods have fewer
+    depth levels than the seasonal ones: the missing levels are NaN-padded, and the number of valid levels
+    for each period is stored alongside. Missing values are stored as NaN.
+    """
+
+    folder_name = "npy"
+    grid_names = ['t_an', 't_sd', 's_an', 's_sd']
+    axis_names = ['depth', 'lat', 'lon', 'landsea']
+
+    def __init__(self, data_folder: str, extra_names: Optional[list] = None) -> None:
+        self.folder = os.path.join(data_folder, self.folder_name)
+        self.extra_names = list() if extra_names is None else extra_names
+
+        self.grids = dict()
+        self.extras = dict()
+        self.depth = None
+        self.lat = None
+        self.lon = None
+        self.landsea = None
+        self.levels = None
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.folder, "%s.npy" % name)
+
+    def is_present(self) -> bool:
+        # the levels are written last, so they are only present for a complete conversion
+        for name in self.grid_names + self.axis_names + self.extra_names + ['levels']:
+            if not os.path.exists(self.path(name)):
+                return False
+        return True
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.levels is not None
+
+    def load(self) -> bool:
+        """Memory-map the grids and load the (small) axes"""
+        if not self.is_present():
+            return False
+
+        try:
+            for name in self.grid_names:
+                self.grids[name] = np.load(self.path(name), mmap_mode='r')
+            for name in self.extra_names:
+                self.extras[name] = np.load(self.path(name))
+            self.depth = np.load(self.path('depth'))
+            self.lat = np.load(self.path('lat'))
+            self.lon = np.load(self.path('lon'))
+            self.landsea = np.load(self.path('landsea'))
+            self.levels = np.load(self.path('levels'))
+
+        except Exception as e:
+            logger.warning("unable to load the grid cache in %s: %s" % (self.folder, e))
+            self.clear()
+            return False
+
+        logger.debug("loaded grid cache: %s" % self.folder)
+        return True
+
+    def clear(self) -> None:
+        self.grids = dict()
+        self.extras = dict()
+        self.depth = None
+        self.lat = None
+        self.lon = None
+        self.landsea = None
+        self.levels = None
+
+    def profile(self, name: str, period_idx: int, lat_idx: int, lon_idx: int) -> np.ma.MaskedArray:
+        """Retrieve a copy of a grid profile, masked as the netCDF variable would be"""
+        return np.ma.masked_invalid(self.grids[name][period_idx, :self.levels[period_idx], lat_idx, lon_idx])
+
+    def period_depth(self, period_idx: int) -> np.ndarray:
+        return self.depth[:self.levels[period_idx]]
+
+    def convert(self, sources: list, lat: np.ndarray, lon: np.ndarray, landsea: np.ndarray,
+                extras: Optional[dict] = None) -> bool:
+        """One-time conversion of the netCDF grids
+
+        For each period, the sources provide the temperature and salinity netCDF Datasets, and the time index
+        of the period in those Datasets. The conversion goes one period at a time to bound the memory usage.
+        """
+        if extras is None:
+            extras = dict()
+
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            if os.path.exists(self.path('levels')):
+                os.remove(self.path('levels'))
+
+            levels = np.array([t_ds.variables['depth'].size for t_ds, _, _ in sources], dtype=np.int32)
+            deepest_t_ds = sources[int(np.argmax(levels))][0]
+            depth = np.ma.filled(deepest_t_ds.variables['depth'][:], np.nan).astype(np.float32)
+            shape = (len(sources), int(levels.max()), lat.size, lon.size)
+
+            for name in self.grid_names:
+                tmp_path = self.path(name) + ".tmp"
+                grid = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=shape)
+                for period_idx, (t_ds, s_ds, time_idx) in enumerate(sources):
+                    ds = t_ds if name.startswith('t') else s_ds
+                    grid[period_idx, :levels[period_idx]] = np.ma.filled(ds.variables[name][time_idx], np.nan)
+                    grid[period_idx, levels[period_idx]:] = np.nan
+                    logger.debug("converted %s: %d/%d" % (name, period_idx + 1, len(sources)))
+                grid.flush()
+                del grid
+                os.replace(tmp_path, self.path(name))
+
+            for name, values in extras.items():
+                np.save(self.path(name), np.ma.filled(values, np.nan))
+            np.save(self.path('depth'), depth)
+            np.save(self.path('lat'), np.ma.filled(lat, np.nan).astype(np.float32))
+            np.save(self.path('lon'), np.ma.filled(lon, np.nan).astype(np.float32))
+            np.save(self.path('landsea'), np.asarray(landsea, dtype=np.float32))
+            np.save(self.path('levels'), levels)
+
+        except Exception as e:
+            logger.error("unable to convert the grids to %s: %s" % (self.folder, e))
+            return False
+
+        logger.info("converted grids to %s" % self.folder)
+        return True
@@ -0,0 +1,46 @@
+import logging
+import os
+from typing import Optional, TYPE_CHECKING
+
+from hyo2.ssm2.lib.base.callbacks.abstract_callbacks import AbstractCallbacks
+
+if TYPE_CHECKING:
+    from hyo2.ssm2.lib.soundspeed import SoundSpeedLibrary
+
+logger = logging.getLogger(__name__)
+
+# the library instance of the current worker process (with its own readers and writers)
+_worker_lib: "SoundSpeedLibrary | None" = None
+
+
+def init_worker(data_folder: str, current_project: str, callbacks: AbstractCallbacks) -> None:
+    """Initializer of the batch worker processes"""
+    global _worker_lib
+
+    from hyo2.ssm2.lib.soundspeed import SoundSpeedLibrary
+    from hyo2.abc2.lib.progress.cli_progress import CliProgress
+
+    _worker_lib = SoundSpeedLibrary(data_folder=data_folder, callbacks=callbacks, progress=CliProgress())
+    _worker_lib.current_project = current_project
+    logger.debug("batch worker %d: ready" % os.getpid())
+
+
+def process_file(data_path: str, data_format: str, skip_atlas: bool, data_formats: Optional[list],
+                 data_paths: Optional[dict]) -> tuple:
+    """Import (and optionally export) a single file in the current worker process
+
+    Return the data path, the imported profiles (None on failure), and the failure message (if any).
+    """
+    # noinspection PyBroadException
+    try:
+        _worker_lib.import_data(data_path=data_path, data_format=data_format, skip_atlas=skip_atlas)
+        if data_formats:
+            if _worker_lib.export_data(data_formats=data_formats, data_paths=data_paths) is False:
+                return data_path, None, "unable to export the data"
+
+    except Exception as e:
+        return data_path, None, "%s" % e
+
+    ssp = _worker_lib.ssp
+    _worker_lib.ssp = None
+    return data_path, ssp, None
@@ -0,0 +1,73 @@
+from datetime import datetime
+import logging
+from typing import Optional
+
+from hyo2.ssm2.lib.base.callbacks.abstract_callbacks import AbstractCallbacks
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCallbacks(AbstractCallbacks):
+    """Callbacks for unattended (batch) processing: no question is asked, so the missing values stay missing"""
+
+    def __init__(self) -> None:
+        super(BatchCallbacks, self).__init__()
+
+    def ask_number(self, title: Optional[str] = "", msg: Optional[str] = "Enter number", default: Optional[float] = 0.0,
+                   min_value: Optional[float] = -2147483647.0, max_value: Optional[float] = 2147483647.0,
+                   decimals: Optional[int] = 7) -> Optional[float]:
+        logger.info("batch mode, skipping: %s" % msg)
+        return None
+
+    def ask_text(self, title: Optional[str] = "", msg: Optional[str] = "Enter text") -> Optional[str]:
+        logger.info("batch mode, skipping: %s" % msg)
+        return None
+
+    def ask_text_with_flag(self, title: Optional[str] = "", msg: Optional[str] = "Enter text",
+                           flag_label: Optional[str] = "") -> tuple:
+        logger.info("batch mode, skipping: %s" % msg)
+        return None, False
+
+    def ask_date(self) -> Optional[datetime]:
+        logger.info("batch mode, skipping date request")
+        return None
+
+    def ask_location(self, default_lat: Optional[float] = None, default_lon: Optional[float] = None) -> tuple:
+        logger.info("batch mode, skipping location request")
+        return None, None
+
+    def ask_filename(self, saving: Optional[bool] = True, key_name: Optional[str] = None,
+                     default_path: Optional[str] = ".",
+                     title: Optional[str] = "Choose a path/filename", default_file: Optional[str] = "",
+                     file_filter: Optional[str] = "All Files (*.*)", multi_file: Optional[bool] = False) -> str:
+        logger.info("batch mode, skipping: %s" % title)
+        return ""
+
+    def ask_directory(self, key_name: Optional[str] = None, default_path: Optional[str] = ".",
+                      title: Optional[str] = "Browse for folder", message: Optional[str] = "") -> str:
+        logger.info("batch mode, skipping: %s" % title)
+        return ""
+
+    def ask_location_from_sis(self) -> bool:
+        return False
+
+    def ask_location_from_nmea(self) -> bool:
+        return False
+
+    def ask_tss(self) -> Optional[float]:
+        return None
+
+    def ask_draft(self) -> Optional[float]:
+        return None
+
+    def msg_tx_no_verification(self, name: str, protocol: str) -> None:
+        pass
+
+    def msg_tx_sis_wait(self, name: str) -> None:
+        pass
+
+    def msg_tx_sis_confirmed(self, name: str) -> None:
+        pass
+
+    def msg_tx_sis_not_confirmed(self, name: str, port: int) -> None:
+        pass
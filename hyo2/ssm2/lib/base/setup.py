@@ -167,6 +167,7 @@ class Setup:
 
         # output
         # client list
+        self.client_list.close()
         self.client_list = ClientList()  # to reset the list
         for client in db.client_list:
             client_string = "%s:%s:%s:%s" % (client[1], client[2], client[3], client[4])
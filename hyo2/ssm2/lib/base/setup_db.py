@@ -18,6 +18,9 @@ class SetupDb(BaseDb):
         self.data_folder = data_folder
         db_path = os.path.join(data_folder, db_file)
         super(SetupDb, self).__init__(db_path=db_path)
+        # in-memory copy of the active setup row, and the values modified since the last flush
+        self._settings: dict | None = None
+        self._dirty: dict = dict()
         self.reconnect_or_create()
         self._check_default_setup()
         self.use_setup_name = use_setup_name
@@ -27,6 +30,9 @@ class SetupDb(BaseDb):
             logger.error("Missing db connection")
             return False
 
+        self.flush_settings()
+        self._settings = None
+
         try:
             with self.conn:
                 self.conn.execute(""" PRAGMA foreign_keys = 0""")
@@ -167,6 +173,9 @@ class SetupDb(BaseDb):
         if not self.setup_exists(setup_name):
             return False
 
+        self.flush_settings()
+        self._settings = None
+
         with self.conn:
             try:
                 # set all the values to inactive
@@ -181,18 +190,10 @@ class SetupDb(BaseDb):
                 logger.error("%s: %s" % (type(e), e))
                 return False
 
-    # noinspection SqlResolve
     @property
     def active_setup_id(self) -> int:
         """ Retrieve the active settings id """
-        if self.use_setup_name is None:
-            ret = self.conn.execute(""" SELECT id FROM general WHERE setup_status="active" """).fetchone()
-            return ret[0]
-
-        # logger.debug('using setup name: %s' % self.use_setup_name)
-        ret = self.conn.execute(""" SELECT id FROM general WHERE setup_name=? """,
-                                (self.use_setup_name,)).fetchone()
-        return ret[0]
+        return self._settings_value("id")
 
     # noinspection SqlResolve
     def setup_id_from_setup_name(self, setup_name: str) -> int:
@@ -280,79 +281,101 @@ class SetupDb(BaseDb):
         # logger.info("Profiles list: %s" % len(ret))
         return ret
 
+    # --- settings cache
+
+    # noinspection SqlResolve
+    def load_settings(self) -> None:
+        """Load the whole active setup with a single query, discarding any unflushed value"""
+        if self.use_setup_name is None:
+            row = self.conn.execute(""" SELECT * FROM general WHERE setup_status="active" """).fetchone()
+        else:
+            # logger.debug('using setup name: %s' % self.use_setup_name)
+            row = self.conn.execute(""" SELECT * FROM general WHERE setup_name=? """,
+                                    (self.use_setup_name,)).fetchone()
+        if row is None:
+            raise RuntimeError("unable to retrieve the active setup")
+
+        self._settings = dict(row)
+        self._dirty = dict()
+
+    def flush_settings(self) -> bool:
+        """Write all the modified values of the active setup in a single transaction"""
+        if len(self._dirty) == 0:
+            return True
+        if not self.conn:
+            logger.error("Missing db connection")
+            return False
+
+        attribs = list(self._dirty.keys())
+        try:
+            with self.conn:
+                self.conn.execute(""" UPDATE general SET """ + ", ".join(["%s=?" % a for a in attribs]) +
+                                  """ WHERE id=? """,
+                                  [self._dirty[a] for a in attribs] + [self._settings["id"], ])
+        except sqlite3.Error as e:
+            logger.error("while setting %s, %s: %s" % (", ".join(attribs), type(e), e))
+            return False
+
+        self._dirty = dict()
+        return True
+
+    def reload_settings(self) -> None:
+        """Flush the modified values, then re-read the active setup (e.g., to collect changes by others)"""
+        self.flush_settings()
+        self._settings = None
+
+    def commit(self) -> bool:
+        if not self.flush_settings():
+            return False
+        return super(SetupDb, self).commit()
+
+    def disconnect(self) -> bool:
+        if self.conn is not None:
+            self.flush_settings()
+        self._settings = None
+        return super(SetupDb, self).disconnect()
+
+    def _settings_value(self, attrib: str):
+        if self._settings is None:
+            self.load_settings()
+        return self._settings[attrib]
+
+    def _set_settings_value(self, attrib: str, value) -> None:
+        if self._settings is None:
+            self.load_settings()
+        if attrib not in self._settings:
+            logger.error("while setting %s, unknown setting" % attrib)
+            return
+        self._settings[attrib] = value
+        self._dirty[attrib] = value
+
     # --- templates
     def _getter_int(self, attrib: str) -> int:
-        r = self.conn.execute(""" SELECT """ + attrib + """ FROM general WHERE id=? """,
-                              (self.active_setup_id,)).fetchone()
-        # logger.info("%s = %d" % (attrib, r[0]))
-        return r[0]
+        return self._settings_value(attrib)
 
     def _setter_int(self, attrib: str, value: int) -> None:
-        with self.conn:
-            try:
-                self.conn.execute(""" UPDATE general SET """ + attrib + """=? WHERE id=? """,
-                                  (value, self.active_setup_id,))
-                self.commit()
-            except sqlite3.Error as e:
-                logger.error("while setting %s, %s: %s" % (attrib, type(e), e))
-        # logger.info("%s = %d" % (attrib, value))
+        self._set_settings_value(attrib, value)
 
     def _getter_str(self, attrib: str) -> str:
-        r = self.conn.execute(""" SELECT """ + attrib + """ FROM general WHERE id=? """,
-                              (self.active_setup_id,)).fetchone()
-        # logger.info("%s = %s" % (attrib, r[0]))
-        return r[0]
+        return self._settings_value(attrib)
 
     def _setter_str(self, attrib: str, value: str) -> None:
-        with self.conn:
-            try:
-                self.conn.execute(""" UPDATE general SET """ + attrib + """=? WHERE id=? """,
-                                  (value, self.active_setup_id,))
-                self.commit()
-            except sqlite3.Error as e:
-                logger.error("while setting %s, %s: %s" % (attrib, type(e), e))
-        # logger.info("%s = %s" % (attrib, value))
+        self._set_settings_value(attrib, value)
 
     def _getter_bool(self, attrib: str) -> bool:
-        # logger.error("bool attrib: %s" % type(attrib))
-        r = self.conn.execute(""" SELECT """ + attrib + """ FROM general WHERE id=? """,
-                              (self.active_setup_id,)).fetchone()
-        # logger.info("%s = %s" % (attrib, r[0]))
-        if isinstance(r[0], str):
-            return r[0] == "True"
+        value = self._settings_value(attrib)
+        if isinstance(value, str):
+            return value == "True"
         else:
-            return r[0] == 1
+            return value == 1
 
     def _setter_bool(self, attrib: str, value: bool) -> None:
-
         # required to check whether we are using the old str boolean
-        r = self.conn.execute(""" SELECT """ + attrib + """ FROM general WHERE id=? """,
-                              (self.active_setup_id,)).fetchone()
-        # logger.info("%s = %s" % (attrib, r[0]))
-        if isinstance(r[0], str):
-            is_str = True
+        if isinstance(self._settings_value(attrib), str):
+            value = "True" if value else "False"
         else:
-            is_str = False
-
-        with self.conn:
-            if value:
-                if is_str:
-                    value = "True"
-                else:
-                    value = 1
-            else:
-                if is_str:
-                    value = "False"
-                else:
-                    value = 0
-
-            try:
-                self.conn.execute(""" UPDATE general SET """ + attrib + """=? WHERE id=? """,
-                                  (value, self.active_setup_id,))
-                self.commit()
-            except sqlite3.Error as e:
-                logger.error("while setting %s, %s: %s" % (attrib, type(e), e))
-        # logger.info("%s = %s" % (attrib, value))
+            value = 1 if value else 0
+        self._set_settings_value(attrib, value)
 
     # --- active library version
     @property
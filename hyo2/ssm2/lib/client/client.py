@@ -2,7 +2,7 @@ import time
 import socket
 import traceback
 import logging
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from hyo2.ssm2.lib.profile.dicts import Dicts
 from hyo2.ssm2.lib.formats.writers.asvp import Asvp
@@ -25,22 +25,40 @@ class Client:
         self.alive = True
         # logger.info("client: %s(%s:%s) %s" % (self.name, self.ip, self.port, self.protocol))
 
+        self._sock_out = None  # reused across transmissions
+
+    @property
+    def has_confirmation(self) -> bool:
+        """The client sends back the received profile"""
+        return self.protocol in ["SIS", "KCTRL"]
+
     def send_cast(self, prj: 'SoundSpeedLibrary', server_mode: bool = False) -> bool:
         """Send a cast to the """
+        tx_data = self.prepare_cast(prj=prj, server_mode=server_mode)
+        if tx_data is None:
+            return False
+
+        return self.transmit(tx_data)
+
+    def prepare_cast(self, prj: 'SoundSpeedLibrary', server_mode: bool = False) -> Union[bytes, str, None]:
+        """Prepare the data to transmit (this may modify the current profile, so it is not thread-safe)"""
         if not self.alive:
             logger.debug("%s[%s:%s:%s] is NOT alive" % (self.name, self.ip, self.port, self.protocol))
-            return False
+            return None
 
-        logger.info("transmitting to %s: [%s:%s:%s]" % (self.name, self.ip, self.port, self.protocol))
+        logger.info("preparing for %s: [%s:%s:%s]" % (self.name, self.ip, self.port, self.protocol))
 
         if self.protocol == "HYPACK":
-            success = self.send_hyp_format(prj=prj)
-        else:
-            success = self.send_kng_format(prj=prj, server_mode=server_mode)
-
-        return success
+            return self.prepare_hyp_format(prj=prj)
+        return self.prepare_kng_format(prj=prj, server_mode=server_mode)
 
     def send_kng_format(self, prj: 'SoundSpeedLibrary', server_mode: bool = False) -> bool:
+        tx_data = self.prepare_kng_format(prj=prj, server_mode=server_mode)
+        if tx_data is None:
+            return False
+        return self.transmit(tx_data)
+
+    def prepare_kng_format(self, prj: 'SoundSpeedLibrary', server_mode: bool = False) -> Optional[str]:
         logger.info("using kng format")
         kng_fmt = None
         if self.protocol in ["SIS", "KCTRL"]:
@@ -66,7 +84,7 @@ class Client:
 
             if not prj.prepare_sis(apply_thin=apply_thin, apply_12k=apply_12k, thin_tolerance=tolerance):
                 logger.info("issue in preparing the data")
-                return False
+                return None
 
             si = prj.cur.sis_thinned
             thin_profile_length = prj.cur.sis.flag[si].size
@@ -86,37 +104,46 @@ class Client:
 
         if tx_data is None:
             logger.info("issue in thinning the data")
-            return False
 
-        return self._transmit(tx_data)
+        return tx_data
 
     def send_hyp_format(self, prj: 'SoundSpeedLibrary') -> bool:
+        return self.transmit(self.prepare_hyp_format(prj=prj))
+
+    @classmethod
+    def prepare_hyp_format(cls, prj: 'SoundSpeedLibrary') -> str:
         logger.info("using hyp format")
         calc = Calc()
-        tx_data = calc.convert(prj.ssp)
-        return self._transmit(tx_data)
+        return calc.convert(prj.ssp)
 
-    def _transmit(self, tx_data: Union[bytes, str]) -> bool:
-        sock_out = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    def transmit(self, tx_data: Union[bytes, str]) -> bool:
+        logger.info("transmitting to %s: [%s:%s:%s]" % (self.name, self.ip, self.port, self.protocol))
 
         try:
-            sock_out.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 2 ** 16)
+            if self._sock_out is None:
+                self._sock_out = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._sock_out.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 2 ** 16)
+
             if isinstance(tx_data, bytes):
-                sock_out.sendto(tx_data, (self.ip, self.port))
+                self._sock_out.sendto(tx_data, (self.ip, self.port))
             elif isinstance(tx_data, str):
-                sock_out.sendto(tx_data.encode(), (self.ip, self.port))
+                self._sock_out.sendto(tx_data.encode(), (self.ip, self.port))
             else:
                 raise RuntimeError("invalid type of data to tx: %s" % type(tx_data))
 
         except socket.error as e:
-            sock_out.close()
+            self.close()
             traceback.print_exc()
             logger.warning("socket issue: %s" % e)
             return False
 
-        sock_out.close()
         return True
 
+    def close(self) -> None:
+        if self._sock_out is not None:
+            self._sock_out.close()
+            self._sock_out = None
+
     def request_profile_from_sis(self, prj: 'SoundSpeedLibrary') -> None:
         if self.protocol not in ["SIS", "KCTRL"]:
             return
@@ -1,6 +1,6 @@
 import numpy as np
-import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 from hyo2.ssm2.lib.client.client import Client
@@ -23,32 +23,56 @@ class ClientList:
         self.num_clients += 1
 
     def transmit_ssp(self, prj: 'SoundSpeedLibrary', server_mode: bool = False):
+        """Transmit the current profile to all the alive clients
+
+        The data are prepared for each client in turn (since this modifies the current profile), then transmitted
+        concurrently. The SIS reception confirmations are awaited all together.
+        """
 
         prj.progress.start(text='Transmitting', is_disabled=server_mode, has_abortion=True)
 
-        # loop through the client list
+        clients = [client for client in self.clients if client.alive]
         success = True  # false if one tx has troubles
-        prog_quantum = 100 / (len(self.clients) + 1)
-        for client in self.clients:
-
-            if not client.alive:
+        prog_quantum = 100 / (len(clients) + 2)
+
+        # clean previously received profile from SIS
+        if any(client.has_confirmation for client in clients):
+            prj.listeners.sis.clear_ssp()
+
+        # prepare the data (and, for the clients with confirmation, the transmitted profile to compare with)
+        tx_data = dict()
+        tx_profiles = dict()
+        for client in clients:
+            data = client.prepare_cast(prj=prj, server_mode=server_mode)
+            if data is None:
+                logger.warning('unable to prepare profile for %s' % client.name)
+                success = False
                 continue
-
-            # clean previously received profile from SIS
-            if client.protocol in ["SIS", "KCTRL"]:
-                prj.listeners.sis.ssp = None
-
+            tx_data[client] = data
+            if client.has_confirmation:
+                si = prj.cur.sis_thinned
+                tx_profiles[client] = (np.array(prj.cur.sis.depth[si]), np.array(prj.cur.sis.speed[si]))
             prj.progress.add(prog_quantum)
 
-            if not client.send_cast(prj=prj, server_mode=server_mode):
-                logger.warning('unable to send profile to %s' % client.name)
-                success = False
-                continue
+        # transmit to all the clients at once
+        sent = list()
+        if len(tx_data) > 0:
+            with ThreadPoolExecutor(max_workers=len(tx_data)) as executor:
+                results = dict(zip(tx_data.keys(),
+                                   executor.map(lambda item: item[0].transmit(item[1]), tx_data.items())))
+            for client, result in results.items():
+                if result:
+                    sent.append(client)
+                else:
+                    logger.warning('unable to send profile to %s' % client.name)
+                    success = False
+        prj.progress.add(prog_quantum)
 
-            if client.protocol not in ["SIS", "KCTRL"]:
+        to_confirm = list()
+        for client in sent:
+            if not client.has_confirmation:
                 logger.info("transmitted cast, protocol %s does not allow verification"
                             % client.protocol)
-                time.sleep(1)
                 if not server_mode:
                     prj.cb.msg_tx_no_verification(name=client.name, protocol=client.protocol)
                 continue
@@ -59,52 +83,73 @@ class ClientList:
                     prj.cb.msg_tx_sis_wait(name=client.name)
                 continue
 
-            logger.debug("waiting for receipt confirmation...")
-            wait = 0
-            wait_max = prj.setup.rx_max_wait_time
-            # For multiple SIS clients, make sure the client IP match with the sender IP.
-            while True:
-                if (wait > wait_max) or (prj.listeners.sis.ssp is not None):
-                    break
-
-                time.sleep(1)
-                wait += 1
-                logger.debug("waiting for %s sec" % wait)
-
-                prj.progress.update()
-                if prj.progress.canceled:
-                    logger.info("canceled by user")
-                    wait = wait_max
-
-            if client.protocol in ["SIS", "KCTRL"] and prj.listeners.sis.ssp:
-                # The KM .all SVP datagrams have a bug in their time reporting and
-                # have a 100 second granularity so can't compare times
-                # to ensure it's the same profile.  Comparing the sound speeds instead
-                d_tx = prj.cur.sis.depth[prj.cur.sis_thinned]
-                s_tx = prj.cur.sis.speed[prj.cur.sis_thinned]
-                # print(d_tx, s_tx)
-                s_rx = np.interp(d_tx, prj.listeners.sis.ssp.depth, prj.listeners.sis.ssp.speed)
-                max_diff = max(abs(s_tx - s_rx))
-                if max_diff < 0.2:
-                    if self.last_tx_time:  # store this for server mode in case of missed reception
-                        self.last_tx_time_2 = self.last_tx_time
-                    self.last_tx_time = prj.listeners.sis.ssp.acquisition_time
-                    logger.debug("reception confirmed: %s" % self.last_tx_time.strftime("%d/%m/%Y, %H:%M:%S"))
-                    if not server_mode:
-                        prj.cb.msg_tx_sis_confirmed(name=client.name)
-                    continue
-                else:
-                    logger.info("casts differ by %.2f m/s" % max_diff)
-                    if not server_mode:
-                        prj.cb.msg_tx_sis_not_confirmed(name=client.name, port=prj.setup.sis_listen_port)
-                    success = False
-                    continue
+            to_confirm.append(client)
 
-            else:
-                logger.warning("reception NOT confirmed: unable to catch the back datagram")
-                if not server_mode:
-                    prj.cb.msg_tx_sis_not_confirmed(name=client.name, port=prj.setup.sis_listen_port)
-                success = False
+        if len(to_confirm) > 0:
+            received = self._wait_for_confirmations(prj=prj, clients=to_confirm)
+            for client in to_confirm:
+                if not self._check_confirmation(prj=prj, client=client, tx_profile=tx_profiles[client],
+                                                received=received, server_mode=server_mode):
+                    success = False
 
         prj.progress.end()
         return success
+
+    @classmethod
+    def _wait_for_confirmations(cls, prj: 'SoundSpeedLibrary', clients: list) -> dict:
+        logger.debug("waiting for receipt confirmation...")
+        ips = [client.ip for client in clients]
+        wait = 0
+        wait_max = prj.setup.rx_max_wait_time
+        while True:
+            received = prj.listeners.sis.wait_for_ssps(ips=ips, timeout=1)
+            if (len(received) >= len(ips)) or all(ip in received for ip in ips):
+                break
+
+            wait += 1
+            logger.debug("waiting for %s sec" % wait)
+            if wait > wait_max:
+                break
+
+            prj.progress.update()
+            if prj.progress.canceled:
+                logger.info("canceled by user")
+                break
+
+        return received
+
+    def _check_confirmation(self, prj: 'SoundSpeedLibrary', client: Client, tx_profile: tuple, received: dict,
+                            server_mode: bool) -> bool:
+        # For multiple SIS clients, use the profile sent back from the client IP (if any)
+        rx_ssp = received.get(client.ip, prj.listeners.sis.ssp)
+
+        if rx_ssp is None:
+            logger.warning("reception NOT confirmed: unable to catch the back datagram")
+            if not server_mode:
+                prj.cb.msg_tx_sis_not_confirmed(name=client.name, port=prj.setup.sis_listen_port)
+            return False
+
+        # The KM .all SVP datagrams have a bug in their time reporting and
+        # have a 100 second granularity so can't compare times
+        # to ensure it's the same profile.  Comparing the sound speeds instead
+        d_tx, s_tx = tx_profile
+        s_rx = np.interp(d_tx, rx_ssp.depth, rx_ssp.speed)
+        max_diff = max(abs(s_tx - s_rx))
+        if max_diff >= 0.2:
+            logger.info("casts differ by %.2f m/s" % max_diff)
+            if not server_mode:
+                prj.cb.msg_tx_sis_not_confirmed(name=client.name, port=prj.setup.sis_listen_port)
+            return False
+
+        if self.last_tx_time:  # store this for server mode in case of missed reception
+            self.last_tx_time_2 = self.last_tx_time
+        self.last_tx_time = rx_ssp.acquisition_time
+        logger.debug("reception confirmed: %s" % self.last_tx_time.strftime("%d/%m/%Y, %H:%M:%S"))
+        if not server_mode:
+            prj.cb.msg_tx_sis_confirmed(name=client.name)
+        return True
+
+    def close(self) -> None:
+        """Release the client sockets"""
+        for client in self.clients:
+            client.close()
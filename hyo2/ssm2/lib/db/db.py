@@ -19,6 +19,8 @@ logger = logging.getLogger(__name__)
 class ProjectDb:
     """Class that provides an interface to a SQLite db with Sound Speed data"""
 
+    max_query_params = 500  # below the SQLITE_MAX_VARIABLE_NUMBER of old SQLite versions (999)
+
     def __init__(self, projects_folder: Optional[str] = None, project_name: Optional[str] = None) -> None:
 
         # in case that no data folder is passed
@@ -82,6 +84,16 @@ class ProjectDb:
         except sqlite3.Error as e:
             raise RuntimeError("Unable to activate foreign keys: %s" % e)
 
+        try:
+            # write-ahead logging: readers do not block the (single-transaction) cast writes
+            journal_mode = self.conn.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+            if journal_mode.lower() != 'wal':
+                logger.debug("unable to activate WAL journaling, using: %s" % journal_mode)
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+
+        except sqlite3.Error as e:
+            logger.warning("Unable to set journal mode: %s" % e)
+
         try:
             # Set the row factory
             self.conn.row_factory = sqlite3.Row
@@ -113,6 +125,8 @@ class ProjectDb:
             return True
 
         try:
+            # fold the write-ahead log back into the db file, so that it can be safely copied
+            self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
             self.conn.close()
             # logger.info("Disconnected")
             return True
@@ -241,6 +255,13 @@ class ProjectDb:
                                         REFERENCES ssp(pk))
                                   """)
 
+                # noinspection SqlResolve
+                self.conn.execute("""CREATE INDEX IF NOT EXISTS data_ssp_pk_idx ON data(ssp_pk)""")
+                # noinspection SqlResolve
+                self.conn.execute("""CREATE INDEX IF NOT EXISTS proc_ssp_pk_idx ON proc(ssp_pk)""")
+                # noinspection SqlResolve
+                self.conn.execute("""CREATE INDEX IF NOT EXISTS sis_ssp_pk_idx ON sis(ssp_pk)""")
+
                 # noinspection SqlResolve
                 self.conn.execute("""
                                   CREATE VIEW IF NOT EXISTS ssp_view AS
@@ -376,7 +397,6 @@ class ProjectDb:
                 self.conn.execute("""
                                   INSERT INTO ssp_pk VALUES (NULL, ?, ?)
                                   """, (utc_time, point,))
-                self.conn.commit()
 
         except sqlite3.Error as e:
             logger.error("during ssp pk check, %s: %s" % (type(e), e))
@@ -405,8 +425,6 @@ class ProjectDb:
             self.conn.execute("""DELETE FROM data WHERE ssp_pk=?""", (self.tmp_ssp_pk,))
             # logger.info("deleted %s pk entries from data" % self.tmp_ssp_pk)
 
-            self.conn.commit()
-
         except sqlite3.Error as e:
             logger.error("during deletion from data, %s: %s" % (type(e), e))
             return False
@@ -416,8 +434,6 @@ class ProjectDb:
             self.conn.execute("""DELETE FROM proc WHERE ssp_pk=?""", (self.tmp_ssp_pk,))
             # logger.info("deleted %s pk entries from proc" % self.tmp_ssp_pk)
 
-            self.conn.commit()
-
         except sqlite3.Error as e:
             logger.error("during deletion from proc, %s: %s" % (type(e), e))
             return False
@@ -427,8 +443,6 @@ class ProjectDb:
             self.conn.execute("""DELETE FROM sis WHERE ssp_pk=?""", (self.tmp_ssp_pk,))
             # logger.info("deleted %s pk entries from sis" % self.tmp_ssp_pk)
 
-            self.conn.commit()
-
         except sqlite3.Error as e:
             logger.error("during deletion from sis, %s: %s" % (type(e), e))
             return False
@@ -438,8 +452,6 @@ class ProjectDb:
             self.conn.execute("""DELETE FROM ssp WHERE pk=?""", (self.tmp_ssp_pk,))
             # logger.info("deleted %s pk entry from ssp" % self.tmp_ssp_pk)
 
-            self.conn.commit()
-
         except sqlite3.Error as e:
             logger.error("during deletion from ssp, %s: %s" % (type(e), e))
             return False
@@ -450,8 +462,6 @@ class ProjectDb:
                 self.conn.execute("""DELETE FROM ssp_pk WHERE id=?""", (self.tmp_ssp_pk,))
                 # logger.info("deleted %s id entry from ssp_pk" % self.tmp_ssp_pk)
 
-                self.conn.commit()
-
             except sqlite3.Error as e:
                 logger.error("during deletion from ssp_pk, %s: %s" % (type(e), e))
                 return False
@@ -489,8 +499,6 @@ class ProjectDb:
                                     ))
             # logger.info("insert new %s pk in ssp" % self.tmp_ssp_pk)
 
-            self.conn.commit()
-
         except sqlite3.Error as e:
             logger.error("during ssp addition, %s: %s" % (type(e), e))
             return False
@@ -498,116 +506,67 @@ class ProjectDb:
         return True
 
     def _add_data(self):
-
-        sz = self.tmp_data.data.num_samples
-        # logger.info("num samples to add: %s" % sz)
-
-        added_samples = 0
-        for i in range(sz):
-
-            try:
-                # first check if the sample is already present with exactly the same values
-                # noinspection SqlResolve
-                self.conn.execute("""
-                                  INSERT INTO data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                  """, (self.tmp_ssp_pk,
-                                        self.tmp_data.data.pressure[i],
-                                        self.tmp_data.data.depth[i],
-                                        self.tmp_data.data.speed[i],
-                                        self.tmp_data.data.temp[i],
-                                        self.tmp_data.data.conductivity[i],
-                                        self.tmp_data.data.sal[i],
-                                        self.tmp_data.data.source[i],
-                                        self.tmp_data.data.flag[i],
-                                        ))
-
-                self.conn.commit()
-                added_samples += 1
-            except sqlite3.IntegrityError as e:
-                logger.info("skipping row #%s due to %s: %s" % (i, type(e), e))
-                continue
-            except sqlite3.Error as e:
-                print(self.tmp_data.data.depth[i], type(self.tmp_data.data.depth[i]))
-                # traceback.print_stack()
-                logger.error("during adding ssp raw samples, %s: %s" % (type(e), e))
-                return False
-
-        # logger.info("added %s raw samples" % added_samples)
-        return True
+        return self._add_samples(table="data", samples=self.tmp_data.data, desc="raw")
 
     def _add_proc(self):
-
-        sz = self.tmp_data.proc.num_samples
-        # logger.info("max processed samples to add: %s" % sz)
-
-        added_samples = 0
-        for i in range(sz):
-
-            try:
-                # first check if the sample is already present with exactly the same values
-                # noinspection SqlResolve
-                self.conn.execute("""
-                                  INSERT INTO proc VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                  """, (self.tmp_ssp_pk,
-                                        self.tmp_data.proc.pressure[i],
-                                        self.tmp_data.proc.depth[i],
-                                        self.tmp_data.proc.speed[i],
-                                        self.tmp_data.proc.temp[i],
-                                        self.tmp_data.proc.conductivity[i],
-                                        self.tmp_data.proc.sal[i],
-                                        self.tmp_data.proc.source[i],
-                                        self.tmp_data.proc.flag[i],
-                                        ))
-
-                self.conn.commit()
-                added_samples += 1
-
-            except sqlite3.IntegrityError as e:
-                logger.info("skipping row #%s due to %s: %s" % (i, type(e), e))
-                continue
-            except sqlite3.Error as e:
-                logger.error("during adding ssp processed samples, %s: %s" % (type(e), e))
-                return False
-
-        # logger.info("added %s processed samples" % added_samples)
-        return True
+        return self._add_samples(table="proc", samples=self.tmp_data.proc, desc="processed")
 
     def _add_sis(self):
+        return self._add_samples(table="sis", samples=self.tmp_data.sis, desc="sis")
+
+    def _add_samples(self, table, samples, desc):
+        """Bulk insert of all the samples in the passed table (within the caller's transaction)"""
 
-        sz = self.tmp_data.sis.num_samples
-        # logger.info("max sis samples to add: %s" % sz)
+        sz = samples.num_samples
+        # logger.info("num %s samples to add: %s" % (desc, sz))
+        if sz == 0:
+            return True
 
-        added_samples = 0
-        for i in range(sz):
+        # samples without depth would violate the NOT NULL constraint (NaN is stored as NULL)
+        valid = ~np.isnan(samples.depth[:sz])
+        if not valid.all():
+            for i in np.nonzero(~valid)[0]:
+                logger.info("skipping row #%s due to missing depth" % i)
+
+        values = np.column_stack((samples.pressure[:sz],
+                                  samples.depth[:sz],
+                                  samples.speed[:sz],
+                                  samples.temp[:sz],
+                                  samples.conductivity[:sz],
+                                  samples.sal[:sz],
+                                  samples.source[:sz],
+                                  samples.flag[:sz]))[valid]
+        rows = [(self.tmp_ssp_pk, *row) for row in values.tolist()]
 
+        try:
+            # the rows inserted before a failure must be discarded before adding them one by one
+            self.conn.execute("SAVEPOINT add_samples")
             try:
-                # first check if the sample is already present with exactly the same values
                 # noinspection SqlResolve
-                self.conn.execute("""
-                                  INSERT INTO sis VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                  """, (self.tmp_ssp_pk,
-                                        self.tmp_data.sis.pressure[i],
-                                        self.tmp_data.sis.depth[i],
-                                        self.tmp_data.sis.speed[i],
-                                        self.tmp_data.sis.temp[i],
-                                        self.tmp_data.sis.conductivity[i],
-                                        self.tmp_data.sis.sal[i],
-                                        self.tmp_data.sis.source[i],
-                                        self.tmp_data.sis.flag[i],
-                                        ))
-
-                self.conn.commit()
-                added_samples += 1
+                self.conn.executemany("""
+                                      INSERT INTO %s VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                      """ % table, rows)
 
             except sqlite3.IntegrityError as e:
-                logger.info("skipping row #%s due to %s: %s" % (i, type(e), e))
-                continue
+                logger.info("unable to bulk add %s samples due to %s: %s -> adding one by one" % (desc, type(e), e))
+                self.conn.execute("ROLLBACK TO add_samples")
+                for i, row in enumerate(rows):
+                    try:
+                        # noinspection SqlResolve
+                        self.conn.execute("""
+                                          INSERT INTO %s VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                          """ % table, row)
+                    except sqlite3.IntegrityError as e:
+                        logger.info("skipping row #%s due to %s: %s" % (i, type(e), e))
+                        continue
 
-            except sqlite3.Error as e:
-                logger.error("during adding ssp sis samples, %s: %s" % (type(e), e))
-                return False
+            self.conn.execute("RELEASE add_samples")
+
+        except sqlite3.Error as e:
+            logger.error("during adding ssp %s samples, %s: %s" % (desc, type(e), e))
+            return False
 
-        # logger.info("added %s sis samples" % added_samples)
+        # logger.info("added %s %s samples" % (len(rows), desc))
         return True
 
     def timestamp_list(self):
@@ -649,6 +608,10 @@ class ProjectDb:
                                     (Dicts.flags['valid'], Dicts.sources['woa09_ext'], Dicts.sources['woa13_ext'],
                                      Dicts.sources['woa18_ext'], Dicts.sources['rtofs_ext'],
                                      Dicts.sources['gomofs_ext'], Dicts.sources['ref_ext'],)).fetchall()
+        # lookup by pk (the queries are grouped by pk, so there is a single row for each pk)
+        sql_min = {row_min['ssp_pk']: row_min for row_min in sql_min}
+        sql_max = {row_max['ssp_pk']: row_max for row_max in sql_max}
+        sql_raw = {row_raw['ssp_pk']: row_raw for row_raw in sql_raw}
 
         try:
             with self.conn:
@@ -667,11 +630,10 @@ class ProjectDb:
                     # special handling for surface sound speed, min depth, max depth
                     try:
                         min_depth = str()
-                        for row_min in sql_min:
-                            if row_min['ssp_pk'] == row['pk']:
-                                ss_at_min_depth = '%0.2f' % row_min['speed']
-                                min_depth = '%0.2f' % row_min['depth']
-                                break
+                        row_min = sql_min.get(row['pk'])
+                        if row_min is not None:
+                            ss_at_min_depth = '%0.2f' % row_min['speed']
+                            min_depth = '%0.2f' % row_min['depth']
                         if min_depth == '':
                             logger.warning("unable to retrieve min depth for profile: %s -> skipping" % row['pk'])
                             continue
@@ -681,10 +643,9 @@ class ProjectDb:
 
                     try:
                         max_depth = str()
-                        for row_max in sql_max:
-                            if row_max['ssp_pk'] == row['pk']:
-                                max_depth = '%0.2f' % row_max['depth']
-                                break
+                        row_max = sql_max.get(row['pk'])
+                        if row_max is not None:
+                            max_depth = '%0.2f' % row_max['depth']
                         if max_depth == '':
                             logger.warning("unable to retrieve max depth for profile: %s -> skipping" % row['pk'])
                             continue
@@ -694,10 +655,9 @@ class ProjectDb:
 
                     try:
                         max_raw_depth = str()
-                        for row_raw in sql_raw:
-                            if row_raw['ssp_pk'] == row['pk']:
-                                max_raw_depth = '%0.2f' % row_raw['depth']
-                                break
+                        row_raw = sql_raw.get(row['pk'])
+                        if row_raw is not None:
+                            max_raw_depth = '%0.2f' % row_raw['depth']
                         if max_raw_depth == '':
                             logger.warning("unable to retrieve max raw depth for profile: %s -> skipping" % row['pk'])
                             continue
@@ -798,22 +758,10 @@ class ProjectDb:
 
             # raw data
             try:
-                # noinspection SqlResolve
-                ssp_samples = self.conn.execute("SELECT * FROM data WHERE ssp_pk=?", (pk,)).fetchall()
-                num_samples = len(ssp_samples)
-                ssp.cur.init_data(num_samples)
-                # logger.debug("raw data samples: %s" % num_samples)
-                for i in range(num_samples):
-                    # print(ssp_samples[i])
-
-                    ssp.cur.data.pressure[i] = ssp_samples[i]['pressure']
-                    ssp.cur.data.depth[i] = ssp_samples[i]['depth']
-                    ssp.cur.data.speed[i] = ssp_samples[i]['speed']
-                    ssp.cur.data.temp[i] = ssp_samples[i]['temperature']
-                    ssp.cur.data.conductivity[i] = ssp_samples[i]['conductivity']
-                    ssp.cur.data.sal[i] = ssp_samples[i]['salinity']
-                    ssp.cur.data.source[i] = ssp_samples[i]['source']
-                    ssp.cur.data.flag[i] = ssp_samples[i]['flag']
+                ssp_samples = self._samples_by_pk(table="data", pk=pk)
+                ssp.cur.init_data(ssp_samples.shape[0])
+                # logger.debug("raw data samples: %s" % ssp_samples.shape[0])
+                self._fill_samples(samples=ssp.cur.data, values=ssp_samples)
 
             except sqlite3.Error as e:
                 logger.error("reading raw samples for %s pk, %s: %s" % (pk, type(e), e))
@@ -821,21 +769,10 @@ class ProjectDb:
 
             # proc data
             try:
-                # noinspection SqlResolve
-                ssp_samples = self.conn.execute("SELECT * FROM proc WHERE ssp_pk=?", (pk,)).fetchall()
-                num_samples = len(ssp_samples)
-                ssp.cur.init_proc(num_samples)
-                # logger.debug("proc data samples: %s" % num_samples)
-                for i in range(num_samples):
-                    # print(ssp_samples[i])
-                    ssp.cur.proc.pressure[i] = ssp_samples[i]['pressure']
-                    ssp.cur.proc.depth[i] = ssp_samples[i]['depth']
-                    ssp.cur.proc.speed[i] = ssp_samples[i]['speed']
-                    ssp.cur.proc.temp[i] = ssp_samples[i]['temperature']
-                    ssp.cur.proc.conductivity[i] = ssp_samples[i]['conductivity']
-                    ssp.cur.proc.sal[i] = ssp_samples[i]['salinity']
-                    ssp.cur.proc.source[i] = ssp_samples[i]['source']
-                    ssp.cur.proc.flag[i] = ssp_samples[i]['flag']
+                ssp_samples = self._samples_by_pk(table="proc", pk=pk)
+                ssp.cur.init_proc(ssp_samples.shape[0])
+                # logger.debug("proc data samples: %s" % ssp_samples.shape[0])
+                self._fill_samples(samples=ssp.cur.proc, values=ssp_samples)
 
             except sqlite3.Error as e:
                 logger.error("reading raw samples for %s pk, %s: %s" % (pk, type(e), e))
@@ -843,21 +780,10 @@ class ProjectDb:
 
             # sis data
             try:
-                # noinspection SqlResolve
-                ssp_samples = self.conn.execute("SELECT * FROM sis WHERE ssp_pk=?", (pk,)).fetchall()
-                num_samples = len(ssp_samples)
-                ssp.cur.init_sis(num_samples)
-                # logger.debug("sis data samples: %s" % num_samples)
-                for i in range(num_samples):
-                    # print(ssp_samples[i])
-                    ssp.cur.sis.pressure[i] = ssp_samples[i]['depth']
-                    ssp.cur.sis.depth[i] = ssp_samples[i]['depth']
-                    ssp.cur.sis.speed[i] = ssp_samples[i]['speed']
-                    ssp.cur.sis.temp[i] = ssp_samples[i]['temperature']
-                    ssp.cur.sis.conductivity[i] = ssp_samples[i]['conductivity']
-                    ssp.cur.sis.sal[i] = ssp_samples[i]['salinity']
-                    ssp.cur.sis.source[i] = ssp_samples[i]['source']
-                    ssp.cur.sis.flag[i] = ssp_samples[i]['flag']
+                ssp_samples = self._samples_by_pk(table="sis", pk=pk)
+                ssp.cur.init_sis(ssp_samples.shape[0])
+                # logger.debug("sis data samples: %s" % ssp_samples.shape[0])
+                self._fill_samples(samples=ssp.cur.sis, values=ssp_samples)
 
             except sqlite3.Error as e:
                 logger.error("reading sis samples for %s pk, %s: %s" % (pk, type(e), e))
@@ -868,6 +794,84 @@ class ProjectDb:
 
         return ssp
 
+    def _samples_by_pk(self, table: str, pk: int) -> np.ndarray:
+        """Retrieve all the samples of a table for the passed pk as a (samples x fields) float array"""
+        cur = self.conn.cursor()
+        cur.row_factory = None  # plain tuples are directly converted by NumPy
+        # noinspection SqlResolve
+        rows = cur.execute("SELECT pressure, depth, speed, temperature, conductivity, salinity, source, flag "
+                           "FROM %s WHERE ssp_pk=?" % table, (pk,)).fetchall()
+        # NULL values (e.g., stored NaN) are converted to NaN
+        return np.array(rows, dtype=np.float64).reshape(len(rows), 8)
+
+    def samples_by_pks(self, pks: Optional[list] = None, table: str = "proc") -> Optional[dict]:
+        """Retrieve with a single query the samples of many profiles (all the profiles if pks is None)
+
+        The samples are returned as a dict of (samples x fields) float arrays keyed by pk, with the fields in the
+        same order used by the tables: pressure, depth, speed, temperature, conductivity, salinity, source, flag.
+        """
+        if not self.conn:
+            logger.error("missing db connection")
+            return None
+
+        if table not in ("data", "proc", "sis"):
+            logger.error("invalid samples table: %s" % table)
+            return None
+
+        # noinspection SqlResolve
+        sql = "SELECT ssp_pk, pressure, depth, speed, temperature, conductivity, salinity, source, flag FROM %s" \
+              % table
+        queries = list()
+        if pks is None:
+            queries.append((sql + " ORDER BY ssp_pk, rowid", ()))
+        else:
+            pks = [int(pk) for pk in pks]
+            # chunks to stay below the maximum number of host parameters
+            for i in range(0, len(pks), self.max_query_params):
+                chunk = pks[i:i + self.max_query_params]
+                queries.append((sql + " WHERE ssp_pk IN (%s) ORDER BY ssp_pk, rowid" % ",".join("?" * len(chunk)),
+                                chunk))
+
+        cur = self.conn.cursor()
+        cur.row_factory = None  # plain tuples are directly converted by NumPy
+        rows = list()
+        try:
+            for query, params in queries:
+                rows.extend(cur.execute(query, params).fetchall())
+
+        except sqlite3.Error as e:
+            logger.error("reading %s samples, %s: %s" % (table, type(e), e))
+            return None
+
+        # NULL values (e.g., stored NaN) are converted to NaN
+        values = np.array(rows, dtype=np.float64).reshape(len(rows), 9)
+        samples = dict()
+        if pks is not None:
+            for pk in pks:
+                samples[pk] = np.empty((0, 8), dtype=np.float64)
+
+        # the rows are sorted by pk: split them where the pk changes
+        row_pks, starts = np.unique(values[:, 0].astype(np.int64), return_index=True)
+        for pk, chunk in zip(row_pks.tolist(), np.split(values[:, 1:], starts[1:])):
+            samples[pk] = chunk
+
+        return samples
+
+    @staticmethod
+    def _fill_samples(samples, values: np.ndarray) -> None:
+        if values.shape[0] == 0:
+            return
+
+        samples.pressure[:] = values[:, 0]
+        samples.depth[:] = values[:, 1]
+        samples.speed[:] = values[:, 2]
+        samples.temp[:] = values[:, 3]
+        samples.conductivity[:] = values[:, 4]
+        samples.sal[:] = values[:, 5]
+        samples.source[:] = values[:, 6]
+        samples.flag[:] = values[:, 7]
+        samples.modified()
+
     def delete_profile_by_pk(self, pk: int) -> bool:
         """Delete all the entries related to a SSP primary key"""
         self.tmp_ssp_pk = pk
@@ -9,6 +9,8 @@ from PySide6 import QtWidgets
 from cartopy.feature import NaturalEarthFeature
 from matplotlib import rc_context
 
+from hyo2.ssm2.lib.profile.dicts import Dicts
+
 logger = logging.getLogger(__name__)
 
 
@@ -143,15 +145,13 @@ class PlotDb:
     class AvgSsp:
         def __init__(self):
             # create and populate list used in the calculations
-            self.limits = list()  # bin limits
+            self.limits = np.arange(10, 781, 10)  # bin limits
             self.depths = list()  # avg depth for each bin
-            self.bins = list()  # a list of list with all the value within a bin
+            self.bins = [np.empty(0) for _ in self.limits]  # the values within each bin (populated by calc_avg)
 
-            # populating
-            for i, z in enumerate(range(10, 781, 10)):
-                self.limits.append(z)
-                # self.depths.append(z + 5.)
-                self.bins.append(list())
+            # the samples added, stored as bin indices and values
+            self._bin_ids = list()
+            self._values = list()
 
             # output lists
             self.min_2std = list()
@@ -159,17 +159,21 @@ class PlotDb:
             self.mean = list()
 
         def add_samples(self, depths, values):
-
-            for i, d in enumerate(depths):
-
-                for j, lim in enumerate(self.limits):
-
-                    if d < lim:
-                        self.bins[j].append(values[i])
-                        break
+            # each sample goes in the first bin with a limit deeper than the sample (deeper samples are dropped)
+            bin_ids = np.searchsorted(self.limits, np.asarray(depths), side='right')
+            inside = bin_ids < len(self.limits)
+            self._bin_ids.append(bin_ids[inside])
+            self._values.append(np.asarray(values)[inside])
 
         def calc_avg(self):
 
+            if len(self._bin_ids) > 0:
+                bin_ids = np.concatenate(self._bin_ids)
+                values = np.concatenate(self._values)
+                order = np.argsort(bin_ids, kind='stable')
+                counts = np.bincount(bin_ids, minlength=len(self.limits))
+                self.bins = np.split(values[order], np.cumsum(counts)[:-1])
+
             skip_counter = 0
 
             for i, i_bin in enumerate(self.bins):
@@ -196,6 +200,18 @@ class PlotDb:
             if skip_counter > 0:
                 logger.debug("skipped depth bins: %d" % skip_counter)
 
+    def _valid_proc_samples(self, pks):
+        """Retrieve with a single query the valid depth and sound speed samples of the passed profiles"""
+        samples = self.db.samples_by_pks(pks=pks, table="proc")
+        if samples is None:
+            raise RuntimeError("Unable to retrieve the profile samples")
+
+        valid_samples = dict()
+        for pk, values in samples.items():
+            valid = values[:, 7] == Dicts.flags['valid']
+            valid_samples[pk] = (values[valid, 1], values[valid, 2])  # depth, speed
+        return valid_samples
+
     def aggregate_plot(self, dates, output_folder, save_fig=False):
         """aggregate plot with all the SSPs between the passed dates"""
 
@@ -222,7 +238,7 @@ class PlotDb:
 
         avg_ssp = PlotDb.AvgSsp()
 
-        ssp_count = 0
+        pks = list()
         for ts_pk in ts_list:
 
             tmp_date = ts_pk[1].date()
@@ -232,17 +248,14 @@ class PlotDb:
                 logger.debug("skip for date")
                 continue
 
-            ssp_count += 1
-            # print(ts_pk[1], ts_pk[0])
-            tmp_ssp = self.db.profile_by_pk(ts_pk[0])
-            # print(tmp_ssp)
-            ax.plot(tmp_ssp.cur.proc.speed[tmp_ssp.cur.proc_valid], tmp_ssp.cur.proc.depth[tmp_ssp.cur.proc_valid], '.',
-                    color=(0.85, 0.85, 0.85), markersize=2
-                    # label='%s [%04d] ' % (ts_pk[0].time(), ts_pk[1])
-                    )
+            pks.append(ts_pk[0])
 
-            avg_ssp.add_samples(tmp_ssp.cur.proc.depth[tmp_ssp.cur.proc_valid],
-                                tmp_ssp.cur.proc.speed[tmp_ssp.cur.proc_valid])
+        ssp_count = len(pks)
+        valid_samples = self._valid_proc_samples(pks)
+        for pk in pks:
+            depth, speed = valid_samples[pk]
+            ax.plot(speed, depth, '.', color=(0.85, 0.85, 0.85), markersize=2)
+            avg_ssp.add_samples(depth, speed)
 
         avg_ssp.calc_avg()
         ax.plot(avg_ssp.mean, avg_ssp.depths, '-b', linewidth=2)
@@ -301,19 +314,18 @@ class PlotDb:
         max_depth = None
         min_speed = None
         max_speed = None
+        valid_samples = self._valid_proc_samples([row[0] for row in rows])
         for row in rows:
             row_date = row[1].date()  # 1 is the cast_datetime
             logger.info("added profile to plot #%d" % date_list.index(row_date))
             date_plots[row_date] += 1
 
             fig = plt.figure(date_list.index(row_date))
-            row_ssp = self.db.profile_by_pk(row[0])
-            fig.get_axes()[0].plot(row_ssp.cur.proc.speed[row_ssp.cur.proc_valid],
-                                   row_ssp.cur.proc.depth[row_ssp.cur.proc_valid],
-                                   label='%s [%04d]' % (row[1].time(), row[0]))
+            depth, speed = valid_samples[row[0]]
+            fig.get_axes()[0].plot(speed, depth, label='%s [%04d]' % (row[1].time(), row[0]))
 
             # check max depth
-            max_d = np.max(row_ssp.cur.proc.depth[row_ssp.cur.proc_valid])
+            max_d = np.max(depth)
             if not max_depth:
                 max_depth = max_d
             else:
@@ -321,7 +333,7 @@ class PlotDb:
                     max_depth = max_d
 
             # check min sound speed
-            min_s = np.min(row_ssp.cur.proc.speed[row_ssp.cur.proc_valid])
+            min_s = np.min(speed)
             if not min_speed:
                 min_speed = min_s
             else:
@@ -329,7 +341,7 @@ class PlotDb:
                     min_speed = min_s
 
             # check max sound speed
-            max_s = np.max(row_ssp.cur.proc.speed[row_ssp.cur.proc_valid])
+            max_s = np.max(speed)
             if not max_speed:
                 max_speed = max_s
             else:
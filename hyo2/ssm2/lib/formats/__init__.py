@@ -1,101 +1,66 @@
 import logging
 
+# the sub-packages are imported upfront, so that their later (lazy) loading cannot shadow the registries below
+from . import readers as _readers_pkg  # noqa: F401
+from . import writers as _writers_pkg  # noqa: F401
+from .registry import FormatEntry, FormatRegistry
+
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
-# readers
-from .readers.aml import Aml
-from .readers.aoml import Aoml
-from .readers.asvp import Asvp
-from .readers.caris import Caris
-from .readers.castaway import Castaway
-from .readers.csiro_dtc import CSIRO_DTC
-from .readers.digibarpro import DigibarPro
-from .readers.digibars import DigibarS
-from .readers.elac import Elac
-from .readers.hypack import Hypack
-from .readers.idronaut import Idronaut
-from .readers.iss import Iss
-from .readers.mvp import Mvp
-from .readers.rbr import RBR
-from .readers.saiv import Saiv
-from .readers.sea_and_sun import SeaAndSun
-from .readers.seabird import Seabird
-# from .readers.simrad import Simrad
-from .readers.oceanscience import OceanScience
-from .readers.sippican import Sippican
-from .readers.sonardyne import Sonardyne
-from .readers.turo import Turo
-from .readers.unb import Unb
-from .readers.valeport import Valeport
-
-readers = list()
-readers.append(Aml())
-readers.append(Aoml())
-readers.append(Caris())
-readers.append(Castaway())
-readers.append(CSIRO_DTC())
-readers.append(DigibarPro())
-readers.append(DigibarS())
-readers.append(Elac())
-readers.append(Hypack())
-readers.append(Idronaut())
-readers.append(Iss())
-readers.append(Asvp())
-readers.append(Mvp())
-readers.append(OceanScience())
-readers.append(RBR())
-readers.append(Saiv())
-readers.append(SeaAndSun())
-readers.append(Seabird())
-# readers.append(Simrad())
-readers.append(Sippican())
-readers.append(Sonardyne())
-readers.append(Turo())
-readers.append(Unb())
-readers.append(Valeport())
-
-name_readers = list()
-ext_readers = list()
-desc_readers = list()
-for reader in readers:
-    name_readers.append(reader.name)
-    ext_readers.append(reader.ext)
-    desc_readers.append(reader.desc)
+# readers: the modules are only imported when a reader is first accessed
+readers = FormatRegistry([
+    FormatEntry(".readers.aml", "Aml", "aml", {"aml", "csv"}, "AML"),
+    FormatEntry(".readers.aoml", "Aoml", "aoml", {"txt"}, "AOML"),
+    FormatEntry(".readers.caris", "Caris", "caris", {"svp"}, "CARIS"),
+    FormatEntry(".readers.castaway", "Castaway", "castaway", {"csv"}, "Castaway"),
+    FormatEntry(".readers.csiro_dtc", "CSIRO_DTC", "csiro_dtc", {"json"}, "CSIRO DTC"),
+    FormatEntry(".readers.digibarpro", "DigibarPro", "digibarpro", {"txt"}, "Digibar Pro"),
+    FormatEntry(".readers.digibars", "DigibarS", "digibars", {"csv"}, "Digibar S"),
+    FormatEntry(".readers.elac", "Elac", "elac", {"sva"}, "ELAC"),
+    FormatEntry(".readers.hypack", "Hypack", "hypack", {"vel"}, "Hypack"),
+    FormatEntry(".readers.idronaut", "Idronaut", "idronaut", {"txt"}, "Idronaut"),
+    FormatEntry(".readers.iss", "Iss", "iss", {"svp", "d*", "v*"}, "ISS"),
+    FormatEntry(".readers.asvp", "Asvp", "asvp", {"asvp"}, "Konsgberg"),
+    FormatEntry(".readers.mvp", "Mvp", "mvp", {"asvp", "calc", "m1", "s05", "s10", "s12", "s52"}, "MVP"),
+    FormatEntry(".readers.oceanscience", "OceanScience", "oceanscience", {"asc"}, "OceanScience"),
+    FormatEntry(".readers.rbr", "RBR", "rbr", {"txt"}, "RBR"),
+    FormatEntry(".readers.saiv", "Saiv", "saiv", {"txt"}, "SAIV"),
+    FormatEntry(".readers.sea_and_sun", "SeaAndSun", "seaandsun", {"tob"}, "SeaAndSun"),
+    FormatEntry(".readers.seabird", "Seabird", "seabird", {"cnv", "tsv"}, "Seabird"),
+    # FormatEntry(".readers.simrad", "Simrad", "simrad", {"ssp", "s??"}, "Simrad"),
+    FormatEntry(".readers.sippican", "Sippican", "sippican", {"edf"}, "Sippican"),
+    FormatEntry(".readers.sonardyne", "Sonardyne", "sonardyne", {"pro"}, "Sonardyne"),
+    FormatEntry(".readers.turo", "Turo", "turo", {"nc"}, "Turo"),
+    FormatEntry(".readers.unb", "Unb", "unb", {"unb"}, "UNB"),
+    FormatEntry(".readers.valeport", "Valeport", "valeport", {"000", "txt", "vp2", "vpd"}, "Valeport"),
+])
 
-# writers
-from .writers.asvp import Asvp
-from .writers.calc import Calc
-from .writers.caris import Caris
-from .writers.csv import Csv
-from .writers.elac import Elac
-from .writers.hipap import Hipap
-from .writers.hypack import Hypack
-from .writers.ixblue import Ixblue
-from .writers.ncei import Ncei
-from .writers.qps import Qps
-from .writers.sonardyne import Sonardyne
-from .writers.unb import Unb
+name_readers = readers.names
+ext_readers = readers.exts
+desc_readers = readers.descs
 
-writers = list()
-writers.append(Calc())
-writers.append(Caris())
-writers.append(Csv())
-writers.append(Elac())
-writers.append(Hipap())
-writers.append(Hypack())
-writers.append(Ixblue())
-writers.append(Asvp())
-writers.append(Ncei())
-writers.append(Qps())
-writers.append(Sonardyne())
-writers.append(Unb())
+# writers: the modules are only imported when a writer is first accessed
+writers = FormatRegistry([
+    FormatEntry(".writers.calc", "Calc", "calc", {"calc"}, "CALC"),
+    FormatEntry(".writers.caris", "Caris", "caris", {"svp"}, "CARIS"),
+    FormatEntry(".writers.csv", "Csv", "csv", {"csv"}, "CSV"),
+    FormatEntry(".writers.elac", "Elac", "elac", {"sva"}, "ELAC"),
+    FormatEntry(".writers.hipap", "Hipap", "hipap", {"USR"}, "HiPAP"),
+    FormatEntry(".writers.hypack", "Hypack", "hypack", {"vel"}, "Hypack"),
+    FormatEntry(".writers.ixblue", "Ixblue", "ixblue", {"txt"}, "iXBlue"),
+    FormatEntry(".writers.asvp", "Asvp", "asvp/ssp", {"asvp", "ssp", "abs"}, "Kongsberg"),
+    FormatEntry(".writers.ncei", "Ncei", "ncei", {"nc"}, "NCEI"),
+    FormatEntry(".writers.qps", "Qps", "qps", {"bsvp"}, "QPS"),
+    FormatEntry(".writers.sonardyne", "Sonardyne", "sonardyne", {"pro"}, "Sonardyne"),
+    FormatEntry(".writers.unb", "Unb", "unb", {"unb"}, "UNB"),
+])
 
 name_writers = list()
 ext_writers = list()
 desc_writers = list()
-for writer in writers:
-    if len(writer.ext):
-        name_writers.append(writer.name)
-        ext_writers.append(writer.ext)
-        desc_writers.append(writer.desc)
+for entry in writers.entries:
+    if len(entry.ext):
+        name_writers.append(entry.name)
+        ext_writers.append(entry.ext)
+        desc_writers.append(entry.desc)
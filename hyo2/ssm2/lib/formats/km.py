@@ -115,13 +115,15 @@ class Km:
     @classmethod
     def calc_2bytes_checksum(cls, bytes_data):
         """Calculate the 2-byte Kongsberg checksum"""
-        checksum = 0
-        for i in range(len(bytes_data)):
-            if (i < 5) or (i > len(bytes_data) - 4):
-                continue
-            checksum += bytes_data[i]
-        checksum %= 2 ** 16
-        return checksum
+        body = np.frombuffer(bytes_data, dtype=np.uint8)[5:len(bytes_data) - 3]
+        return int(body.sum(dtype=np.uint64) % 2 ** 16)
+
+    @classmethod
+    def beam_records(cls, data, offsets, dtype):
+        """Gather the fixed-size records starting at the passed byte offsets into a structured array"""
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        idx = np.asarray(offsets, dtype=np.int64)[:, np.newaxis] + np.arange(dtype.itemsize)
+        return buffer[idx].reshape(-1).view(dtype)
 
     @classmethod
     def km_time(cls, km_date, km_time):
@@ -497,6 +499,11 @@ class KmRangeAngle78(Km):
 
 
 class KmXyz88(Km):
+    beam_dtype = np.dtype([('depth', '<f4'), ('across', '<f4'), ('along', '<f4'), ('detection_window', '<u2'),
+                           ('quality_factor', 'u1'), ('beam_incidence_angle_adjustment', 'i1'),
+                           ('detection_information', 'u1'), ('realtime_cleaning_information', 'i1'),
+                           ('reflectivity', '<i2')])  # 20 bytes per beam
+
     def __init__(self, data):
 
         super(KmXyz88, self).__init__(data)
@@ -511,30 +518,16 @@ class KmXyz88(Km):
         self.sampling_frequency = xyz88[5]
         self.spare = xyz88[6]
 
-        self.depth = np.zeros(self.number_beams)
-        self.across = np.zeros(self.number_beams)
-        self.along = np.zeros(self.number_beams)
-        self.detection_window = np.zeros(self.number_beams)
-        self.quality_factor = np.zeros(self.number_beams)
-        self.beam_incidence_angle_adjustment = np.zeros(self.number_beams)
-        self.detection_information = np.zeros(self.number_beams)
-        self.realtime_cleaning_information = np.zeros(self.number_beams)
-        self.reflectivity = np.zeros(self.number_beams)
-
-        offset = 36
-        bytes_per_beam = 20
-        for count in range(self.number_beams):
-            beam = struct.unpack("<fffHBbBbh", self.data[offset:offset + bytes_per_beam])
-            self.depth[count] = beam[0]
-            self.across[count] = beam[1]
-            self.along[count] = beam[2]
-            self.detection_window[count] = beam[3]
-            self.quality_factor[count] = beam[4]
-            self.beam_incidence_angle_adjustment[count] = beam[5] / 10.0
-            self.detection_information[count] = beam[6]
-            self.realtime_cleaning_information[count] = beam[7]
-            self.reflectivity[count] = beam[8] / 10.0
-            offset += bytes_per_beam
+        beams = np.frombuffer(self.data, dtype=self.beam_dtype, count=self.number_beams, offset=36)
+        self.depth = beams['depth'].astype(np.float64)
+        self.across = beams['across'].astype(np.float64)
+        self.along = beams['along'].astype(np.float64)
+        self.detection_window = beams['detection_window'].astype(np.float64)
+        self.quality_factor = beams['quality_factor'].astype(np.float64)
+        self.beam_incidence_angle_adjustment = beams['beam_incidence_angle_adjustment'] / 10.0
+        self.detection_information = beams['detection_information'].astype(np.float64)
+        self.realtime_cleaning_information = beams['realtime_cleaning_information'].astype(np.float64)
+        self.reflectivity = beams['reflectivity'] / 10.0
 
     @property
     def mean_depth(self):
@@ -542,18 +535,10 @@ class KmXyz88(Km):
                 (self.detection_information is None):
             return None
 
-        mean_depth = 0.0
-        depth_count = 0
-        for beam in range(self.number_beams):
-            if int(self.detection_information[beam]) & 0x80 != 0:
-                # We skip beams without valid detections
-                continue
-            mean_depth = mean_depth + self.depth[beam]
-            depth_count += 1
-
-        if depth_count > 0:
-            mean_depth = mean_depth / depth_count + self.transducer_draft
-            return mean_depth
+        # We skip beams without valid detections
+        valid = (self.detection_information[:self.number_beams].astype(np.int64) & 0x80) == 0
+        if np.any(valid):
+            return float(np.mean(self.depth[:self.number_beams][valid])) + self.transducer_draft
         return None
 
     def __str__(self):
@@ -581,6 +566,9 @@ class KmXyz88(Km):
 
 
 class KmSeabedImage89(Km):
+    beam_dtype = np.dtype([('sorting_direction', 'i1'), ('detection_information', 'u1'),
+                           ('number_samples', '<u2'), ('center_sample', '<u2')])  # 6 bytes per beam
+
     def __init__(self, data, remote=True):
 
         super(KmSeabedImage89, self).__init__(data, remote=remote)
@@ -598,36 +586,23 @@ class KmSeabedImage89(Km):
         self.tvg_crossover_angle = float(image_head[5]) / 10.0
         self.number_beams = image_head[6]
 
-        self.sorting_direction = np.zeros(self.number_beams, dtype=np.int)
-        self.detection_information = np.zeros(self.number_beams, dtype=np.int)
-        self.number_samples = np.zeros(self.number_beams, dtype=np.int)
-        self.center_sample = np.zeros(self.number_beams, dtype=np.int)
-
         if remote:
             offset = 32
         else:
             offset = 36
-        bytes_per_beam = 6
-        self.snippets_nr = 0
-        for b in range(self.number_beams):
-            beam = struct.unpack("<bB2H", self.data[offset:offset + bytes_per_beam])
-            self.sorting_direction[b] = beam[0]
-            self.detection_information[b] = beam[1]
-            self.number_samples[b] = beam[2]
-            self.center_sample[b] = beam[3]
-            self.snippets_nr += self.number_samples[b]
-            offset += bytes_per_beam
-
-        self.snippets = []
-        for b in range(self.number_beams):
-            parse_string = "<%dh" % (self.number_samples[b])
-            bytes_to_read = int(2 * self.number_samples[b])
-            raw_samples = struct.unpack(parse_string, self.data[offset:offset + bytes_to_read])
-            samples = np.zeros(self.number_samples[b])
-            for s in range(int(self.number_samples[b])):
-                samples[s] = float(raw_samples[s]) / 10.0
-            self.snippets.append(samples)
-            offset += bytes_to_read
+        beams = np.frombuffer(self.data, dtype=self.beam_dtype, count=self.number_beams, offset=offset)
+        self.sorting_direction = beams['sorting_direction'].astype(np.int64)
+        self.detection_information = beams['detection_information'].astype(np.int64)
+        self.number_samples = beams['number_samples'].astype(np.int64)
+        self.center_sample = beams['center_sample'].astype(np.int64)
+        self.snippets_nr = int(self.number_samples.sum())
+        offset += self.beam_dtype.itemsize * self.number_beams
+
+        raw_samples = np.frombuffer(self.data, dtype='<i2', count=self.snippets_nr, offset=offset)
+        if self.number_beams > 0:
+            self.snippets = np.split(raw_samples / 10.0, np.cumsum(self.number_samples)[:-1])
+        else:
+            self.snippets = []
 
     def __str__(self):
 
@@ -652,6 +627,11 @@ class KmSeabedImage89(Km):
 
 
 class KmWatercolumn(Km):
+    sector_dtype = np.dtype([('tilt_angle', '<i2'), ('frequency', '<u2'), ('number', 'u1'),
+                             ('spare', 'u1')])  # 6 bytes per sector
+    beam_dtype = np.dtype([('pointing_angle', '<i2'), ('start_range', '<u2'), ('num_samples', '<u2'),
+                           ('detected_range', '<u2'), ('sector_number', 'u1'), ('number', 'u1')])  # 10 bytes per beam
+
     def __init__(self, data):
 
         super(KmWatercolumn, self).__init__(data)
@@ -672,43 +652,32 @@ class KmWatercolumn(Km):
         self.spare2 = wc_header[12]
         self.spare3 = wc_header[13]
 
-        self.sector_tilt_angle = np.zeros(self.number_tx_sectors)
-        self.sector_frequency = np.zeros(self.number_tx_sectors)
-        self.sector_number = np.zeros(self.number_tx_sectors)
-        self.sector_spare = np.zeros(self.number_tx_sectors)
-
         offset = 40
-        for s in range(self.number_tx_sectors):
-            sector = struct.unpack("<hHBB", self.data[offset:offset + 6])
-            self.sector_tilt_angle[s] = float(sector[0]) / 100.0
-            self.sector_frequency[s] = float(sector[1]) * 10
-            self.sector_number[s] = sector[2]
-            self.sector_spare[s] = sector[3]
-            offset += 6
-
-        self.beam_pointing_angle = np.zeros(self.number_beams)
-        self.beam_start_range = np.zeros(self.number_beams)
-        self.beam_num_samples = np.zeros(self.number_beams)
-        self.beam_detected_range = np.zeros(self.number_beams)
-        self.beam_sector_number = np.zeros(self.number_beams)
-        self.beam_number = np.zeros(self.number_beams)
-
-        self.samples = []
-
-        bytes_per_beam = 10
+        sectors = np.frombuffer(self.data, dtype=self.sector_dtype, count=self.number_tx_sectors, offset=offset)
+        self.sector_tilt_angle = sectors['tilt_angle'] / 100.0
+        self.sector_frequency = sectors['frequency'] * 10.0
+        self.sector_number = sectors['number'].astype(np.float64)
+        self.sector_spare = sectors['spare'].astype(np.float64)
+        offset += self.sector_dtype.itemsize * self.number_tx_sectors
+
+        # each beam record is followed by its samples, so only the beam offsets are collected by hopping
+        bytes_per_beam = self.beam_dtype.itemsize
+        beam_offsets = np.empty(self.number_beams, dtype=np.int64)
         for b in range(self.number_beams):
-            beam = struct.unpack("<h3H2B", self.data[offset:offset + bytes_per_beam])
-            self.beam_pointing_angle[b] = float(beam[0]) / 100.0
-            self.beam_start_range[b] = beam[1]
-            self.beam_num_samples[b] = beam[2]
-            self.beam_detected_range[b] = beam[3]
-            self.beam_sector_number[b] = beam[4]
-            self.beam_number[b] = beam[5]
-
-            offset += bytes_per_beam
-            samples = self.data[offset:offset + int(self.beam_num_samples[b])]
-            self.samples.append(samples)
-            offset += int(self.beam_num_samples[b])
+            beam_offsets[b] = offset
+            offset += bytes_per_beam + struct.unpack_from("<H", self.data, offset + 4)[0]
+        beams = self.beam_records(self.data, beam_offsets, self.beam_dtype)
+
+        self.beam_pointing_angle = beams['pointing_angle'] / 100.0
+        self.beam_start_range = beams['start_range'].astype(np.float64)
+        self.beam_num_samples = beams['num_samples'].astype(np.float64)
+        self.beam_detected_range = beams['detected_range'].astype(np.float64)
+        self.beam_sector_number = beams['sector_number'].astype(np.float64)
+        self.beam_number = beams['number'].astype(np.float64)
+
+        samples_start = beam_offsets + bytes_per_beam
+        samples_end = samples_start + beams['num_samples']
+        self.samples = [self.data[start:end] for start, end in zip(samples_start.tolist(), samples_end.tolist())]
 
     def __str__(self):
 
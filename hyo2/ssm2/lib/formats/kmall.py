@@ -159,6 +159,25 @@ class KmallSSM(Kmall):
 
 
 class KmallMRZ(Kmall):
+    # each sounding (EMdgmMRZ_sounding): '<H8BH6f2H18f4H' -> 120 bytes
+    sounding_dtype = np.dtype([
+        ('sounding_index', '<u2'), ('tx_sector_numb', 'u1'), ('detection_type', 'u1'),
+        ('detection_method', 'u1'), ('rejection_info1', 'u1'), ('rejection_info2', 'u1'),
+        ('post_processing_info', 'u1'), ('detection_class', 'u1'), ('detection_confidence_level', 'u1'),
+        ('padding', '<u2'), ('range_factor', '<f4'), ('quality_factor', '<f4'),
+        ('detection_uncertainty_ver_m', '<f4'), ('detection_uncertainty_hor_m', '<f4'),
+        ('detection_window_length_sec', '<f4'), ('echo_length_sec', '<f4'),
+        ('wc_beam_numb', '<u2'), ('wc_range_samples', '<u2'), ('wc_nom_beam_angle_along_deg', '<f4'),
+        ('mean_abs_coeff_db_per_km', '<f4'), ('reflectivity1_db', '<f4'), ('reflectivity2_db', '<f4'),
+        ('receiver_sensitivity_applied_db', '<f4'), ('source_level_applied_db', '<f4'),
+        ('bs_calibration_db', '<f4'), ('tvg_db', '<f4'), ('beam_angle_re_rx_deg', '<f4'),
+        ('beam_angle_correction_deg', '<f4'), ('two_way_travel_time_sec', '<f4'),
+        ('two_way_travel_time_correction_sec', '<f4'), ('delta_latitude_deg', '<f4'),
+        ('delta_longitude_deg', '<f4'), ('z_re_ref_point_m', '<f4'), ('y_re_ref_point_m', '<f4'),
+        ('x_re_ref_point_m', '<f4'), ('beam_inc_angle_adj_deg', '<f4'), ('real_time_clean_info', '<u2'),
+        ('si_start_range_samples', '<u2'), ('si_centre_sample', '<u2'), ('si_num_samples', '<u2')
+    ])
+
     def __init__(self, data, debug: bool = False):
         super().__init__(data)
 
@@ -224,33 +243,27 @@ class KmallMRZ(Kmall):
         end_of_rx_info = end_of_tx_sectors + rx_info_length
         end_of_extra_det_class_info = end_of_rx_info + nr_extra_detection_classes * nr_bytes_per_class
 
-        # each sounding       8 15   35 39
-        sounding_struct = '<H8BH6f2H18f4H'
-
-        depths_valid = 0
-        depths_sum = 0.0
-        for i in range(nr_of_soundings):
-            start_sounding = end_of_extra_det_class_info + i * sounding_length
-            end_sounding = end_of_extra_det_class_info + (i + 1) * sounding_length
-            if len(self.data[start_sounding:end_sounding]) != sounding_length:
-                # logger.debug("sounding #%d: data length: %d -> break"
-                #              % (i, len(self.data[start_sounding:end_sounding])))
-                break
-            sounding = struct.unpack(sounding_struct, self.data[start_sounding:end_sounding])
-            # sounding_idx = sounding[0]
-            # logger.debug("sounding -> #%d" % (sounding_idx, ))
-            sounding_detection_type = sounding[2]
-            # logger.debug("sounding -> detection type: %s" % (sounding_detection_type, ))
-            sounding_detection_method = sounding[3]
-            # logger.debug("sounding -> detection method: %s" % (sounding_detection_method, ))
-            sounding_z = sounding[32]
-            # sounding_y = sounding[33]
-            # sounding_x = sounding[34]
-            # logger.debug("sounding -> z: %s, y: %s, x: %s" % (sounding_z, sounding_y, sounding_x))
-
-            if (sounding_detection_type == 0) and (sounding_detection_method != 0):
-                depths_valid += 1
-                depths_sum += sounding_z
+        nr_of_extra_detections = rx_info[9]
+
+        # the main soundings, then the extra detections, then the seabed image samples of both
+        if sounding_length < self.sounding_dtype.itemsize:
+            logger.warning('MRZ -> Unsupported sounding length: %d' % sounding_length)
+            nr_of_soundings = 0
+            nr_of_extra_detections = 0
+        sounding_dtype = self.padded_dtype(self.sounding_dtype, sounding_length)
+        self.soundings = self._read_array(end_of_extra_det_class_info, nr_of_soundings, sounding_dtype)
+        start_of_extra_detections = end_of_extra_det_class_info + self.soundings.nbytes
+        self.extra_detections = self._read_array(start_of_extra_detections, nr_of_extra_detections,
+                                                 sounding_dtype)
+        start_of_seabed_image = start_of_extra_detections + self.extra_detections.nbytes
+        nr_of_seabed_image_samples = int(self.soundings['si_num_samples'].sum(dtype=np.int64)
+                                         + self.extra_detections['si_num_samples'].sum(dtype=np.int64))
+        self.seabed_image_samples = self._read_array(start_of_seabed_image, nr_of_seabed_image_samples,
+                                                     np.dtype('<i2'))
+
+        valid = (self.soundings['detection_type'] == 0) & (self.soundings['detection_method'] != 0)
+        depths_valid = int(np.count_nonzero(valid))
+        depths_sum = float(np.sum(self.soundings['z_re_ref_point_m'][valid], dtype=np.float64))
 
         self.mean_depth = None
         if depths_valid > 0:
@@ -266,6 +279,24 @@ class KmallMRZ(Kmall):
         if not self.is_valid:
             logger.warning('MRZ -> Invalid length: %s != %s' % (final_length, self.length))
 
+    @classmethod
+    def padded_dtype(cls, dtype: np.dtype, itemsize: int) -> np.dtype:
+        """Extend the passed structured dtype to a larger record size (e.g., for newer datagram versions)"""
+        if itemsize <= dtype.itemsize:
+            return dtype
+        return np.dtype({'names': dtype.names,
+                         'formats': [dtype.fields[name][0] for name in dtype.names],
+                         'offsets': [dtype.fields[name][1] for name in dtype.names],
+                         'itemsize': itemsize})
+
+    def _read_array(self, offset: int, count: int, dtype: np.dtype) -> np.ndarray:
+        """Map the records fully present before the final length field"""
+        available = max(len(self.data) - 4 - offset, 0) // dtype.itemsize
+        count = min(count, available)
+        if count < 1:
+            return np.zeros(0, dtype=dtype)
+        return np.frombuffer(self.data, dtype=dtype, count=count, offset=offset)
+
     def __str__(self):
         output = Kmall.__str__(self)
         output += '\ttss: %s\n\tmean depth: %s m\n' % \
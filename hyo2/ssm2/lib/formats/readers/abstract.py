@@ -1,8 +1,12 @@
 from abc import ABCMeta, abstractmethod
+import codecs
+import itertools
+import os
+import warnings
 import numpy as np
 import logging
 
-from hyo2.ssm2.lib.base.files import FileManager
+from hyo2.ssm2.lib.base.files import FileInfo, FileManager
 from hyo2.ssm2.lib.base.callbacks.cli_callbacks import CliCallbacks
 from hyo2.ssm2.lib.formats.abstract import AbstractFormat
 from hyo2.ssm2.lib.profile.dicts import Dicts
@@ -128,6 +132,8 @@ class AbstractReader(AbstractFormat, metaclass=ABCMeta):
 class AbstractTextReader(AbstractReader, metaclass=ABCMeta):
     """ Abstract text data reader """
 
+    batch_size = 100000  # lines converted at once by _parse_columns
+
     def __init__(self):
         super(AbstractTextReader, self).__init__()
         self.lines = []
@@ -160,6 +166,193 @@ class AbstractTextReader(AbstractReader, metaclass=ABCMeta):
         if self.fid is not None:
             self.fid.close()
 
+    def _parse_columns(self, lines, columns, delimiter=None, nr_fields=None, min_fields=None):
+        """Parse the numeric body lines in bulk, returning a dict with a NumPy array for each of the passed columns
+
+        The columns dict maps each name to the index of its field in a line (a negative index counts from the end),
+        while the fields that are not mapped are never converted (thus they can be non-numeric, like a timestamp).
+        The lines can be any iterable (e.g., a list or the stream of a streaming reader): they are converted in
+        batches. Only when a batch has some malformed lines (i.e., a number of fields different from nr_fields or
+        less than min_fields, or a non-numeric mapped field), its lines are validated one by one to skip them.
+        The empty lines are silently skipped, while the count of the malformed lines is logged.
+        """
+        names = list(columns.keys())
+        usecols = [columns[name] for name in names]
+        batches = list()
+        nr_malformed = 0
+
+        lines = iter(lines)
+        while True:
+            batch = list(itertools.islice(lines, self.batch_size))
+            if len(batch) == 0:
+                break
+
+            try:
+                if (nr_fields is not None) or (min_fields is not None):
+                    counts = np.array([len(line.split(delimiter)) for line in batch if len(line.strip()) > 0])
+                    if (nr_fields is not None) and np.any(counts != nr_fields):
+                        raise ValueError("invalid number of fields")
+                    if (min_fields is not None) and np.any(counts < min_fields):
+                        raise ValueError("too few fields")
+
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", UserWarning)  # batch of empty lines
+                    values = np.loadtxt(batch, dtype=np.float64, delimiter=delimiter, usecols=usecols,
+                                        comments=None, ndmin=2)
+
+            except ValueError as e:
+                logger.debug("validating %d lines: %s" % (len(batch), e))
+                rows = list()
+                for line in batch:
+                    if len(line.strip()) == 0:
+                        continue
+
+                    fields = line.split(delimiter)
+                    if ((nr_fields is not None) and (len(fields) != nr_fields)) or \
+                            ((min_fields is not None) and (len(fields) < min_fields)):
+                        nr_malformed += 1
+                        continue
+
+                    try:
+                        rows.append([float(fields[idx]) for idx in usecols])
+                    except (ValueError, IndexError):
+                        nr_malformed += 1
+
+                values = np.array(rows, dtype=np.float64)
+
+            batches.append(values.reshape(-1, len(usecols)))
+
+        if nr_malformed > 0:
+            logger.info("skipped %d malformed lines" % nr_malformed)
+
+        if len(batches) == 0:
+            values = np.empty((0, len(usecols)), dtype=np.float64)
+        else:
+            values = np.concatenate(batches)
+        return {name: values[:, i] for i, name in enumerate(names)}
+
+    @classmethod
+    def _drop_samples(cls, columns, invalid, reason):
+        """Return the parsed columns without the samples flagged by the invalid mask"""
+        nr_invalid = np.count_nonzero(invalid)
+        if nr_invalid == 0:
+            return columns
+
+        logger.info("skipping %d samples for %s" % (nr_invalid, reason))
+        return {name: values[~invalid] for name, values in columns.items()}
+
+    def _store_columns(self, columns):
+        """Store the parsed columns (named as the data fields) in the current profile, resized to their length"""
+        nr_samples = 0
+        if len(columns) > 0:
+            nr_samples = next(iter(columns.values())).shape[0]
+
+        self.ssp.cur.data_resize(nr_samples)
+        for name, values in columns.items():
+            setattr(self.ssp.cur.data, name, values)
+
+
+class AbstractTextStreamReader(AbstractTextReader, metaclass=ABCMeta):
+    """ Abstract text data reader that streams the lines of the file
+
+    The file is never loaded as a whole: the encoding is detected from the first chunk, then the lines are read
+    (and can be parsed) one chunk at a time. The samples are stored by growing the buffers of the current profile
+    by doubling, thus the memory used is bounded by the size of the samples rather than by the size of the file.
+    """
+
+    chunk_size = 1024 * 1024  # bytes
+
+    def __init__(self):
+        super(AbstractTextStreamReader, self).__init__()
+        self.encoding = None
+        self.file_size = 0
+        self.read_size = 0  # bytes (approximated by the position in the underlying buffer)
+        self.read_chars = 0
+        self.read_lines = 0
+        self.stream = None  # generator of lines (without line terminators)
+
+    def _detect_encoding(self, data_path):
+        """Return the encoding of the passed file, only based on its first chunk"""
+        with open(data_path, mode='rb') as fid:
+            chunk = fid.read(self.chunk_size)
+
+        try:
+            # an incremental decoder does not fail on a multi-byte character truncated at the end of the chunk
+            codecs.getincrementaldecoder('utf8')().decode(chunk, final=False)
+            return 'utf8'
+        except UnicodeDecodeError as e:
+            logger.info("changing encoding to latin: %s" % e)
+            return 'latin'
+
+    def _open(self, data_path, progress=None):
+        """Helper function to open the raw file and to initialize the stream of lines"""
+        if not os.path.exists(data_path):
+            raise RuntimeError('the passed file does not exist: %s' % data_path)
+
+        self.encoding = self._detect_encoding(data_path)
+        self.file_size = os.path.getsize(data_path)
+        self.read_size = 0
+        self.read_chars = 0
+        self.read_lines = 0
+
+        self.fid = FileInfo(data_path)
+        # invalid bytes after the first chunk are replaced (they only invalidate the lines containing them)
+        self.fid.io = open(self.fid.path, mode='r', encoding=self.encoding, errors='replace')
+        self.stream = self._stream_lines(progress=progress)
+
+        self.samples_offset = 0
+        self.field_index = dict()
+        self.more_fields = list()
+
+    def _close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+        if (self.fid is not None) and (self.fid.io is not None):
+            self.fid.io.close()
+
+    def _stream_chunks(self, progress=None):
+        """Generator of the lists of lines in each chunk of the opened file"""
+        reported = 0
+        while True:
+            lines = self.fid.io.readlines(self.chunk_size)
+            if len(lines) == 0:
+                break
+
+            self.read_size = self.fid.io.buffer.tell()
+            self.read_chars += sum(len(line) for line in lines)
+            self.read_lines += len(lines)
+
+            # only for the files that are read in several chunks, every 10%
+            if (progress is not None) and (self.file_size > self.chunk_size):
+                percent = min(int(100 * self.read_size / self.file_size), 100)
+                if percent >= reported + 10:
+                    reported = percent - percent % 10
+                    progress.update(text="Reading %s: %d%%" % (self.fid.basename, reported))
+
+            yield [line.rstrip('\r\n') for line in lines]
+
+    def _stream_lines(self, progress=None):
+        """Generator of the lines of the opened file"""
+        for lines in self._stream_chunks(progress=progress):
+            yield from lines
+
+    def _estimate_nr_lines(self):
+        """Estimate the total number of lines from the chunks read so far (used to preallocate the buffers)"""
+        if self.read_chars == 0:
+            return 1
+
+        return max(int(self.file_size * self.read_lines / self.read_chars) + 1, self.read_lines)
+
+    def _reserve_samples(self, count):
+        """Make room for at least 'count' data samples in the current profile (by doubling the size)"""
+        num_samples = self.ssp.cur.data.num_samples
+        if count <= num_samples:
+            return
+
+        self.ssp.cur.data_resize(max(count, 2 * num_samples))
+
 
 class AbstractBinaryReader(AbstractReader, metaclass=ABCMeta):
     """ Abstract binary data reader """
@@ -403,8 +403,6 @@ class Aml(AbstractTextReader):
     def _csv_body(self):
         logger.debug('parsing CSV body')
 
-        count = 0
-        read_samples = False
         has_depth_and_speed = False
         has_pressure_and_speed = False
         has_calc_speed = False
@@ -418,338 +416,161 @@ class Aml(AbstractTextReader):
 
         self.ssp.cur.init_data(len(self.lines))
 
+        # first look for [data]
+        data_row = None
         for row_nr, line in enumerate(self.lines):
 
-            # logger.debug("%d : %s" % (row_nr, line))
-
-            # first look for [data]
-            if not read_samples:
-
-                tokens = line.split()
-
-                if len(tokens) == 0:
-                    continue
-
-                if tokens[0].lower() == self._csv.data:
-                    read_samples = True
-                    data_row = row_nr
-                    logger.debug("found data token: %s at row: %d" % (self._csv.data, data_row))
-                    continue
-
-                continue
-
-            # then look for depth and speed indices
-            if not (has_depth_and_speed or has_pressure_and_speed):
-
-                tokens = line.split(",")
-                for idx, token in enumerate(tokens):
-
-                    if token == self._csv.depth:
-                        depth_idx = idx
-                        logger.debug("found depth index: %s" % depth_idx)
-
-                    elif token == self._csv.pressure:
-                        pressure_idx = idx
-                        logger.debug("found pressure index: %s" % pressure_idx)
-
-                    elif token == self._csv.temp:
-                        temp_idx = idx
-                        has_temp = True
-                        logger.debug("found temp index: %s" % temp_idx)
-
-                    elif token == self._csv.sal:
-                        sal_idx = idx
-                        has_sal = True
-                        logger.debug("found sal index: %s" % sal_idx)
-
-                    elif token == self._csv.speed:
-                        speed_idx = idx
-                        logger.debug("found sound speed index: %s" % speed_idx)
-
-                    elif (token == self._csv.speed2) and (speed_idx is None):
-                        speed_idx = idx
-                        has_calc_speed = True
-                        logger.debug("found sound speed index [2]: %s" % speed_idx)
-
-                    continue
-
-                # set flag to true
-                if (depth_idx is not None) and (speed_idx is not None):
-                    has_depth_and_speed = True
-
-                elif (pressure_idx is not None) and (speed_idx is not None):
-                    has_pressure_and_speed = True
-
-                if has_pressure_and_speed or has_depth_and_speed:
-
-                    if has_temp:
-
-                        if not has_sal:
-
-                            if has_calc_speed:  # special case: we treat is as XBT
-                                self.ssp.cur.meta.sensor_type = Dicts.sensor_types['XBT']
-                                logger.debug("detected sensor type: XBT")
-
-                            else:
-                                self.ssp.cur.meta.sensor_type = Dicts.sensor_types['SVPT']
-                                logger.debug("detected sensor type: SVPT")
-
-                        else:
-                            self.ssp.cur.meta.sensor_type = Dicts.sensor_types['CTD']
-                            logger.debug("detected sensor type: CTD")
-                continue
-
-            # finally the data
-            tokens = line.split(",")
+            tokens = line.split()
             if len(tokens) == 0:
                 continue
 
-            for idx, token in enumerate(tokens):
-
-                try:
-
-                    if idx == depth_idx:
-                        self.ssp.cur.data.depth[count] = float(tokens[depth_idx])
-                        if has_depth_and_speed:
-                            if speed_idx < depth_idx:
-                                count += 1
-                        continue
-
-                    elif idx == pressure_idx:
-                        self.ssp.cur.data.pressure[count] = float(tokens[pressure_idx])
-                        if has_pressure_and_speed:
-                            if speed_idx < pressure_idx:
-                                count += 1
-                        continue
-
-                    elif idx == speed_idx:
-                        self.ssp.cur.data.speed[count] = float(tokens[speed_idx])
-                        if has_depth_and_speed:
-                            if speed_idx > depth_idx:
-                                count += 1
-                        elif has_pressure_and_speed:
-                            if speed_idx > pressure_idx:
-                                count += 1
-                        continue
-
-                    elif idx == temp_idx:
-                        self.ssp.cur.data.temp[count] = float(tokens[temp_idx])
-                        continue
-
-                    elif idx == sal_idx:
-                        self.ssp.cur.data.sal[count] = float(tokens[sal_idx])
-                        continue
-
-                    else:  # not parsed value
-                        continue
+            if tokens[0].lower() == self._csv.data:
+                data_row = row_nr
+                logger.debug("found data token: %s at row: %d" % (self._csv.data, data_row))
+                break
 
-                except ValueError:
-                    logger.warning("invalid conversion parsing of line #%s" % row_nr)
-                    continue
-                except IndexError:
-                    logger.warning("invalid index parsing of line #%s" % row_nr)
-                    continue
-
-        if read_samples is False:
+        if data_row is None:
             raise RuntimeError("Issue in finding data token: %s" % self._csv.data)
 
-        if not (has_depth_and_speed or has_pressure_and_speed):
+        # then look for depth and speed indices
+        header_row = None
+        for row_nr in range(data_row + 1, len(self.lines)):
 
-            read_samples = False
-            first_row_done = False
+            tokens = self.lines[row_nr].split(",")
+            for idx, token in enumerate(tokens):
 
-            for row_nr, line in enumerate(self.lines):
+                if token == self._csv.depth:
+                    depth_idx = idx
+                    logger.debug("found depth index: %s" % depth_idx)
 
-                # first look for [data]
-                if not read_samples:
+                elif token == self._csv.pressure:
+                    pressure_idx = idx
+                    logger.debug("found pressure index: %s" % pressure_idx)
 
-                    tokens = line.split()
+                elif token == self._csv.temp:
+                    temp_idx = idx
+                    has_temp = True
+                    logger.debug("found temp index: %s" % temp_idx)
 
-                    if len(tokens) == 0:
-                        continue
+                elif token == self._csv.sal:
+                    sal_idx = idx
+                    has_sal = True
+                    logger.debug("found sal index: %s" % sal_idx)
 
-                    if tokens[0].lower() == self._csv.data:
-                        read_samples = True
-                        data_row = row_nr
-                        logger.debug("found data token: %s at row: %d" % (self._csv.data, data_row))
-                        continue
+                elif token == self._csv.speed:
+                    speed_idx = idx
+                    logger.debug("found sound speed index: %s" % speed_idx)
 
-                    continue
+                elif (token == self._csv.speed2) and (speed_idx is None):
+                    speed_idx = idx
+                    has_calc_speed = True
+                    logger.debug("found sound speed index [2]: %s" % speed_idx)
 
-                # finally the data
-                tokens = line.split(",")
-                if len(tokens) < 4:
-                    continue
+            # set flag to true
+            if (depth_idx is not None) and (speed_idx is not None):
+                has_depth_and_speed = True
 
-                if len(tokens) == 9:  # TODO: currently assuming Base-X2 with CT Xchange and P Xchange installed
-                    conductivity_idx = 2
-                    temp_idx = 3
-                    pressure_idx = 4
-                    sal_idx = 6
-                    speed_idx = 8
+            elif (pressure_idx is not None) and (speed_idx is not None):
+                has_pressure_and_speed = True
 
-                    if not first_row_done:
-                        first_row_done = True
-                        # it should already be set as a SVP type
-                        self.ssp.cur.meta.sensor_type = Dicts.sensor_types['CTD']
-                        logger.debug("guessing: C: %d, T: %d, P: %d, sal: %d, SS: %d"
-                                     % (conductivity_idx, temp_idx, pressure_idx, sal_idx, speed_idx))
+            if has_pressure_and_speed or has_depth_and_speed:
+                header_row = row_nr
 
-                    try:
-                        conductivity = float(tokens[conductivity_idx])
-                        temp = float(tokens[temp_idx])
-                        pressure = float(tokens[pressure_idx])
-                        sal = float(tokens[sal_idx])
-                        speed = float(tokens[speed_idx])
-
-                        if pressure < 0.01:
-                            logger.warning("skipping sample at row #%d -> pressure value: %s" % (row_nr, pressure))
-                            continue
-                        if (speed < 1200.0) or (speed > 1700):
-                            logger.warning("skipping sample at row #%d -> speed value: %s" % (row_nr, speed))
-                            continue
+                if has_temp:
 
-                        self.ssp.cur.data.conductivity[count] = conductivity
-                        self.ssp.cur.data.temp[count] = temp
-                        self.ssp.cur.data.pressure[count] = pressure
-                        self.ssp.cur.data.sal[count] = sal
-                        self.ssp.cur.data.speed[count] = speed
-                        count += 1
+                    if not has_sal:
 
-                    except ValueError:
-                        logger.warning("invalid conversion parsing of line #%s" % row_nr)
-                        continue
-                    except IndexError:
-                        logger.warning("invalid index parsing of line #%s" % row_nr)
-                        continue
-
-                else:  # token != 9 -> just attempting for depth and sound speed
-                    depth_idx = 3
-                    speed_idx = 2
-                    if not first_row_done:
-                        first_row_done = True
-                        # it should already be set as a SVP type
-                        self.ssp.cur.meta.sensor_type = Dicts.sensor_types['SVP']
-                        logger.debug("guessing: d: %s, SS: %s" % (depth_idx, speed_idx))
+                        if has_calc_speed:  # special case: we treat is as XBT
+                            self.ssp.cur.meta.sensor_type = Dicts.sensor_types['XBT']
+                            logger.debug("detected sensor type: XBT")
 
-                    try:
-                        depth = float(tokens[depth_idx])
-                        speed = float(tokens[speed_idx])
+                        else:
+                            self.ssp.cur.meta.sensor_type = Dicts.sensor_types['SVPT']
+                            logger.debug("detected sensor type: SVPT")
 
-                        if depth < 0.01:
-                            logger.warning("skipping sample at row #%d -> depth value: %s" % (row_nr, depth))
-                            continue
-                        if (speed < 1200.0) or (speed > 1700):
-                            logger.warning("skipping sample at row #%d -> speed value: %s" % (row_nr, speed))
-                            continue
+                    else:
+                        self.ssp.cur.meta.sensor_type = Dicts.sensor_types['CTD']
+                        logger.debug("detected sensor type: CTD")
+                break
+
+        # finally the data
+        if header_row is not None:
+            column_map = {'speed': speed_idx}
+            if depth_idx is not None:
+                column_map['depth'] = depth_idx
+            if pressure_idx is not None:
+                column_map['pressure'] = pressure_idx
+            if temp_idx is not None:
+                column_map['temp'] = temp_idx
+            if sal_idx is not None:
+                column_map['sal'] = sal_idx
+            columns = self._parse_columns(self.lines[header_row + 1:], columns=column_map, delimiter=",")
 
-                        self.ssp.cur.data.depth[count] = depth
-                        self.ssp.cur.data.speed[count] = speed
-                        count += 1
+        else:
+            lines = self.lines[data_row + 1:]
+            first_row = next((line for line in lines if len(line.split(",")) >= 4), None)
+
+            if first_row is None:
+                columns = dict()
+
+            elif len(first_row.split(",")) == 9:  # TODO: currently assuming Base-X2 with CT Xchange and P Xchange
+                column_map = {'conductivity': 2, 'temp': 3, 'pressure': 4, 'sal': 6, 'speed': 8}
+                # it should already be set as a SVP type
+                self.ssp.cur.meta.sensor_type = Dicts.sensor_types['CTD']
+                logger.debug("guessing: C: %d, T: %d, P: %d, sal: %d, SS: %d"
+                             % (column_map['conductivity'], column_map['temp'], column_map['pressure'],
+                                column_map['sal'], column_map['speed']))
+
+                columns = self._parse_columns(lines, columns=column_map, delimiter=",", nr_fields=9)
+                columns = self._drop_samples(columns, columns['pressure'] < 0.01, "pressure values")
+                columns = self._drop_samples(columns, (columns['speed'] < 1200.0) | (columns['speed'] > 1700),
+                                             "speed values")
+
+            else:  # token != 9 -> just attempting for depth and sound speed
+                column_map = {'depth': 3, 'speed': 2}
+                # it should already be set as a SVP type
+                self.ssp.cur.meta.sensor_type = Dicts.sensor_types['SVP']
+                logger.debug("guessing: d: %s, SS: %s" % (column_map['depth'], column_map['speed']))
 
-                    except ValueError:
-                        logger.warning("invalid conversion parsing of line #%s" % row_nr)
-                        continue
-                    except IndexError:
-                        logger.warning("invalid index parsing of line #%s" % row_nr)
-                        continue
+                columns = self._parse_columns(lines, columns=column_map, delimiter=",", min_fields=4)
+                columns = self._drop_samples(columns, columns['depth'] < 0.01, "depth values")
+                columns = self._drop_samples(columns, (columns['speed'] < 1200.0) | (columns['speed'] > 1700),
+                                             "speed values")
 
-        if count == 0:
+        if (len(columns) == 0) or (columns['speed'].shape[0] == 0):
             raise RuntimeError("unable to find depth and sound speed indices!")
 
-        logger.debug("retrieved %d samples" % count)
-        self.ssp.cur.data_resize(count)
+        logger.debug("retrieved %d samples" % columns['speed'].shape[0])
+        self._store_columns(columns)
 
     def _aml_body(self):
         logger.debug('parsing AML body')
 
         self.ssp.cur.init_data(len(self.lines) - self.samples_offset)
 
-        count = 0
-        for line_idx, line in enumerate(self.lines[self.samples_offset:len(self.lines)]):
-
-            data = line.split(',')
-            # logger.debug(data)
-
-            # skip empty lines
-            if len(data) == 1:
-                continue
-
-            # pressure
-            try:
-                if self._aml.pressure in self.field_index:
-                    # logger.debug(self.field_index[self._aml.pressure])
-                    self.ssp.cur.data.pressure[count] = float(data[self.field_index[self._aml.pressure]])
-            except ValueError:
-                logger.warning("invalid conversion parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-            except IndexError:
-                logger.warning("invalid index parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-
-            # depth
-            try:
-                if self._aml.depth in self.field_index:
-                    # logger.debug(self.field_index[self._aml.depth])
-                    self.ssp.cur.data.depth[count] = float(data[self.field_index[self._aml.depth]])
-            except ValueError:
-                logger.warning("invalid conversion parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-            except IndexError:
-                logger.warning("invalid index parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-
-            # temperature
-            try:
-                if self._aml.temp in self.field_index:
-                    self.ssp.cur.data.temp[count] = float(data[self.field_index[self._aml.temp]])
-                elif self._aml.temp2 in self.field_index:
-                    self.ssp.cur.data.temp[count] = float(data[self.field_index[self._aml.temp2]])
-                elif self._aml.temp3 in self.field_index:
-                    self.ssp.cur.data.temp[count] = float(data[self.field_index[self._aml.temp3]])
-            except ValueError:
-                logger.warning("invalid conversion parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-            except IndexError:
-                logger.warning("invalid index parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-
-            # conductivity
-            try:
-                if self._aml.cond in self.field_index:
-                    self.ssp.cur.data.conductivity[count] = float(data[self.field_index[self._aml.cond]]) * \
-                                                            self._aml.cond_multi
-            except ValueError:
-                logger.warning("invalid conversion parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-            except IndexError:
-                logger.warning("invalid index parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-
-            # salinity
-            try:
-                if self._aml.sal in self.field_index:
-                    self.ssp.cur.data.sal[count] = float(data[self.field_index[self._aml.sal]])
-            except ValueError:
-                logger.warning("invalid conversion parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-            except IndexError:
-                logger.warning("invalid index parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-
-            # sound speed
-            try:
-                if self._aml.speed2 in self.field_index:
-                    self.ssp.cur.data.speed[count] = float(data[self.field_index[self._aml.speed2]])
-                elif self._aml.speed in self.field_index:
-                    self.ssp.cur.data.speed[count] = float(data[self.field_index[self._aml.speed]])
-            except ValueError:
-                logger.warning("invalid conversion parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-            except IndexError:
-                logger.warning("invalid index parsing of line #%s" % (self.samples_offset + line_idx))
-                continue
-
-            count += 1
-
-        self.ssp.cur.data_resize(count)
+        column_map = dict()
+        if self._aml.pressure in self.field_index:
+            column_map['pressure'] = self.field_index[self._aml.pressure]
+        if self._aml.depth in self.field_index:
+            column_map['depth'] = self.field_index[self._aml.depth]
+        for token in [self._aml.temp, self._aml.temp2, self._aml.temp3]:
+            if token in self.field_index:
+                column_map['temp'] = self.field_index[token]
+                break
+        if self._aml.cond in self.field_index:
+            column_map['conductivity'] = self.field_index[self._aml.cond]
+        if self._aml.sal in self.field_index:
+            column_map['sal'] = self.field_index[self._aml.sal]
+        for token in [self._aml.speed2, self._aml.speed]:
+            if token in self.field_index:
+                column_map['speed'] = self.field_index[token]
+                break
+
+        if ('pressure' not in column_map) and ('depth' not in column_map):
+            raise RuntimeError("missing both depth and pressure fields")
+
+        columns = self._parse_columns(self.lines[self.samples_offset:len(self.lines)], columns=column_map,
+                                      delimiter=',')
+        if 'conductivity' in columns:
+            columns['conductivity'] = columns['conductivity'] * self._aml.cond_multi
+        self._store_columns(columns)
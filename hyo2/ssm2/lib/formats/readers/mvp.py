@@ -276,18 +276,9 @@ class Mvp(AbstractTextReader):  # TODO: ATYPICAL READER!!!
         logger.info("samples offset: %s" % self.samples_offset)
 
     def _parse_asvp_body(self):
-        count = 0
-        for line in self.total_data[self.samples_offset:len(self.total_data)].splitlines():
-            try:
-                self.ssp.cur.data.depth[count], self.ssp.cur.data.speed[count] = line.split()
-            except ValueError:
-                if not line:
-                    logger.info("skipping empty line (count %s)" % count)
-                else:
-                    logger.error("skipping line: %s" % line)
-                continue
-            count += 1
-        self.ssp.cur.data_resize(count)
+        lines = self.total_data[self.samples_offset:len(self.total_data)].splitlines()
+        columns = self._parse_columns(lines, columns={'depth': 0, 'speed': 1}, nr_fields=2)
+        self._store_columns(columns)
 
     def _parse_calc_header(self):
         try:
@@ -347,24 +338,9 @@ class Mvp(AbstractTextReader):  # TODO: ATYPICAL READER!!!
         self.ssp.cur.init_data(len(self.total_data.splitlines()))
 
     def _parse_calc_body(self):
-
-        count = 0
-        for line in self.total_data.splitlines()[5:-9]:
-            fields = line.split()
-            if len(fields) != 3:
-                logger.info("skipping %s row" % count)
-                continue
-
-            try:
-                self.ssp.cur.data.depth[count] = float(fields[0])
-                self.ssp.cur.data.speed[count] = float(fields[1])
-                self.ssp.cur.data.temp[count] = float(fields[2])
-            except (ValueError, IndexError, TypeError) as e:
-                logger.error("skipping %s row: %s" % (count, e))
-                continue
-            count += 1
-
-        self.ssp.cur.data_resize(count)
+        lines = self.total_data.splitlines()[5:-9]
+        columns = self._parse_columns(lines, columns={'depth': 0, 'speed': 1, 'temp': 2}, nr_fields=3)
+        self._store_columns(columns)
 
     def _parse_m1_header(self):
 
@@ -497,47 +473,17 @@ class Mvp(AbstractTextReader):  # TODO: ATYPICAL READER!!!
         if not has_speed_idx:
             raise RuntimeError("Unable to locate speed field in %s [%d]" % (data_header, self.samples_header))
 
-        count = 0
-        for idx, line in enumerate(lines):
-
-            if idx < self.samples_offset:
-                continue
-
-            if idx == self.samples_offset:
-                logger.debug("first data row: %s" % line)
-
-            fields = line.split(",")
-            if len(fields) == 3:
+        if len(lines) > self.samples_offset:
+            logger.debug("first data row: %s" % lines[self.samples_offset])
 
-                try:
-                    self.ssp.cur.data.depth[count] = float(fields[depth_idx].strip())
-                    self.ssp.cur.data.speed[count] = float(fields[speed_idx].strip())
-
-                except (ValueError, IndexError, TypeError) as e:
-                    logger.error("skipping %s row: %s" % (idx, e))
-                    continue
-                count += 1
-
-            elif len(fields) >= 6:
-
-                try:
-                    self.ssp.cur.data.depth[count] = float(fields[depth_idx].strip())
-                    self.ssp.cur.data.speed[count] = float(fields[speed_idx].strip())
-                    if has_temp_idx:
-                        self.ssp.cur.data.temp[count] = float(fields[temp_idx].strip())
-                    if has_sal_idx:
-                        self.ssp.cur.data.sal[count] = float(fields[sal_idx].strip())
-
-                except (ValueError, IndexError, TypeError) as e:
-                    logger.error("skipping %s row: %s" % (idx, e))
-                    continue
-                count += 1
-
-            else:
-                logger.info("skipping %s row" % idx)
-                continue
-
-        self.ssp.cur.data_resize(count)
+        column_map = {'depth': depth_idx, 'speed': speed_idx}
+        if has_temp_idx:
+            column_map['temp'] = temp_idx
+        if has_sal_idx:
+            column_map['sal'] = sal_idx
+        columns = self._parse_columns(lines[self.samples_offset:], columns=column_map, delimiter=",",
+                                      min_fields=len(data_header.split(",")))
+        self._store_columns(columns)
 
     def _parse_s12_header(self):
         try:
@@ -611,30 +557,12 @@ class Mvp(AbstractTextReader):  # TODO: ATYPICAL READER!!!
         except (ValueError, IndexError, TypeError) as e:
             raise RuntimeError("unable to parse the number of samples: %s" % e)
 
-        count = 0
-        try:
-            self.ssp.cur.data.depth[count] = float(header_fields[-5])
-            self.ssp.cur.data.speed[count] = float(header_fields[-4])
-            self.ssp.cur.data.temp[count] = float(header_fields[-3])
-            self.ssp.cur.data.sal[count] = float(header_fields[-2])
-        except (ValueError, IndexError, TypeError) as e:
-            logger.error("skipping first line: %s" % e)
-
     def _parse_s12_body(self):
-        count = 1  # given the first data are on the header
-        for line in self.total_data.splitlines()[1:-1]:
-
-            try:
-                fields = line.split(",")
-                self.ssp.cur.data.depth[count] = float(fields[-5])
-                self.ssp.cur.data.speed[count] = float(fields[-4])
-                self.ssp.cur.data.temp[count] = float(fields[-3])
-                self.ssp.cur.data.sal[count] = float(fields[-2])
-            except (ValueError, IndexError, TypeError) as e:
-                logger.error("skipping line %s: %s" % (count, e))
-                continue
-            count += 1
-        self.ssp.cur.data_resize(count)
+        # the first data are on the header line (that ends with the same fields of the other lines)
+        lines = self.total_data.splitlines()[:-1]
+        columns = self._parse_columns(lines, columns={'depth': -5, 'speed': -4, 'temp': -3, 'sal': -2},
+                                      delimiter=",")
+        self._store_columns(columns)
 
     def _parse_s05_header(self):
         try:
@@ -708,28 +636,12 @@ class Mvp(AbstractTextReader):  # TODO: ATYPICAL READER!!!
         except (ValueError, IndexError, TypeError) as e:
             raise RuntimeError("unable to parse the number of samples: %s" % e)
 
-        count = 0
-        try:
-            self.ssp.cur.data.pressure[count] = float(header_fields[-5])
-            self.ssp.cur.data.temp[count] = float(header_fields[-3])
-            self.ssp.cur.data.conductivity[count] = float(header_fields[-2])
-        except (ValueError, IndexError, TypeError) as e:
-            logger.error("skipping first line: %s" % e)
-
     def _parse_s05_body(self):
-        count = 1  # given the first data are on the header
-        for line in self.total_data.splitlines()[1:-1]:
-
-            try:
-                fields = line.split(",")
-                self.ssp.cur.data.pressure[count] = float(fields[-5])
-                self.ssp.cur.data.temp[count] = float(fields[-3])
-                self.ssp.cur.data.conductivity[count] = float(fields[-2])
-            except (ValueError, IndexError, TypeError) as e:
-                logger.error("skipping line %s: %s" % (count, e))
-                continue
-            count += 1
-        self.ssp.cur.data_resize(count)
+        # the first data are on the header line (that ends with the same fields of the other lines)
+        lines = self.total_data.splitlines()[:-1]
+        columns = self._parse_columns(lines, columns={'pressure': -5, 'temp': -3, 'conductivity': -2},
+                                      delimiter=",")
+        self._store_columns(columns)
 
     def _parse_s10_header(self):
         try:
@@ -804,26 +716,11 @@ class Mvp(AbstractTextReader):  # TODO: ATYPICAL READER!!!
         # except (ValueError, IndexError, TypeError) as e:
         #     raise RuntimeError("unable to parse the number of samples: %s" % e)
 
-        count = 0
-        try:
-            self.ssp.cur.data.depth[count] = float(header_fields[-5])
-            self.ssp.cur.data.speed[count] = float(header_fields[-4])
-        except (ValueError, IndexError, TypeError) as e:
-            logger.error("skipping first line: %s" % e)
-
     def _parse_s10_body(self):
-        count = 1  # given the first data are on the header
-        for line in self.total_data.splitlines()[1:-1]:
-
-            try:
-                fields = line.split(",")
-                self.ssp.cur.data.depth[count] = float(fields[-5])
-                self.ssp.cur.data.speed[count] = float(fields[-4])
-            except (ValueError, IndexError, TypeError) as e:
-                logger.error("skipping line %s: %s" % (count, e))
-                continue
-            count += 1
-        self.ssp.cur.data_resize(count)
+        # the first data are on the header line (that ends with the same fields of the other lines)
+        lines = self.total_data.splitlines()[:-1]
+        columns = self._parse_columns(lines, columns={'depth': -5, 'speed': -4}, delimiter=",")
+        self._store_columns(columns)
 
 
 # # This is the documentation provided by Steve Smyth of Rolls Royce (ODIM Brooke Ocean)
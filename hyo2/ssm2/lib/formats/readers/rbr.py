@@ -3,12 +3,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from hyo2.ssm2.lib.formats.readers.abstract import AbstractTextReader
+from hyo2.ssm2.lib.formats.readers.abstract import AbstractTextStreamReader
 from hyo2.ssm2.lib.profile.dicts import Dicts
 from hyo2.ssm2.lib.base.callbacks.cli_callbacks import CliCallbacks
 
 
-class RBR(AbstractTextReader):
+class RBR(AbstractTextStreamReader):
     """RBR reader -> CTD style
 
     Info: https://rbr-global.com/products/standard-loggers/rbrmaestro
@@ -51,9 +51,12 @@ class RBR(AbstractTextReader):
         self.ssp.cur.meta.sensor_type = Dicts.sensor_types['CTD']
         self.ssp.cur.meta.probe_type = Dicts.probe_types['RBR']
 
-        self._read(data_path=data_path)
-        self._parse_header()
-        self._parse_body()
+        self._open(data_path=data_path, progress=progress)
+        try:
+            self._parse_header()
+            self._parse_body()
+        finally:
+            self._close()
 
         self.fix()
         self.finalize()
@@ -65,13 +68,14 @@ class RBR(AbstractTextReader):
         """Parsing header: field header, time, latitude, longitude"""
         logger.debug('parsing header')
 
-        if self.lines[0][:len(self.tk_cast_time)].lower() != self.tk_cast_time:
+        head_line = next(self.stream, '')
+        if head_line[:len(self.tk_cast_time)].lower() != self.tk_cast_time:
             raise RuntimeError('Unknown/unsupported RBR format starting with %s'
-                               % self.lines[0][:len(self.tk_cast_time)])
+                               % head_line[:len(self.tk_cast_time)])
 
-        fields = self.lines[0].split(",")
+        fields = head_line.split(",")
         if len(fields) < 3:
-            raise RuntimeError('Unknown/unsupported header in RBR format: %s' % self.lines[0])
+            raise RuntimeError('Unknown/unsupported header in RBR format: %s' % head_line)
 
         col = 0  # field column
         for field in fields:  # split fields by comma
@@ -99,29 +103,6 @@ class RBR(AbstractTextReader):
         self.samples_offset += 1
         logger.debug("samples offset: %s" % self.samples_offset)
 
-        # retrieve the first timestamp from the data
-        for idx, line in enumerate(self.lines[self.samples_offset:self.samples_offset+3]):
-
-            # skip empty lines
-            if len(line.split()) == 0:
-                continue
-
-            try:
-                field = line.split(",")[0]
-                if len(field) != 0:
-                    ymd = field.split()[0].strip()
-                    year = int(ymd.split("-")[0])
-                    month = int(ymd.split("-")[1])
-                    day = int(ymd.split("-")[2])
-                    time_string = field.split()[1].strip()
-                    hour = int(time_string.split(":")[0])
-                    minute = int(time_string.split(":")[1])
-                    second = int(float(time_string.split(":")[2]))
-                    self.ssp.cur.meta.utc_time = dt.datetime(year, month, day, hour, minute, second)
-                    logger.debug('cast timestamp: %s' % self.ssp.cur.meta.utc_time)
-            except ValueError:
-                logger.info("unable to parse date and time from line #%s" % (idx + self.samples_offset))
-
         # sample fields checks
         if not self.has_depth and not self.has_pressure:
             raise RuntimeError("Missing depth/pressure field: %s/%s" % (self.tk_depth, self.tk_pressure))
@@ -139,22 +120,46 @@ class RBR(AbstractTextReader):
         if not self.ssp.cur.meta.original_path:
             self.ssp.cur.meta.original_path = self.fid.path
 
-        # initialize data sample fields
-        self.ssp.cur.init_data(len(self.lines) - self.samples_offset)
+        # initialize data sample fields (with the number of lines estimated from the first chunk)
+        self.ssp.cur.init_data(self._estimate_nr_lines() - self.samples_offset)
         # initialize additional fields
         self.ssp.cur.init_more(self.more_fields)
 
+    def _parse_timestamp(self, line, idx):
+        """Retrieve the cast timestamp from a data line"""
+        try:
+            field = line.split(",")[0]
+            if len(field) != 0:
+                ymd = field.split()[0].strip()
+                year = int(ymd.split("-")[0])
+                month = int(ymd.split("-")[1])
+                day = int(ymd.split("-")[2])
+                time_string = field.split()[1].strip()
+                hour = int(time_string.split(":")[0])
+                minute = int(time_string.split(":")[1])
+                second = int(float(time_string.split(":")[2]))
+                self.ssp.cur.meta.utc_time = dt.datetime(year, month, day, hour, minute, second)
+                logger.debug('cast timestamp: %s' % self.ssp.cur.meta.utc_time)
+        except ValueError:
+            logger.info("unable to parse date and time from line #%s" % (idx + self.samples_offset))
+
     def _parse_body(self):
         """Parsing samples: depth, speed, temp, sal"""
         logger.debug('parsing body')
 
         count = 0
-        for line in self.lines[self.samples_offset:len(self.lines)]:
+        for idx, line in enumerate(self.stream):
 
             # skip empty lines
             if len(line.split()) == 0:
                 continue
 
+            # retrieve the timestamp from the first data lines
+            if idx < 3:
+                self._parse_timestamp(line, idx)
+
+            self._reserve_samples(count + 1)
+
             data = line.split(",")
             # first required data fields
             try:
@@ -8,12 +8,11 @@ import numpy
 
 logger = logging.getLogger(__name__)
 
-from hyo2.ssm2.lib.formats.readers.abstract import AbstractTextReader
+from hyo2.ssm2.lib.formats.readers.abstract import AbstractTextStreamReader
 from hyo2.ssm2.lib.profile.dicts import Dicts
 from hyo2.ssm2.lib.base.callbacks.cli_callbacks import CliCallbacks
 
-from hyo2.ssm2.lib.temp.regex_helpers import Profile, getMetaFromCoord, robust_re_number, \
-    parseNumbers
+from hyo2.ssm2.lib.temp.regex_helpers import Profile, getMetaFromCoord, robust_re_number
 from hyo2.ssm2.lib.temp import coordinates
 
 # Note that Hex header is copied into the CNV header verbatim so these can be used in either.
@@ -89,7 +88,7 @@ SeacatCNV_INTERVALRE = re.compile(SeacatCNV_INTERVAL, re.IGNORECASE)
 # scipy.fromregex(fname, SeacatCNV_DATA+r'\s*\n',  SeacatCNV_DATA_types)
 
 
-class Seabird(AbstractTextReader):
+class Seabird(AbstractTextStreamReader):
     """Seabird reader -> CTD style
 
     Info: http://www.seabird.com/
@@ -116,7 +115,7 @@ class Seabird(AbstractTextReader):
         self.cb = callbacks
 
         self.init_data()  # create a new empty profile list
-        self._read(data_path=data_path)
+        self._open(data_path=data_path, progress=progress)
 
         _, file_ext = os.path.splitext(data_path)
         file_ext = file_ext.lower()
@@ -128,10 +127,14 @@ class Seabird(AbstractTextReader):
             self.format = self.formats["NAUTILUS"]
 
         else:
+            self._close()
             raise RuntimeError("unknown format: %s" % self.format)
 
-        self._parse_header()
-        self._parse_body()
+        try:
+            self._parse_header()
+            self._parse_body()
+        finally:
+            self._close()
 
         self.fix()
         self.finalize()
@@ -154,8 +157,15 @@ class Seabird(AbstractTextReader):
             raise RuntimeError("unknown format: %s" % self.format)
 
     def _parse_cnv_header(self):
-        s = "\n".join(self.lines)
-        header, _data = s.split('*END*')
+        header_lines = list()
+        for line in self.stream:
+            if line.startswith('*END*'):
+                break
+            header_lines.append(line)
+        else:
+            raise RuntimeError("missing end of header (*END*)")
+        header = "\n".join(header_lines) + "\n"
+        self.samples_offset = len(header_lines) + 1
         meta = {}
 
         if SeacatHex_SBE19PLUS_TYPERE.search(header):
@@ -180,7 +190,7 @@ class Seabird(AbstractTextReader):
                     (?P<col>\w*)      #the column name (Pressure, Conductivity, Temperature, Salinity, Density, Sound Velocity (we only get Sound as we don't allow spaces currently)
                     (?P<units>.*)     #The rest of the data -- units are embedded here if we want them later
                     '''
-        matches = re.findall(expr, s, re.VERBOSE)
+        matches = re.findall(expr, header, re.VERBOSE)
         for i, col in enumerate(matches):
             if int(col[0]) != i:
                 raise Exception('Not all column names read correctly, can not parse file')
@@ -289,10 +299,11 @@ class Seabird(AbstractTextReader):
         self.ssp.append()  # append a new profile
 
         try:
-            head_line = self.lines[0]
+            head_line = next(self.stream)
             fields = head_line.split()
-        except (ValueError, IndexError):
+        except (ValueError, StopIteration):
             raise RuntimeError("unable to parse header")
+        self.samples_offset = 1
 
         if len(fields) != 4:
             raise RuntimeError("invalid number of tokens (%d != 4) in header: %s" % (len(fields), fields))
@@ -324,7 +335,7 @@ class Seabird(AbstractTextReader):
         if not self.ssp.cur.meta.original_path:
             self.ssp.cur.meta.original_path = self.fid.path
 
-        self.ssp.cur.init_data(len(self.lines) - 1)
+        self.ssp.cur.init_data(self._estimate_nr_lines() - self.samples_offset)
 
     def _parse_body(self):
         logger.info("reading > body")
@@ -368,8 +379,18 @@ class Seabird(AbstractTextReader):
                 col_name = col_name + "_"
             col_types.append((col_name, numpy.float32))
 
-        d = parseNumbers(self.lines, col_types,
-                         r"\s+", pre=r'^\s*', post=r'\s*$')
+        if len(col_types) == 0:
+            raise RuntimeError("unable to find the data columns")
+
+        columns = self._parse_columns(self.stream, columns={idx: idx for idx in range(len(col_types))},
+                                      nr_fields=len(col_types))
+        invalid = numpy.zeros(columns[0].shape[0], dtype=bool)
+        for values in columns.values():
+            invalid |= ~numpy.isfinite(values)
+        columns = self._drop_samples(columns, invalid, "non-finite values")
+        d = numpy.empty(columns[0].shape[0], dtype=col_types)
+        for i, col_type in enumerate(col_types):
+            d[col_type[0]] = columns[i]
         p = Profile(d, ymetric="depth", attribute="soundspeed", metadata=meta)
         self.ssp.append_profile(p.ConvertToSoundSpeedProfile())
 
@@ -381,7 +402,7 @@ class Seabird(AbstractTextReader):
 
         has_temp_and_sal = None
         count = 0
-        for line in self.lines[1:]:
+        for line in self.stream:
             fields = line.split()
             if len(fields) not in [2, 4]:
                 logger.info("skipping %s row" % count)
@@ -393,6 +414,7 @@ class Seabird(AbstractTextReader):
                 else:
                     has_temp_and_sal = False
 
+            self._reserve_samples(count + 1)
             try:
                 self.ssp.cur.data.depth[count] = float(fields[0])
                 self.ssp.cur.data.speed[count] = float(fields[1])
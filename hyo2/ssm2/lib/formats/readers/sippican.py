@@ -201,150 +201,67 @@ class Sippican(AbstractTextReader):
             if self.input_salinity is not None:
                 self.ssp.cur.data.sal[:] = self.input_salinity
 
-        count = 0
-        good_data = None
-        for line in self.lines[self.samples_offset:len(self.lines)]:
-
-            # skip empty lines
-            if len(line.split()) == 0:
-                continue
-
-            # first required data fields
-            try:
-                if self.is_var_alpha:
-                    good_data = self._body_alpha(line, count)
-                else:
-                    good_data = self._body_default(line, count)
-
-            except ValueError:
-                logger.warning("invalid conversion parsing of line #%s" % (self.samples_offset + count))
-                continue
-            except IndexError:
-                logger.warning("invalid index parsing of line #%s" % (self.samples_offset + count))
-                continue
+        lines = self.lines[self.samples_offset:len(self.lines)]
+        if self.is_var_alpha:
+            columns = self._body_alpha(lines)
+        else:
+            columns = self._body_default(lines)
 
-            if good_data:
-                count += 1
+        if columns is None:
+            columns = dict()
+        else:
+            # skip low-speed values
+            columns = self._drop_samples(columns, columns['speed'] < 1000.0, "low-speed rows")
 
-        self.ssp.cur.data_resize(count)
+        more_columns = dict()
+        for name in self.more_fields:
+            if name in columns:
+                more_columns[name] = columns.pop(name)
 
-    def _body_default(self, line, count):
+        self._store_columns(columns)
+        for name, values in more_columns.items():
+            self.ssp.cur.more.sa[name] = values
 
-        field_count = 0
-        fields = line.split()
+    def _body_default(self, lines):
 
         if self.ssp.cur.meta.sensor_type == Dicts.sensor_types["XBT"]:
-            if len(fields) < 3:
-                logger.warning("too few fields for line #%s" % (self.samples_offset + count))
-                return False
-
-            # skip 0-speed value
-            if float(fields[2]) < 1000.0:
-                logger.info("skipping low-speed row")
-                return False
-
-            for field in fields:
-                if field_count == 0:
-                    self.ssp.cur.data.depth[count] = field
-                elif field_count == 1:
-                    self.ssp.cur.data.temp[count] = field
-                elif field_count == 2:
-                    self.ssp.cur.data.speed[count] = field
-                field_count += 1
-
-            return True
+            return self._parse_columns(lines, columns={'depth': 0, 'temp': 1, 'speed': 2}, min_fields=3)
 
         elif self.ssp.cur.meta.sensor_type == Dicts.sensor_types["XSV"]:
-            if len(fields) < 2:
-                logger.warning("too few fields for line #%s" % (self.samples_offset + count))
-                return False
-
-            # skip 0-speed value
-            if float(fields[1]) < 1000.0:
-                logger.info("skipping low-speed row")
-                return False
-
-            for field in fields:
-                if field_count == 0:
-                    self.ssp.cur.data.depth[count] = field
-                elif field_count == 1:
-                    self.ssp.cur.data.speed[count] = field
-                field_count += 1
-
-            return True
+            return self._parse_columns(lines, columns={'depth': 0, 'speed': 1}, min_fields=2)
 
         elif self.ssp.cur.meta.sensor_type == Dicts.sensor_types["XCTD"]:
-            if len(fields) < 6:
-                logger.warning("too few fields for line #%s" % (self.samples_offset + count))
-                return False
-
-            # skip 0-speed value
-            if float(fields[4]) < 1000.0:
-                logger.info("skipping low-speed row")
-                return False
-
-            for field in fields:
-                if field_count == 0:
-                    self.ssp.cur.data.depth[count] = field
-                    self.ssp.cur.more.sa['Depth'][count] = field
-                elif field_count == 1:
-                    self.ssp.cur.data.temp[count] = field
-                elif field_count == 2:
-                    self.ssp.cur.more.sa['Conductivity'][count] = field
-                elif field_count == 3:
-                    self.ssp.cur.data.sal[count] = field
-                elif field_count == 4:
-                    self.ssp.cur.data.speed[count] = field
-                elif field_count == 5:
-                    self.ssp.cur.more.sa['Density'][count] = field
-                elif field_count == 6:
-                    self.ssp.cur.more.sa['Status'][count] = field
-                field_count += 1
-
-            return True
+            column_map = {'depth': 0, 'temp': 1, 'Conductivity': 2, 'sal': 3, 'speed': 4, 'Density': 5}
+            first_row = next((line for line in lines if len(line.split()) > 0), "")
+            if len(first_row.split()) > 6:
+                column_map['Status'] = 6
+            columns = self._parse_columns(lines, columns=column_map, min_fields=len(column_map))
+            columns['Depth'] = columns['depth']
+            return columns
 
         else:
             logger.warning("unknown/unsupported type: %s" % self.ssp.cur.meta.sensor_type)
-            return False
+            return None
 
-    def _body_alpha(self, line, count):
+    def _body_alpha(self, lines):
 
-        fields = line.split()
         # print(self.field_index)
 
         if self.ssp.cur.meta.sensor_type == Dicts.sensor_types["XBT"]:
-            # skip low-speed value
-            if float(fields[self.field_index["Sound"]]) < 1000.0:
-                logger.info("skipping low-speed #%d row: %f" % (count, float(fields[self.field_index["Sound"]])))
-                return False
-
-            self.ssp.cur.data.depth[count] = float(fields[self.field_index["Depth"]])
-            self.ssp.cur.data.speed[count] = float(fields[self.field_index["Sound"]])
-            self.ssp.cur.data.temp[count] = float(fields[self.field_index["Temperature"]])
-            return True
+            return self._parse_columns(lines, columns={'depth': self.field_index["Depth"],
+                                                       'speed': self.field_index["Sound"],
+                                                       'temp': self.field_index["Temperature"]})
 
         elif self.ssp.cur.meta.sensor_type == Dicts.sensor_types["XSV"]:
-            #  skip low-speed value
-            if float(fields[self.field_index["Sound"]]) < 1000.0:
-                logger.info("skipping low-speed #%d row: %f" % (count, float(fields[self.field_index["Sound"]])))
-                return False
-
-            self.ssp.cur.data.depth[count] = float(fields[self.field_index["Depth"]])
-            self.ssp.cur.data.speed[count] = float(fields[self.field_index["Sound"]])
-            return True
+            return self._parse_columns(lines, columns={'depth': self.field_index["Depth"],
+                                                       'speed': self.field_index["Sound"]})
 
         elif self.ssp.cur.meta.sensor_type == Dicts.sensor_types["XCTD"]:
-            # skip low-speed value
-            if float(fields[self.field_index["Sound"]]) < 1000.0:
-                logger.info("skipping low-speed #%d row: %f" % (count, float(fields[self.field_index["Sound"]])))
-                return False
-
-            self.ssp.cur.data.depth[count] = float(fields[self.field_index["Depth"]])
-            self.ssp.cur.data.speed[count] = float(fields[self.field_index["Sound"]])
-            self.ssp.cur.data.temp[count] = float(fields[self.field_index["Temperature"]])
-            self.ssp.cur.data.sal[count] = float(fields[self.field_index["Salinity"]])
-            return True
+            return self._parse_columns(lines, columns={'depth': self.field_index["Depth"],
+                                                       'speed': self.field_index["Sound"],
+                                                       'temp': self.field_index["Temperature"],
+                                                       'sal': self.field_index["Salinity"]})
 
         else:
             logger.warning("unknown/unsupported type: %s" % self.ssp.cur.meta.sensor_type)
-            return False
+            return None
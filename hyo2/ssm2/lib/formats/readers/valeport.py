@@ -2,6 +2,8 @@ import datetime as dt
 import logging
 import os
 
+import numpy as np
+
 from hyo2.ssm2.lib.formats.readers.abstract import AbstractTextReader
 from hyo2.ssm2.lib.profile.dicts import Dicts
 from hyo2.ssm2.lib.base.callbacks.cli_callbacks import CliCallbacks
@@ -374,162 +376,78 @@ class Valeport(AbstractTextReader):
         temp_idx = None
         sal_idx = None
 
-        count = 0
-        for idx, line in enumerate(self.lines[self.samples_offset:]):
-
-            if idx == 0:
-                continue
-
-            if idx == 1:
-                line = line.strip().upper()
-                tokens = line.split('\t')
-                # logger.debug("data header: %s" % line)
-                if len(tokens) < 4:
-                    raise RuntimeError("Invalid number of data columns: %s" % line)
-
-                for idx_token, token in enumerate(tokens):
-                    if token == "DEPTH":
-                        depth_idx = idx_token
-                    if token == "PRESSURE":
-                        pressure_idx = idx_token
-                    elif token == "SOUND VELOCITY":
-                        speed_idx = idx_token
-                    elif token == "TEMPERATURE":
-                        temp_idx = idx_token
-                    elif token == "SALINITY":
-                        sal_idx = idx_token
-
-                continue
-
-            if idx == 2:
-                continue
-
-            if depth_idx is None:
-                raise RuntimeError("Unable to identify depth column")
-
-            data_tokens = line.split('\t')
-            if len(data_tokens) < 4:
-                continue
-
-            try:
-                depth = float(data_tokens[depth_idx])
-                pressure = float(data_tokens[pressure_idx])
-                speed = float(data_tokens[speed_idx])
-                temp = float(data_tokens[temp_idx])
-                sal = float(data_tokens[sal_idx])
-
-                if pressure < 0.0:  # pressure
-                    logger.info("skipping for invalid pressure: %s" % line)
-                    continue
-                if speed < 0.0:  # sound speed
-                    logger.info("skipping for invalid sound speed: %s" % line)
-                    continue
-                if (temp < -10.0) or (temp > 100):  # temp
-                    logger.info("skipping for invalid temp: %s" % line)
-                    continue
-                if sal < 0.0:  # salinity
-                    logger.info("skipping for invalid salinity: %s" % line)
-                    continue
-
-            except ValueError:
-                logger.error("unable to parse line: %s" % line)
-                continue
-
-            self.ssp.cur.data.depth[count] = depth
-            self.ssp.cur.data.pressure[count] = pressure
-            self.ssp.cur.data.speed[count] = speed
-            self.ssp.cur.data.temp[count] = temp
-            self.ssp.cur.data.sal[count] = sal
-
-            count += 1
-
-        self.ssp.cur.data_resize(count)
+        # the data header follows the [DATA] row, then a row is skipped before the samples
+        line = self.lines[self.samples_offset + 1].strip().upper()
+        tokens = line.split('\t')
+        # logger.debug("data header: %s" % line)
+        if len(tokens) < 4:
+            raise RuntimeError("Invalid number of data columns: %s" % line)
+
+        for idx_token, token in enumerate(tokens):
+            if token == "DEPTH":
+                depth_idx = idx_token
+            if token == "PRESSURE":
+                pressure_idx = idx_token
+            elif token == "SOUND VELOCITY":
+                speed_idx = idx_token
+            elif token == "TEMPERATURE":
+                temp_idx = idx_token
+            elif token == "SALINITY":
+                sal_idx = idx_token
+
+        if depth_idx is None:
+            raise RuntimeError("Unable to identify depth column")
+        if (pressure_idx is None) or (speed_idx is None) or (temp_idx is None) or (sal_idx is None):
+            raise RuntimeError('Unable to identify required datafield (PRESSURE/ SOUNDSPEED/ TEMPERATURE/ SALINITY)'
+                               ' in line: %s' % line)
+
+        columns = self._parse_columns(self.lines[self.samples_offset + 3:],
+                                      columns={'depth': depth_idx, 'pressure': pressure_idx, 'speed': speed_idx,
+                                               'temp': temp_idx, 'sal': sal_idx},
+                                      delimiter='\t', min_fields=4)
+        columns = self._drop_samples(columns, columns['pressure'] < 0.0, "invalid pressure")
+        columns = self._drop_samples(columns, columns['speed'] < 0.0, "invalid sound speed")
+        columns = self._drop_samples(columns, (columns['temp'] < -10.0) | (columns['temp'] > 100), "invalid temp")
+        columns = self._drop_samples(columns, columns['sal'] < 0.0, "invalid salinity")
+        self._store_columns(columns)
 
     def _mini_body(self):
-        count = 0
-        for line in self.lines[self.samples_offset:len(self.lines)]:
+        if self.minisvp_has_depth:
+            z = 'depth'
+        else:
+            z = 'pressure'
 
-            data = line.split()
+        if self.ssp.cur.meta.probe_type == Dicts.probe_types['RapidSV']:  # 2-column data
+            columns = self._parse_columns(self.lines[self.samples_offset:], columns={z: 0, 'speed': 1}, nr_fields=2)
 
-            if self.ssp.cur.meta.probe_type == Dicts.probe_types['RapidSV']:  # 2-column data
-                if len(data) != 2:
-                    logger.warning("unexpected number of fields: %d" % len(data))
-                    continue
+            # Skipping invalid data (above water, negative temperature or crazy sound speed)
+            invalid = (columns[z] < 0.0) | (columns['speed'] < 1400.0) | (columns['speed'] > 1650.0)
 
-                try:
-                    z = float(data[0])
-                    speed = float(data[1])
-                except ValueError:
-                    logger.error("unable to parse line: %s" % line)
-                    continue
+        elif self.ssp.cur.meta.probe_type == Dicts.probe_types['MiniCTD']:
+            columns = self._parse_columns(self.lines[self.samples_offset:], columns={z: 0, 'temp': 1, 'sal': 2},
+                                          nr_fields=3)
 
-                # Skipping invalid data (above water, negative temperature or crazy sound speed)
-                if (z < 0.0) or (speed < 1400.0) or (speed > 1650.0):
-                    logger.warning("skipping invalid values: %.1f %.1f" % (z, speed))
-                    continue
+            # Skipping invalid data (above water, negative temperature or negative salinity)
+            invalid = (columns[z] < 0.0) | (columns['temp'] < -2.0) | (columns['temp'] > 100.0) | \
+                      (columns['sal'] < 0.0) | (columns['sal'] > 50.0)
 
-                if self.minisvp_has_depth:
-                    self.ssp.cur.data.depth[count] = z
-                else:
-                    self.ssp.cur.data.pressure[count] = z
-                self.ssp.cur.data.speed[count] = speed
+        elif ((self.ssp.cur.meta.probe_type == Dicts.probe_types['MiniSVP']) or
+              (self.ssp.cur.meta.probe_type == Dicts.probe_types['RapidSVT'])):
+            columns = self._parse_columns(self.lines[self.samples_offset:], columns={z: 0, 'temp': 1, 'speed': 2},
+                                          nr_fields=3)
 
-            elif self.ssp.cur.meta.probe_type == Dicts.probe_types['MiniCTD']:
-                if len(data) != 3:
-                    logger.warning("unexpected number of fields: %d" % len(data))
-                    continue
+            # Skipping invalid data (above water, negative temperature or crazy sound speed)
+            invalid = (columns[z] < 0.0) | (columns['temp'] < -2.0) | (columns['temp'] > 100.0) | \
+                      (columns['speed'] < 1400.0) | (columns['speed'] > 1650.0)
 
-                try:
-                    z = float(data[0])
-                    temp = float(data[1])
-                    sal = float(data[2])
-                except ValueError:
-                    logger.error("unable to parse line: %s" % line)
-                    continue
-
-                # Skipping invalid data (above water, negative temperature or negative salinity)
-                if (z < 0.0) or (temp < -2.0) or (temp > 100.0) or (sal < 0.0) \
-                        or (sal > 50.0):
-                    logger.warning("skipping invalid values: %.1f %.1f %.1f" % (z, temp, sal))
-                    continue
-
-                if self.minisvp_has_depth:
-                    self.ssp.cur.data.depth[count] = z
-                else:
-                    self.ssp.cur.data.pressure[count] = z
-                self.ssp.cur.data.temp[count] = temp
-                self.ssp.cur.data.sal[count] = sal
-
-            elif ((self.ssp.cur.meta.probe_type == Dicts.probe_types['MiniSVP']) or
-                  (self.ssp.cur.meta.probe_type == Dicts.probe_types['RapidSVT'])):
-                if len(data) != 3:
-                    logger.warning("unexpected number of fields: %d" % len(data))
-                    continue
-
-                try:
-                    z = float(data[0])
-                    temp = float(data[1])
-                    speed = float(data[2])
-                except ValueError:
-                    logger.error("unable to parse line: %s" % line)
-                    continue
-
-                # Skipping invalid data (above water, negative temperature or crazy sound speed)
-                if (z < 0.0) or (temp < -2.0) or (temp > 100.0) or (speed < 1400.0) \
-                        or (speed > 1650.0):
-                    logger.warning("skipping invalid values: %.1f %.1f %.1f" % (z, temp, speed))
-                    continue
+        else:
+            logger.warning("unknown/unsupported probe type: %s" % self.ssp.cur.meta.probe_type)
+            columns = dict()
+            invalid = None
 
-                if self.minisvp_has_depth:
-                    self.ssp.cur.data.depth[count] = z
-                else:
-                    self.ssp.cur.data.pressure[count] = z
-                self.ssp.cur.data.temp[count] = temp
-                self.ssp.cur.data.speed[count] = speed
-
-            count += 1
-
-        self.ssp.cur.data_resize(count)
+        if invalid is not None:
+            columns = self._drop_samples(columns, invalid, "invalid values")
+        self._store_columns(columns)
 
     def _midas_body(self):
         # check valid format
@@ -546,77 +464,44 @@ class Valeport(AbstractTextReader):
         sal_idx = None
         cond_idx = None
 
-        count = 0
-        for idx, line in enumerate(self.lines[self.samples_offset:]):
-
-            if idx == 0:
-                line = line.strip().upper()
-                tokens = line.split('\t')
-                if len(tokens) < 2:
-                    raise RuntimeError('Invalid number of data columns: %s' % line)
-
-                for idx_token, token in enumerate(tokens):
-                    token = token.split(';')
-                    if token[0] == "PRESSURE":
-                        pressure_idx = idx_token
-                    elif token[0] == "SOUND VELOCITY":
-                        speed_idx = idx_token
-                    elif token[0] == "TEMPERATURE":
-                        temp_idx = idx_token
-                    elif token[0] == "CALC. SALINITY":
-                        sal_idx = idx_token
-                    elif token[0] == "CONDUCTIVITY":
-                        cond_idx = idx_token
-
-                if (pressure_idx is None) or (temp_idx is None) or (speed_idx is None):
-                    raise RuntimeError('Unable to identify required datafield (PRESSURE/ SOUNDSPEED/ TEMPERATURE)'
-                                       ' in line: %s' % line)
-
-                continue
-
-            data_tokens = line.split('\t')
-
-            try:
-                # Required tokens
-                pressure = float(data_tokens[pressure_idx])
-                if pressure < 0.0:
-                    logger.info("skipping for invalid pressure (%s): %s" % (pressure, line))
-                    continue
-                speed = float(data_tokens[speed_idx])
-                if speed < 0.0:
-                    logger.info("skipping for invalid sound speed (%s): %s" % (speed, line))
-                    continue
-                temp = float(data_tokens[temp_idx])
-                if (temp < -10.0) or (temp > 100):
-                    logger.info("skipping for invalid temp (%s): %s" % (temp, line))
-                    continue
-
-                # Optional tokens
-                sal = None
-                if sal_idx is not None:
-                    sal = float(data_tokens[sal_idx])
-                    if sal < 0.0:  # salinity
-                        logger.info("skipping for invalid salinity (%s): %s" % (sal, line))
-                        continue
-                cond = None
-                if cond_idx is not None:
-                    cond = float(data_tokens[cond_idx])
-                    if cond < 0.0:
-                        logger.info("skipping for invalid conductivity (%s): %s" % (cond, line))
-
-                # Storing the retrieved valid values
-                self.ssp.cur.data.pressure[count] = pressure
-                self.ssp.cur.data.speed[count] = speed
-                self.ssp.cur.data.temp[count] = temp
-                if sal_idx is not None:
-                    self.ssp.cur.data.sal[count] = sal
-                if cond_idx is not None:
-                    self.ssp.cur.data.conductivity[count] = cond
-
-            except ValueError:
-                logger.error('Unable to parse line: %s' % line)
-                continue
-
-            count += 1
-
-        self.ssp.cur.data_resize(count)
+        line = self.lines[self.samples_offset].strip().upper()
+        tokens = line.split('\t')
+        if len(tokens) < 2:
+            raise RuntimeError('Invalid number of data columns: %s' % line)
+
+        for idx_token, token in enumerate(tokens):
+            token = token.split(';')
+            if token[0] == "PRESSURE":
+                pressure_idx = idx_token
+            elif token[0] == "SOUND VELOCITY":
+                speed_idx = idx_token
+            elif token[0] == "TEMPERATURE":
+                temp_idx = idx_token
+            elif token[0] == "CALC. SALINITY":
+                sal_idx = idx_token
+            elif token[0] == "CONDUCTIVITY":
+                cond_idx = idx_token
+
+        if (pressure_idx is None) or (temp_idx is None) or (speed_idx is None):
+            raise RuntimeError('Unable to identify required datafield (PRESSURE/ SOUNDSPEED/ TEMPERATURE)'
+                               ' in line: %s' % line)
+
+        # Required tokens
+        column_map = {'pressure': pressure_idx, 'speed': speed_idx, 'temp': temp_idx}
+        # Optional tokens
+        if sal_idx is not None:
+            column_map['sal'] = sal_idx
+        if cond_idx is not None:
+            column_map['conductivity'] = cond_idx
+
+        columns = self._parse_columns(self.lines[self.samples_offset + 1:], columns=column_map, delimiter='\t')
+        columns = self._drop_samples(columns, columns['pressure'] < 0.0, "invalid pressure")
+        columns = self._drop_samples(columns, columns['speed'] < 0.0, "invalid sound speed")
+        columns = self._drop_samples(columns, (columns['temp'] < -10.0) | (columns['temp'] > 100), "invalid temp")
+        if sal_idx is not None:
+            columns = self._drop_samples(columns, columns['sal'] < 0.0, "invalid salinity")
+        if cond_idx is not None:
+            nr_invalid = np.count_nonzero(columns['conductivity'] < 0.0)
+            if nr_invalid > 0:
+                logger.info("%d samples with invalid conductivity" % nr_invalid)
+        self._store_columns(columns)
@@ -0,0 +1,68 @@
+import importlib
+import logging
+import threading
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from hyo2.ssm2.lib.formats.abstract import AbstractFormat
+
+logger = logging.getLogger(__name__)
+
+
+class FormatEntry:
+    """Metadata of a reader/writer, with the format module imported on first use"""
+
+    def __init__(self, module: str, class_name: str, name: str, ext: set, desc: str) -> None:
+        self.module = module
+        self.class_name = class_name
+        self.name = name
+        self.ext = ext
+        self.desc = desc
+
+        self._instance = None  # type: Optional[AbstractFormat]
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return "<%s:%s.%s:%s>" % (self.name, self.module, self.class_name, ",".join(sorted(self.ext)))
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._instance is not None
+
+    @property
+    def instance(self) -> 'AbstractFormat':
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    mod = importlib.import_module(self.module, package=__package__)
+                    self._instance = getattr(mod, self.class_name)()
+                    logger.debug("loaded format: %s" % self._instance)
+        return self._instance
+
+
+class FormatRegistry(Sequence):
+    """List-like collection of readers/writers that only instantiates the ones in use"""
+
+    def __init__(self, entries: list) -> None:
+        self.entries = entries
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [entry.instance for entry in self.entries[idx]]
+        return self.entries[idx].instance
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def names(self) -> list:
+        return [entry.name for entry in self.entries]
+
+    @property
+    def exts(self) -> list:
+        return [entry.ext for entry in self.entries]
+
+    @property
+    def descs(self) -> list:
+        return [entry.desc for entry in self.entries]
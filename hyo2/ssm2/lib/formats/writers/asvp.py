@@ -3,6 +3,8 @@ import logging
 import math
 import operator
 import os
+import threading
+from collections import OrderedDict
 
 import numpy as np
 
@@ -18,6 +20,11 @@ class Asvp(AbstractTextWriter):
     """Kongsberg asvp writer"""
 
     abs_freqs = [12, 32, 40, 50, 60, 70, 80, 90, 95, 100, 110, 120, 130, 140, 200, 250, 300, 350, 400]
+    abs_ph = 8.1
+    # absorption tables of the most recently exported profiles, keyed on their samples
+    abs_cache_size = 8
+    _abs_tables = OrderedDict()
+    _abs_lock = threading.Lock()
 
     def __init__(self):
         super(Asvp, self).__init__()
@@ -101,45 +108,58 @@ class Asvp(AbstractTextWriter):
         # logger.debug('generating body for %d kHz' % freq)
 
         ti = self.ssp.cur.sis_thinned
+        depth = self.ssp.cur.sis.depth[ti]
+        temp = self.ssp.cur.sis.temp[ti]
+        sal = self.ssp.cur.sis.sal[ti]
 
-        top_mean = 0
-        bottom_mean = 0
+        valid = sal > 0
+        if not np.all(valid):
+            logger.info("skipping invalid salinity values")
 
-        body = str()
-        sample_sz = int(np.sum(ti))
-        has_skipped_salinity = False
-        for i in range(sample_sz):
-
-            if self.ssp.cur.sis.sal[ti][i] <= 0:
-                if not has_skipped_salinity:
-                    logger.info("skipping invalid salinity values")
-                    has_skipped_salinity = True
-                continue
-
-            abs_value = Oc.attenuation(f=freq, t=self.ssp.cur.sis.temp[ti][i], d=self.ssp.cur.sis.depth[ti][i],
-                                       s=self.ssp.cur.sis.sal[ti][i], ph=8.1)
-
-            if i == 0:  # first
-                delta = (self.ssp.cur.sis.depth[ti][0] + self.ssp.cur.sis.depth[ti][1]) / 2.0
-
-            elif i == sample_sz - 1:  # last
-                delta = (self.ssp.cur.sis.depth[ti][sample_sz - 1] -
-                         (self.ssp.cur.sis.depth[ti][sample_sz - 1] + self.ssp.cur.sis.depth[ti][sample_sz - 2]) / 2.0)
+        abs_values = self.absorption_table(depth=depth[valid], temp=temp[valid], sal=sal[valid])
+        abs_values = abs_values[self.abs_freqs.index(freq)]
 
-            else:
-                delta = ((self.ssp.cur.sis.depth[ti][i + 1] + self.ssp.cur.sis.depth[ti][i]) / 2.0 -
-                         (self.ssp.cur.sis.depth[ti][i] + self.ssp.cur.sis.depth[ti][i - 1]) / 2.0)
-
-            top_mean += abs_value * delta
-            bottom_mean += delta
+        # layer thickness: from the mid-points with the previous and the next sample
+        if depth.size < 2:  # a single layer down to the sample depth (or an empty body)
+            delta = depth.copy()
+        else:
+            mid_depth = (depth[1:] + depth[:-1]) / 2.0
+            delta = np.empty_like(depth)
+            delta[0] = mid_depth[0]
+            delta[1:-1] = mid_depth[1:] - mid_depth[:-1]
+            delta[-1] = depth[-1] - mid_depth[-1]
+        delta = delta[valid]
 
-            mean_abs = top_mean / bottom_mean
+        mean_abs = np.cumsum(abs_values * delta) / np.cumsum(delta)
 
-            body += "%.3f %.3f %.3f %s\n" \
-                    % (self.ssp.cur.sis.depth[ti][i], abs_value, mean_abs, "999.000")
+        body = "".join(["%.3f %.3f %.3f %s\n" % (depth_value, abs_value, mean_value, "999.000")
+                        for depth_value, abs_value, mean_value in zip(depth[valid], abs_values, mean_abs)])
 
         self.fod.io.write(body)
 
+    @classmethod
+    def absorption_table(cls, depth: np.ndarray, temp: np.ndarray, sal: np.ndarray) -> np.ndarray:
+        """Absorption (dB/km) for all the abs_freqs (rows) at the passed samples (columns)
+
+        The tables are cached on the passed samples, so the calls for each frequency of the same profile
+        (and the re-export of a profile) evaluate the Francois-Garrison model only once.
+        """
+        key = (depth.tobytes(), temp.tobytes(), sal.tobytes())
+        with cls._abs_lock:
+            table = cls._abs_tables.get(key)
+            if table is not None:
+                cls._abs_tables.move_to_end(key)
+                return table
+
+        freqs = np.array(cls.abs_freqs, dtype=np.float64)[:, np.newaxis]
+        table = Oc.attenuation(f=freqs, t=temp, s=sal, d=depth, ph=cls.abs_ph)
+
+        with cls._abs_lock:
+            cls._abs_tables[key] = table
+            while len(cls._abs_tables) > cls.abs_cache_size:
+                cls._abs_tables.popitem(last=False)
+        return table
+
     def convert(self, ssp, fmt):
         """Convert a profile in a given Kongsberg format"""
         self.ssp = ssp
@@ -43,11 +43,11 @@ class Elac(AbstractTextWriter):
     def _write_body(self):
         # logger.debug('generating body')
         vi = self.ssp.cur.proc_valid
+        depth = self.ssp.cur.proc.depth[vi]
+        speed = self.ssp.cur.proc.speed[vi]
+        temp = self.ssp.cur.proc.temp[vi]
+        sal = self.ssp.cur.proc.sal[vi]
+        cond = Oc.s2c(s=sal, p=Oc.d2p(d=depth, lat=self.ssp.cur.meta.latitude), t=temp)
         for idx in range(np.sum(vi)):
             self.fod.io.write("%8.2f%10.2f%10.2f%10.2f%10.2f\n"
-                              % (self.ssp.cur.proc.depth[vi][idx], self.ssp.cur.proc.speed[vi][idx],
-                                 self.ssp.cur.proc.temp[vi][idx], self.ssp.cur.proc.sal[vi][idx],
-                                 Oc.s2c(s=self.ssp.cur.proc.sal[vi][idx],
-                                        p=Oc.d2p(d=self.ssp.cur.proc.depth[vi][idx],
-                                                 lat=self.ssp.cur.meta.latitude),
-                                        t=self.ssp.cur.proc.temp[vi][idx])))
+                              % (depth[idx], speed[idx], temp[idx], sal[idx], cond[idx]))
@@ -1,4 +1,5 @@
 import logging
+import queue
 import time
 import socket
 import struct
@@ -9,12 +10,17 @@ logger = logging.getLogger(__name__)
 
 
 class AbstractListener(Thread):
-    """Common abstract listener"""
+    """Common abstract listener
+
+    The datagrams are received on this thread and parsed on a separate one, through a bounded queue, so that a slow
+    parse does not leave the socket unattended. When the queue is full, the new datagram is dropped, unless it is a
+    priority one: in such a case, the oldest queued datagram is dropped to make room for it.
+    """
 
     def __init__(self, port: int = 4001, ip: str = "0.0.0.0", timeout: int = 1,
                  datagrams: Optional[list] = None,
                  target: Optional[object] = None, name: Optional[str] = "Abstract",
-                 debug: bool = False) -> None:
+                 debug: bool = False, rcvbuf_size: int = 2 ** 22, queue_size: int = 1024) -> None:
         Thread.__init__(self, target=target, name=name)
         self.name = self.__class__.__name__
         self.desc = "Abstract listener"  # a human-readable description
@@ -32,11 +38,26 @@ class AbstractListener(Thread):
         self.data = None  # type: Optional[bytes]
         self.sender = None
 
+        self.rcvbuf_size = rcvbuf_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.parser = None  # type: Optional[Thread]
+        self.received_count = 0
+        self.dropped_count = 0
+        self.parsed_count = 0
+        self.last_latency = 0.0  # seconds between the reception and the parsing of a datagram
+        self.max_latency = 0.0
+
+        # events set by the listener on relevant updates (e.g., a new position), for the waiting consumers
+        self.subscribers = list()  # type: list[Event]
+
     def init_sockets(self) -> bool:
         self.sock_in = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         # commented to avoid to silently binding to a busy port
         # self.sock_in.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.sock_in.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2 ** 16)
+        try:
+            self.sock_in.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf_size)
+        except OSError as e:
+            logger.warning("unable to set the socket receive buffer to %d: %s" % (self.rcvbuf_size, e))
 
         if self.timeout > 0:
             self.sock_in.settimeout(self.timeout)
@@ -76,6 +97,9 @@ class AbstractListener(Thread):
         if not self.init_sockets():
             return
 
+        self.parser = Thread(target=self.parse_queued, name="%s parser" % self.name, daemon=True)
+        self.parser.start()
+
         count = 0
         while True:
             if self.shutdown.is_set():
@@ -87,7 +111,7 @@ class AbstractListener(Thread):
             count += 1
 
             try:
-                self.data, self.sender = self.sock_in.recvfrom(2 ** 16)
+                data, sender = self.sock_in.recvfrom(2 ** 16)
 
             except socket.timeout:
                 if self.debug:
@@ -95,20 +119,83 @@ class AbstractListener(Thread):
                 time.sleep(0.1)
                 continue
 
-            self.parse()
+            self.received_count += 1
+            self.enqueue(data, sender)
 
+        self.parser.join(self.timeout + 1)
+        self.parser = None
         self.data = None
         self.sender = None
         self.sock_in.close()
         # logger.debug("%s end" % self.name)
 
+    def enqueue(self, data: bytes, sender: tuple) -> None:
+        item = (data, sender, time.monotonic())
+        try:
+            self.queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+
+        # the queue is full: one datagram is dropped (the oldest queued one, to make room for a priority datagram)
+        self.dropped_count += 1
+        if self.debug:
+            logger.debug("queue full: dropped datagram (total: %d)" % self.dropped_count)
+        if not self.is_priority(data):
+            return
+
+        try:
+            self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            pass
+
+    def is_priority(self, data: bytes) -> bool:
+        """Datagrams that are worth to be parsed even when the queue is full"""
+        return False
+
+    def parse_queued(self) -> None:
+        while not self.shutdown.is_set():
+            try:
+                self.data, self.sender, received_time = self.queue.get(timeout=self.timeout if self.timeout > 0 else 1)
+            except queue.Empty:
+                continue
+
+            self.last_latency = time.monotonic() - received_time
+            if self.last_latency > self.max_latency:
+                self.max_latency = self.last_latency
+
+            try:
+                self.parse()
+            except Exception as e:
+                logger.warning("%s: unable to parse datagram: %s" % (self.desc, e))
+            self.parsed_count += 1
+
     def parse(self) -> None:
         raise Exception("Unimplemented function")
 
+    def subscribe(self, event: Event) -> None:
+        if event not in self.subscribers:
+            self.subscribers.append(event)
+
+    def unsubscribe(self, event: Event) -> None:
+        if event in self.subscribers:
+            self.subscribers.remove(event)
+
+    def notify(self) -> None:
+        for event in list(self.subscribers):
+            event.set()
+
     def __repr__(self) -> str:
         msg = "<%s>\n" % self.__class__.__name__
         msg += "  <desc: %s>\n" % self.desc
         msg += "  <ip: %s>\n" % self.ip
         msg += "  <port: %s>\n" % self.port
         msg += "  <multicast: %s>\n" % self.is_multicast
+        msg += "  <received: %d, dropped: %d, parsed: %d>\n" \
+               % (self.received_count, self.dropped_count, self.parsed_count)
+        msg += "  <latency: %.3f s (max: %.3f s)>\n" % (self.last_latency, self.max_latency)
         return msg
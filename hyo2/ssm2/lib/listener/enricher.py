@@ -0,0 +1,74 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from hyo2.ssm2.lib.profile.profilelist import ProfileList
+    from hyo2.ssm2.lib.soundspeed import SoundSpeedLibrary
+
+logger = logging.getLogger(__name__)
+
+
+class Enricher:
+    """Pool of worker threads that enrich the casts received by the listeners
+
+    The atlas queries (that may need to reach an OPeNDAP server) and the default metadata are applied here, so
+    that the listener threads are never blocked. Once a cast is enriched, it is passed to the 'publish' callback.
+    The atlas instances are not thread-safe, thus the queries of the workers are serialized.
+    """
+
+    def __init__(self, prj: 'SoundSpeedLibrary', max_workers: int = 1) -> None:
+        self.prj = prj
+        self.max_workers = max_workers
+
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+        self._lock = threading.Lock()
+        self._atlases_lock = threading.Lock()
+
+    def submit(self, ssp: 'ProfileList', publish: Optional[Callable[['ProfileList'], None]] = None) -> Future:
+        """Enqueue a completed cast for the enrichment"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Enricher")
+            return self._executor.submit(self._run, ssp, publish)
+
+    def _run(self, ssp: 'ProfileList', publish: Optional[Callable[['ProfileList'], None]]) -> 'ProfileList':
+        try:
+            self.enrich(ssp)
+        except Exception as e:
+            logger.warning("unable to enrich the cast: %s" % e)
+
+        if publish is not None:
+            publish(ssp)
+        return ssp
+
+    def enrich(self, ssp: 'ProfileList') -> None:
+        """Add the atlases data and the default metadata to the passed profiles"""
+        with self._atlases_lock:
+            self.prj.query_atlases(ssp=ssp)
+
+        if not self.prj.setup.auto_apply_default_metadata:
+            return
+
+        for pr in ssp.l:
+            if (len(pr.meta.institution) == 0) and (len(self.prj.setup.default_institution) != 0):
+                pr.meta.institution = self.prj.setup.default_institution
+            if (len(pr.meta.survey) == 0) and (len(self.prj.setup.default_survey) != 0):
+                pr.meta.survey = self.prj.setup.default_survey
+            if (len(pr.meta.vessel) == 0) and (len(self.prj.setup.default_vessel) != 0):
+                pr.meta.vessel = self.prj.setup.default_vessel
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop the workers (a later submission restarts them)"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __repr__(self) -> str:
+        msg = "<Enricher>\n"
+        msg += "  <max workers: %d>\n" % self.max_workers
+        msg += "  <running: %s>\n" % (self._executor is not None)
+        return msg
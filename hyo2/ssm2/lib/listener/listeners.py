@@ -6,6 +6,7 @@ from hyo2.ssm2.lib.listener.sis.sis import Sis
 from hyo2.ssm2.lib.listener.sippican.sippican import Sippican
 from hyo2.ssm2.lib.listener.nmea.nmea import Nmea
 from hyo2.ssm2.lib.listener.mvp.mvp import Mvp
+from hyo2.ssm2.lib.listener.enricher import Enricher
 if TYPE_CHECKING:
     from hyo2.ssm2.lib.soundspeed import SoundSpeedLibrary
 
@@ -20,6 +21,9 @@ class Listeners:
         # data folder
         self.prj = prj
 
+        # the received casts are enriched (e.g., with atlases data) outside the listener threads
+        self.enricher = Enricher(prj=prj)
+
         # available listeners
         self.sis = Sis(port=self.prj.setup.sis_listen_port,
                        timeout=self.prj.setup.sis_listen_timeout,
@@ -27,7 +31,7 @@ class Listeners:
         self.sippican = Sippican(port=self.prj.setup.sippican_listen_port, prj=prj)
         self.nmea = Nmea(port=self.prj.setup.nmea_listen_port,
                          timeout=self.prj.setup.nmea_listen_timeout)
-        self.mvp = Mvp(port=self.prj.setup.mvp_listen_port, prj=prj)
+        self.mvp = Mvp(port=self.prj.setup.mvp_listen_port, prj=prj, enricher=self.enricher)
 
     @property
     def sippican_to_process(self) -> bool:
@@ -108,6 +112,7 @@ class Listeners:
         self.stop_listen_sippican()
         self.stop_listen_nmea()        
         self.stop_listen_mvp()
+        self.enricher.stop(wait=False)
 
     def __repr__(self) -> str:
         msg = "<Listeners>\n"
@@ -4,17 +4,21 @@ from threading import Event
 logger = logging.getLogger(__name__)
 
 from hyo2.ssm2.lib.listener.abstract import AbstractListener
+from hyo2.ssm2.lib.listener.enricher import Enricher
 from hyo2.ssm2.lib.formats.readers import mvp
 
 
 class Mvp(AbstractListener):
     """MVP listener"""
 
-    def __init__(self, port, prj, timeout=1, ip="0.0.0.0", target=None, name="Km"):
+    def __init__(self, port, prj, timeout=1, ip="0.0.0.0", target=None, name="Km", enricher=None):
         super(Mvp, self).__init__(port=port, ip=ip, timeout=timeout,
                                   target=target, name=name)
         self.desc = "MVP"
         self.prj = prj
+        self.enricher = enricher
+        if self.enricher is None:
+            self.enricher = Enricher(prj=prj)
 
         self.new_ssp = Event()
 
@@ -44,6 +48,12 @@ class Mvp(AbstractListener):
         # msg += "  <has data loaded: %s>\n" % self.has_data_loaded
         return msg
 
+    def publish(self, ssp):
+        """Called by the enricher once the atlases data have been added to the cast"""
+        for pr in ssp.l:
+            pr.listener_completed = True
+        self.new_ssp.set()
+
     def parse(self):
         logger.info("Going to parse data of length %s using protocol %s" % (len(self.data), self.protocol))
 
@@ -86,52 +96,8 @@ class Mvp(AbstractListener):
                 self.got_footer = False
                 self.footer = None
 
-                # retrieve atlases data for each retrieved profile
-                if self.prj.use_woa09() and self.prj.has_woa09():
-                    self.prj.ssp.cur.woa09 = self.prj.atlases.woa09.query(lat=self.prj.ssp.cur.meta.latitude,
-                                                                          lon=self.prj.ssp.cur.meta.longitude,
-                                                                          dtstamp=self.prj.ssp.cur.meta.utc_time)
-                    logger.debug("added WOA09")
-
-                if self.prj.use_woa13() and self.prj.has_woa13():
-                    self.prj.ssp.cur.woa13 = self.prj.atlases.woa13.query(lat=self.prj.ssp.cur.meta.latitude,
-                                                                          lon=self.prj.ssp.cur.meta.longitude,
-                                                                          dtstamp=self.prj.ssp.cur.meta.utc_time)
-                    logger.debug("added WOA13")
-
-                if self.prj.use_woa18() and self.prj.has_woa18():
-                    self.prj.ssp.cur.woa18 = self.prj.atlases.woa18.query(lat=self.prj.ssp.cur.meta.latitude,
-                                                                          lon=self.prj.ssp.cur.meta.longitude,
-                                                                          dtstamp=self.prj.ssp.cur.meta.utc_time)
-                    logger.debug("added WOA18")
-
-                if self.prj.use_rtofs():
-                    try:
-                        self.prj.ssp.cur.rtofs = self.prj.atlases.rtofs.query(lat=self.prj.ssp.cur.meta.latitude,
-                                                                              lon=self.prj.ssp.cur.meta.longitude,
-                                                                              dtstamp=self.prj.ssp.cur.meta.utc_time)
-                        logger.debug("added RTOFS")
-
-                    except RuntimeError:
-                        self.prj.ssp.cur.rtofs = None
-                        logger.warning("unable to retrieve RTOFS data")
-
-                # check for default metadata
-                if self.prj.setup.auto_apply_default_metadata:
-                    if len(self.prj.ssp.cur.meta.institution) == 0:
-                        if len(self.prj.setup.default_institution) != 0:
-                            self.prj.ssp.cur.meta.institution = self.prj.setup.default_institution
-                            # logger.debug('default institution: %s' % self.prj.ssp.cur.meta.institution)
-                    if len(self.prj.ssp.cur.meta.survey) == 0:
-                        if len(self.prj.setup.default_survey) != 0:
-                            self.prj.ssp.cur.meta.survey = self.prj.setup.default_survey
-                            # logger.debug('default survey: %s' % self.prj.ssp.cur.meta.survey)
-                    if len(self.prj.ssp.cur.meta.vessel) == 0:
-                        if len(self.prj.setup.default_vessel) != 0:
-                            self.prj.ssp.cur.meta.vessel = self.prj.setup.default_vessel
-                            # logger.debug('default vessel: %s' % self.prj.ssp.cur.meta.vessel)
-
-                self.prj.ssp.cur.listener_completed = True
+                # the atlases are queried asynchronously, to not block the listener
+                self.enricher.submit(self.prj.ssp, publish=self.publish)
 
         elif self.protocol == mvp.Mvp.protocols["UNDEFINED"]:
 
@@ -143,47 +109,8 @@ class Mvp(AbstractListener):
             rdr.init_from_listener(self.header, self.data_blocks, self.footer, self.protocol, self.format)
             self.prj.ssp = rdr.ssp
 
-            # retrieve atlases data for each retrieved profile
-            if self.prj.use_woa09() and self.prj.has_woa09():
-                self.prj.ssp.cur.woa09 = self.prj.atlases.woa09.query(lat=self.prj.ssp.cur.meta.latitude,
-                                                                      lon=self.prj.ssp.cur.meta.longitude,
-                                                                      dtstamp=self.prj.ssp.cur.meta.utc_time)
-
-            if self.prj.use_woa13() and self.prj.has_woa13():
-                self.prj.ssp.cur.woa13 = self.prj.atlases.woa13.query(lat=self.prj.ssp.cur.meta.latitude,
-                                                                      lon=self.prj.ssp.cur.meta.longitude,
-                                                                      dtstamp=self.prj.ssp.cur.meta.utc_time)
-
-            if self.prj.use_woa18() and self.prj.has_woa18():
-                self.prj.ssp.cur.woa18 = self.prj.atlases.woa18.query(lat=self.prj.ssp.cur.meta.latitude,
-                                                                      lon=self.prj.ssp.cur.meta.longitude,
-                                                                      dtstamp=self.prj.ssp.cur.meta.utc_time)
-
-            if self.prj.use_rtofs():
-                try:
-                    self.prj.ssp.cur.rtofs = self.prj.atlases.rtofs.query(lat=self.prj.ssp.cur.meta.latitude,
-                                                                          lon=self.prj.ssp.cur.meta.longitude,
-                                                                          dtstamp=self.prj.ssp.cur.meta.utc_time)
-                except RuntimeError:
-                    self.prj.ssp.cur.rtofs = None
-                    logger.warning("unable to retrieve RTOFS data")
-
-            # check for default metadata
-            if self.prj.setup.auto_apply_default_metadata:
-                if len(self.prj.ssp.cur.meta.institution) == 0:
-                    if len(self.prj.setup.default_institution) != 0:
-                        self.prj.ssp.cur.meta.institution = self.prj.setup.default_institution
-                        # logger.debug('default institution: %s' % self.prj.ssp.cur.meta.institution)
-                if len(self.prj.ssp.cur.meta.survey) == 0:
-                    if len(self.prj.setup.default_survey) != 0:
-                        self.prj.ssp.cur.meta.survey = self.prj.setup.default_survey
-                        # logger.debug('default survey: %s' % self.prj.ssp.cur.meta.survey)
-                if len(self.prj.ssp.cur.meta.vessel) == 0:
-                    if len(self.prj.setup.default_vessel) != 0:
-                        self.prj.ssp.cur.meta.vessel = self.prj.setup.default_vessel
-                        # logger.debug('default vessel: %s' % self.prj.ssp.cur.meta.vessel)
-
-            self.prj.ssp.cur.listener_completed = True
+            # the atlases are queried asynchronously, to not block the listener
+            self.enricher.submit(self.prj.ssp, publish=self.publish)
 
+        # the new cast is only signaled by publish(), once enriched
         self.data = None
-        self.new_ssp.set()
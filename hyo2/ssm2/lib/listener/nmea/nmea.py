@@ -13,8 +13,10 @@ class Nmea(AbstractListener):
     """NMEA listener"""
 
     def __init__(self, port: int, timeout: int = 1, ip: str = "0.0.0.0",
-                 target: Optional[object] = None, name: str = "NMEA", debug: bool = False) -> None:
-        super(Nmea, self).__init__(port=port, ip=ip, timeout=timeout, target=target, name=name, debug=debug)
+                 target: Optional[object] = None, name: str = "NMEA", debug: bool = False,
+                 rcvbuf_size: int = 2 ** 22, queue_size: int = 1024) -> None:
+        super(Nmea, self).__init__(port=port, ip=ip, timeout=timeout, target=target, name=name, debug=debug,
+                                   rcvbuf_size=rcvbuf_size, queue_size=queue_size)
         self.desc = name
 
         self.nav = None  # type: Optional[Union[Nmea0183GGA, Nmea0183GLL]]
@@ -42,10 +44,12 @@ class Nmea(AbstractListener):
         if sentence_type == 'GGA':
             self.nav = Nmea0183GGA(this_data)
             self.nav_last_time = datetime.utcnow()
+            self.notify()
 
         elif sentence_type == 'GLL':
             self.nav = Nmea0183GLL(this_data)
             self.nav_last_time = datetime.utcnow()
+            self.notify()
 
     def __repr__(self):
         msg = "%s" % super(Nmea, self).__repr__()
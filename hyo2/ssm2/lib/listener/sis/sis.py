@@ -6,6 +6,7 @@ import struct
 import time
 import traceback
 from datetime import datetime
+from threading import Condition
 from typing import Optional, Union
 
 from hyo2.ssm2.lib.listener.abstract import AbstractListener
@@ -67,8 +68,10 @@ class Sis(AbstractListener):
 
     def __init__(self, port: int, timeout: int = 1, ip: str = "0.0.0.0",
                  target: Optional[object] = None, name: str = "SIS",
-                 use_sis5: bool = False, debug: bool = False) -> None:
-        super().__init__(port=port, ip=ip, timeout=timeout, target=target, name=name, debug=debug)
+                 use_sis5: bool = False, debug: bool = False,
+                 rcvbuf_size: int = 2 ** 22, queue_size: int = 1024) -> None:
+        super().__init__(port=port, ip=ip, timeout=timeout, target=target, name=name, debug=debug,
+                         rcvbuf_size=rcvbuf_size, queue_size=queue_size)
         self.use_sis5 = use_sis5
         self.desc = name
 
@@ -79,6 +82,10 @@ class Sis(AbstractListener):
         self.nav_last_time = None  # type: Optional[datetime]
         self.xyz_last_time = None  # type: Optional[datetime]
 
+        # the latest received profile from each sender IP (used to confirm the transmission to multiple clients)
+        self.received_ssps = dict()
+        self.ssp_received = Condition()
+
     @property
     def ssp(self) -> Union[km.KmSvp, kmall.KmallSVP, None]:
         if self.use_sis5:
@@ -98,6 +105,23 @@ class Sis(AbstractListener):
             self.sis5.svp = None
         else:
             self.sis4.ssp = None
+        with self.ssp_received:
+            self.received_ssps = dict()
+
+    def _add_received_ssp(self, ssp: Union[km.KmSvp, kmall.KmallSVP]) -> None:
+        with self.ssp_received:
+            if self.sender is not None:
+                self.received_ssps[self.sender[0]] = ssp
+            self.ssp_received.notify_all()
+
+    def wait_for_ssps(self, ips: list, timeout: float) -> dict:
+        """Wait for profiles from all the passed IPs (or from as many senders), and return the received ones"""
+        def received() -> bool:
+            return all(ip in self.received_ssps for ip in ips) or (len(self.received_ssps) >= len(ips))
+
+        with self.ssp_received:
+            self.ssp_received.wait_for(received, timeout=timeout)
+            return dict(self.received_ssps)
 
     @property
     def nav(self) -> Union[km.KmNav, kmall.KmallSPO, kmall.KmallSSM]:
@@ -228,6 +252,12 @@ class Sis(AbstractListener):
                 return None
             return self.sis4.nav.dg_time
 
+    def is_priority(self, data: bytes) -> bool:
+        """Sound speed profiles and positions are never dropped in favor of other datagrams"""
+        if self.use_sis5:
+            return data[4:8] in (b'#SVP', b'#SPO')
+        return data[1:2] in (b'\x55', b'\x50')
+
     def parse(self) -> None:
         if self.use_sis5:
             self.sis4 = Sis.Sis4()
@@ -281,6 +311,7 @@ class Sis(AbstractListener):
             self.sis4.nav = km.KmNav(this_data)
             self.sis4.nav_count += 1
             self.nav_last_time = datetime.utcnow()
+            self.notify()
             if self.debug:
                 logger.debug("Parsed")
 
@@ -293,6 +324,7 @@ class Sis(AbstractListener):
         elif self.cur_id == 0x55:
             self.sis4.ssp = km.KmSvp(this_data)
             self.sis4.ssp_count += 1
+            self._add_received_ssp(self.sis4.ssp)
             if self.debug:
                 logger.debug("Parsed")
 
@@ -350,6 +382,7 @@ class Sis(AbstractListener):
             self.nav_last_time = datetime.utcnow()
             if not ssm.inactive_pinging:
                 self.xyz_last_time = datetime.utcnow()
+            self.notify()
             if self.debug:
                 logger.debug("%s: Parsed" % self.cur_id)
 
@@ -374,12 +407,14 @@ class Sis(AbstractListener):
             self.sis5.spo = spo
             self.sis5.spo_count += 1
             self.nav_last_time = datetime.utcnow()
+            self.notify()
             if self.debug:
                 logger.debug("%s: Parsed" % self.cur_id)
 
         elif self.cur_id == b'#SVP':
             self.sis5.svp = kmall.KmallSVP(this_data, self.debug)
             self.sis5.svp_count += 1
+            self._add_received_ssp(self.sis5.svp)
             if self.debug:
                 logger.debug("%s: Parsed" % self.cur_id)
 
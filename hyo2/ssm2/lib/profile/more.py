@@ -9,19 +9,19 @@ class More:
         self.sa = None
 
     def init_struct_array(self, num_samples, fields):
-        """Initialize the stuctured array using the passed num_samples and the len of 'fields' list
+        """Initialize the stuctured array with a record for each of the passed num_samples
 
         The 'fields' must have as first field the depth
         """
         if len(fields) == 0:
             return
         dt = [(fld, 'f4') for fld in fields]
-        self.sa = np.zeros((num_samples, len(fields)), dtype=dt)
+        self.sa = np.zeros(num_samples, dtype=dt)
 
     def __repr__(self):
         msg = "  <More>\n"
         if self.sa is not None:
-            msg += "    <shape:(%s,%s)>\n" % self.sa.shape
+            msg += "    <shape:(%s,%s)>\n" % (self.sa.shape[0], len(self.sa.dtype.names))
             for fn in self.sa.dtype.names:
                 if len(self.sa[fn]) > 2:
                     msg += "    <%s sz:%s min:%.3f max:%.3f>\n" \
@@ -36,7 +36,13 @@ class More:
         if self.sa.shape[0] == count:
             return
 
-        self.sa = np.resize(self.sa, (count, self.sa.shape[1]))
+        if count < self.sa.shape[0]:
+            self.sa = self.sa[:count].copy()
+            return
+
+        sa = np.zeros(count, dtype=self.sa.dtype)
+        sa[:self.sa.shape[0]] = self.sa
+        self.sa = sa
 
     def debug_plot(self):
         """Create a debug plot with the data, optionally with the extra data if available"""
@@ -44,7 +50,7 @@ class More:
             return
 
         import matplotlib.pyplot as plt
-        nr_fields = self.sa.shape[1] - 1
+        nr_fields = len(self.sa.dtype.names) - 1
         nr_figures = (nr_fields // 4) + 1
 
         logger.info("plotting additional %s fields on %s figures" % (nr_fields, nr_figures))
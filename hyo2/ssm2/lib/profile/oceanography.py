@@ -48,10 +48,9 @@ class Oceanography:
             return -gsw.conversions.z_from_p(p=p, lat=lat)
 
         depth = -gsw.conversions.z_from_p(p=p, lat=lat, geo_strf_dyn_height=dyn_height)
-        for val in depth:
-            if np.isnan(val):
-                logger.info("nan in gsw.conversions.z_from_p with dyn_height")
-                return -gsw.conversions.z_from_p(p=p, lat=lat)
+        if np.any(np.isnan(depth)):
+            logger.info("nan in gsw.conversions.z_from_p with dyn_height")
+            return -gsw.conversions.z_from_p(p=p, lat=lat)
 
         return depth
 
@@ -103,10 +102,9 @@ class Oceanography:
             return gsw.conversions.p_from_z(z=-d, lat=lat)
 
         pressure = gsw.conversions.p_from_z(z=-d, lat=lat, geo_strf_dyn_height=dyn_height)
-        for val in pressure:
-            if np.isnan(val):
-                logger.info("nan in gsw.conversions.p_from_z with dyn_height")
-                return gsw.conversions.p_from_z(z=-d, lat=lat)
+        if np.any(np.isnan(pressure)):
+            logger.info("nan in gsw.conversions.p_from_z with dyn_height")
+            return gsw.conversions.p_from_z(z=-d, lat=lat)
 
         return pressure
 
@@ -157,6 +155,13 @@ class Oceanography:
 
         Returns: sound speed in m/s
         """
+        cwtp, atp, btp, dtp = cls._speed_terms(d=d, t=t, lat=lat)
+
+        return cwtp + atp * s + btp * s ** 1.5 + dtp * s ** 2
+
+    @classmethod
+    def _speed_terms(cls, d, t, lat):
+        """Salinity-independent terms of the Chen and Millero(1977) equation used by speed()"""
 
         p = cls.d2p_backup(d, lat) / 10  # pressure in bar
 
@@ -220,46 +225,51 @@ class Oceanography:
                (c20 + c21 * t + c22 * t ** 2 + c23 * t ** 3 + c24 * t ** 4) * p ** 2 + \
                (c30 + c31 * t + c32 * t ** 2) * p ** 3
 
-        return cwtp + atp * s + btp * s ** 1.5 + dtp * s ** 2
+        return cwtp, atp, btp, dtp
 
     @classmethod
     def sal(cls, d, speed, t, lat=30):
         """Iteratively calculate the salinity based on the speed() method
 
+        The Newton iteration is applied simultaneously to all the passed values (scalars or arrays).
+
         Args:
             d: depth in meter
             speed: sound speed in m/sec
             t: temperature in deg Celsius
             lat: latitude in decimal degree
 
-        Returns:  Salinity in PSU (ppt)
+        Returns:  Salinity in PSU (ppt), NaN where any of the input values is missing
 
         """
+        d, speed, t = np.broadcast_arrays(np.asarray(d, dtype=np.float64), np.asarray(speed, dtype=np.float64),
+                                          np.asarray(t, dtype=np.float64))
+        is_scalar = d.ndim == 0
+        d, speed, t = np.atleast_1d(d), np.atleast_1d(speed), np.atleast_1d(t)
+
         high_value = 50.0
         low_value = 0.0
-        num_iterations = 0
-        max_iterations = 1e6
-        salinity = 0
-        speed_calc = 0
-
-        while np.abs(speed_calc - speed) > 0.0005:
-
-            if high_value == low_value:  # unstable sound speed measurement
-                logger.warning("found unstable salinity value")
-                break
-            if num_iterations > max_iterations:
-                logger.warning("too many iterations to obtain the salinity value")
+        max_iterations = 50
+        cwtp, atp, btp, dtp = cls._speed_terms(d=d, t=t, lat=lat)
+        # the samples with a missing input value are left as NaN (thus never active)
+        ok = np.isfinite(d) & np.isfinite(speed) & np.isfinite(t)
+        salinity = np.where(ok, 35.0, np.nan)
+
+        for _ in range(max_iterations):
+            speed_diff = (cwtp + atp * salinity + btp * salinity ** 1.5 + dtp * salinity ** 2) - speed
+            active = ok & (np.abs(np.where(ok, speed_diff, 0.0)) > 0.0005)
+            if not np.any(active):
                 break
 
-            salinity = (high_value + low_value) / 2.0
-            speed_calc = cls.speed(d, t, salinity, lat)
-            if speed_calc > speed:
-                high_value = salinity
-            else:
-                low_value = salinity
+            # derivative of the speed with respect to the salinity
+            slope = atp[active] + 1.5 * btp[active] * np.sqrt(salinity[active]) + 2.0 * dtp[active] * salinity[active]
+            salinity[active] = np.clip(salinity[active] - speed_diff[active] / slope, low_value, high_value)
 
-            num_iterations += 1
+        else:  # the sound speed cannot be reached in the salinity range
+            logger.warning("found unstable salinity value")
 
+        if is_scalar:
+            return float(salinity[0])
         return salinity
 
     @classmethod
@@ -319,18 +329,18 @@ class Oceanography:
         h = pr - p
         xk = h * cls.atg(s=s, t=t, p=p)
 
-        t += + 0.5 * xk
+        t = t + 0.5 * xk
         q = xk
-        p += 0.5 * h
+        p = p + 0.5 * h
         xk = h * cls.atg(s=s, t=t, p=p)
 
-        t += 0.29289322 * (xk - q)
+        t = t + 0.29289322 * (xk - q)
         q = 0.58578644 * xk + 0.121320344 * q
         xk = h * cls.atg(s=s, t=t, p=p)
 
-        t += 1.707106781 * (xk - q)
+        t = t + 1.707106781 * (xk - q)
         q = 3.414213562 * xk - 4.121320344 * q
-        p += 0.5 * h
+        p = p + 0.5 * h
         xk = h * cls.atg(s=s, t=t, p=p)
 
         return t + (xk - 2.0 * q) / 6.0
@@ -339,6 +349,8 @@ class Oceanography:
     def in_situ_temp(cls, s, t, p, pr):
         """Compute in-situ temperature at pressure
 
+        The search is applied simultaneously to all the passed values (scalars or arrays).
+
         Args:
             s: salinity in PSU ppt
             t: temperature
@@ -347,28 +359,28 @@ class Oceanography:
 
         Returns: in-situ temperature in deg C
         """
+        s, t, p, pr = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (s, t, p, pr)))
+        is_scalar = t.ndim == 0
+        s, t, p, pr = (np.atleast_1d(v) for v in (s, t, p, pr))
 
-        if p == pr:
-            return t
-
-        temp = t
+        temp = t.copy()
         new_pot_t = cls.pot_temp(s=s, t=temp, p=p, pr=pr)
         # logger.debug("p: %s, pr: %s" % (p, pr))
-        if new_pot_t < t:
-            sign = 1
-        else:
-            sign = -1
+        sign = np.where(new_pot_t < t, 1.0, -1.0)
 
         dt = new_pot_t - t
         new_dt = new_pot_t - t
 
-        while abs(new_dt) > 0.001:
-            if abs(new_dt) > abs(dt):
-                sign = -sign
-            temp += sign * 0.001
-            new_pot_t = cls.pot_temp(s=s, t=temp, p=p, pr=pr)
-            new_dt = new_pot_t - t
+        active = (p != pr) & (np.abs(new_dt) > 0.001)
+        while np.any(active):
+            sign[active & (np.abs(new_dt) > np.abs(dt))] *= -1.0
+            temp[active] += sign[active] * 0.001
+            new_pot_t = cls.pot_temp(s=s[active], t=temp[active], p=p[active], pr=pr[active])
+            new_dt[active] = new_pot_t - t[active]
+            active &= np.abs(new_dt) > 0.001
 
+        if is_scalar:
+            return float(temp[0])
         return temp
 
     @classmethod
@@ -450,6 +462,8 @@ class Oceanography:
     def s2c(cls, s, p, t):
         """Calculate conductivity iteratively
 
+        The search is applied simultaneously to all the passed values (scalars or arrays).
+
         Args:
             s: salinity in psu
             p: pressure in dBar
@@ -457,31 +471,42 @@ class Oceanography:
 
         Returns: Conductivity mmho/cm
         """
+        s, p, t = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (s, p, t)))
+        is_scalar = s.ndim == 0
+        s, p, t = (np.atleast_1d(v) for v in (s, p, t))
 
         c = 0
         c_step = 0.1
         max_c = 100
 
-        calc_s = -1
-        last_c = c
-        last_s = calc_s
+        calc_s = np.full(s.shape, -1.0)
+        last_c = np.full(s.shape, float(c))
+        last_s = calc_s.copy()
+        cur_c = last_c.copy()
 
+        active = np.ones(s.shape, dtype=bool)
         while c < max_c:
-            calc_s = cls.c2s(c, p, t)
+            calc_s[active] = cls.c2s(c, p[active], t[active])
+            cur_c[active] = c
             # log.debug("%f %f %f %f" % (count, conductivity, calc_salinity, salinity))
 
-            if calc_s > s:
+            active &= ~(calc_s > s)
+            if not np.any(active):
                 break
 
-            last_c = c
-            last_s = calc_s
+            last_c[active] = c
+            last_s[active] = calc_s[active]
 
             c += c_step
+        cur_c[active] = c
 
-        delta_c = c - last_c
+        delta_c = cur_c - last_c
         delta_s = calc_s - last_s
 
-        return last_c + delta_c / delta_s * (s - last_s)
+        cond = last_c + delta_c / delta_s * (s - last_s)
+        if is_scalar:
+            return float(cond[0])
+        return cond
 
     @classmethod
     def a(cls, f, t, s, d, ph):
@@ -499,33 +524,7 @@ class Oceanography:
         Returns: attenuation
 
         """
-        abs_t = 273.0 + t
-        c = 1412.0 + 3.21 * t + 1.19 * s + 0.0167 * d  # sound speed calculation
-
-        # Boric Acid Contribution
-        a1 = (8.86 / c) * math.pow(10.0, (0.78 * ph - 5.0))
-        p1 = 1.0
-
-        f1 = 2.8 * math.pow((s / 35.0), 0.5) * math.pow(10.0, 4.0 - (1245.0 / abs_t))
-
-        # MgSO4 Contribution
-        a2 = (21.44 * s / c) * (1.0 + 0.025 * t)
-        p2 = (1.0 - 1.37E-4 * d) + (6.2E-9 * d * d)
-        f2 = (8.17 * math.pow(10.0, 8.0 - 1990.0 / abs_t)) / (1.0 + 0.0018 * (s - 35.0))
-
-        # Pure Water Contribution
-        if t <= 20.0:
-            a3 = 4.937E-4 - 2.59E-5 * t + 9.11E-7 * t * t - 1.50E-8 * t * t * t
-        else:
-            a3 = 3.964E-4 - 1.146E-5 * t + 1.45E-7 * t * t - 6.5E-10 * t * t * t
-
-        p3 = 1.0 - 3.83E-5 * d + 4.9E-10 * d * d
-
-        boric = (a1 * p1 * f1 * f * f) / (f * f + f1 * f1)
-        mgso4 = (a2 * p2 * f2 * f * f) / (f * f + f2 * f2)
-        h2o = a3 * p3 * f * f
-
-        return boric + mgso4 + h2o
+        return cls.attenuation(f=f, t=t, s=s, d=d, ph=ph)
 
     @classmethod
     def sal2sa(cls, sal, p, lon, lat):
@@ -551,16 +550,13 @@ class Oceanography:
         Converted from gsw_geo_strf_dyn_height.c by C.Z. HSTB in Nov 2015
         """
 
-        def p_sequence(p1, p2, i_max_dp, p_seq):
+        def p_sequences(p1, p2, i_max_dp):
+            """Pressures splitting each of the passed intervals in steps not larger than i_max_dp"""
             d_p = p2 - p1
-            n = int(np.ceil(d_p / i_max_dp))
-            pstep = d_p / n if n != 0 else 0
-
-            n_ps = n
-            for j in range(n):
-                p_seq[j] = p1 + pstep * (j + 1)
-
-            return n_ps
+            n = np.ceil(d_p / i_max_dp).astype(int)
+            pstep = np.where(n != 0, d_p / np.maximum(n, 1), 0)
+            seq_idx = np.arange(np.sum(n)) - np.repeat(np.cumsum(n) - n, n)
+            return np.repeat(p1, n) + np.repeat(pstep, n) * (seq_idx + 1), n
 
         max_dp_i = 1.0
         nz = len(sa)
@@ -577,13 +573,9 @@ class Oceanography:
             raise RuntimeError('the reference pressure p_ref is deeper than all bottles')
 
         # Determine if there is a "bottle" at exactly p_ref
-        ip_ref = -1
-        for i in range(nz):
-            if p[i] == p_ref:
-                ip_ref = i
-                break
+        ip_ref = np.flatnonzero(p == p_ref)
+        ip_ref = int(ip_ref[0]) if ip_ref.size > 0 else -1
 
-        dyn_height = np.zeros(nz)
         if (dp_max <= max_dp_i) and (p[0] == 0.0) and (ip_ref >= 0):
 
             # vertical resolution is good (bottle gap is no larger than max_dp_i)
@@ -592,22 +584,16 @@ class Oceanography:
             # "geo_strf_dyn_height0" is the dynamic height anomaly with respect to p_ref = 0 (the surface).
             b = gsw.density_enthalpy_48.specvol_anom(sa, ct, p)
             geo_strf_dyn_height0 = np.zeros(nz)
+            b_av = 0.5 * (b[1:] + b[:-1])
+            geo_strf_dyn_height0[1:] = -np.cumsum(b_av * dp * 1e4)
 
-            for i in range(nz)[1:]:
-                b_av = 0.5 * (b[i] + b[i - 1])
-                geo_strf_dyn_height0[i] = b_av * dp[i - 1] * 1e4
-
-            for i in range(nz)[1:]:  # cumulative sum
-                geo_strf_dyn_height0[i] = geo_strf_dyn_height0[i - 1] - geo_strf_dyn_height0[i]
-
-            for i in range(nz):
-                dyn_height[i] = geo_strf_dyn_height0[i] - geo_strf_dyn_height0[ip_ref]
+            dyn_height = geo_strf_dyn_height0 - geo_strf_dyn_height0[ip_ref]
 
         else:
             # Test if there are vertical gaps between adjacent "bottles" which are
             # greater than max_dp_i, and that there is a "bottle" exactly at the
             # reference pressure.
-            ii_data = np.zeros(nz + 1)
+            ii_data = np.zeros(nz + 1, dtype=int)
             i_bpr = 0  # initialize
             if (dp_max <= max_dp_i) and (ip_ref >= 0):
 
@@ -630,61 +616,45 @@ class Oceanography:
                     i_bpr = ip_ref
 
                 p_cnt = len(p_i)
-                for i in range(p_cnt):
-                    ii_data[i] = i
+                ii_data[:p_cnt] = np.arange(p_cnt)
             else:
                 # interpolation is needed.
-                np_max = len(p) + 2 * int(p[-1] / max_dp_i + 0.5)
-                p_i = np.zeros(np_max)
-
                 if p_min > 0.0:
 
                     # there is not a bottle at p = 0.
                     if p_ref < p_min:
                         # p_ref is shallower than the minimum bottle pressure.
-                        p_i[0] = 0.0
-                        nps = p_sequence(p_i[0], p_ref, max_dp_i, p_i[1:])
-                        i_bpr = p_cnt = nps
-                        p_cnt += 1
-                        nps = p_sequence(p_ref, p_min, max_dp_i, p_i[p_cnt:])
-                        p_cnt += nps
+                        head, nps = p_sequences(np.array([0.0, p_ref]), np.array([p_ref, p_min]), max_dp_i)
+                        head = np.concatenate([[0.0], head])
+                        i_bpr = nps[0]
 
                     else:
                         # p_ref is deeper than the minimum bottle pressure.
-                        p_i[0] = 0.0
-                        p_i[1] = p_min
-                        p_cnt = 2
+                        head = np.array([0.0, p_min])
 
                 else:
                     # there is a bottle at p = 0.
-                    p_i[0] = p_min
-                    p_cnt = 1
-
-                for i_bottle in range(nz - 1):
-
-                    ii_data[i_bottle] = p_cnt - 1
-                    if p[i_bottle] == p_ref:
-                        i_bpr = p_cnt - 1
-
-                    if p[i_bottle] < p_ref < p[i_bottle + 1]:
-                        # ... reference pressure is spanned by bottle pairs -
-                        # need to include p_ref as an interpolated pressure.
-                        nps = p_sequence(p[i_bottle], p_ref, max_dp_i, p_i[p_cnt:])
-                        p_cnt += nps
-                        i_bpr = p_cnt - 1
-                        nps = p_sequence(p_ref, p[i_bottle + 1], max_dp_i, p_i[p_cnt:])
-                        p_cnt += nps
-
-                    else:
-                        # ... reference pressure is not spanned by bottle pairs.
-                        nps = p_sequence(p[i_bottle], p[i_bottle + 1], max_dp_i, p_i[p_cnt:])
-                        p_cnt += nps
-
-                ii_data[nz - 1] = p_cnt - 1
-                if p[nz - 1] == p_ref:
-                    i_bpr = p_cnt - 1
-
-                p_i = p_i[:p_cnt]
+                    head = np.array([p_min])
+
+                # the bottle pairs spanning the reference pressure need to include p_ref as an interpolated pressure
+                i_span = np.flatnonzero((p[:-1] < p_ref) & (p_ref < p[1:]))
+                seq_start = np.insert(p[:-1], i_span + 1, p_ref)
+                seq_end = np.insert(p[1:], i_span, p_ref)
+                seq_bottle = np.insert(np.arange(nz - 1), i_span + 1, i_span)
+                seq, nps = p_sequences(seq_start, seq_end, max_dp_i)
+
+                # count of the interpolated pressures before each bottle
+                seq_cnt = head.size + np.concatenate([[0], np.cumsum(nps)])
+                first_seq = np.searchsorted(seq_bottle, np.arange(nz - 1))
+                ii_data[:nz - 1] = seq_cnt[first_seq] - 1
+                ii_data[nz - 1] = seq_cnt[-1] - 1
+                if i_span.size > 0:
+                    i_bpr = seq_cnt[first_seq[i_span[0]] + 1] - 1
+                if ip_ref >= 0:
+                    i_bpr = ii_data[ip_ref]
+
+                p_i = np.concatenate([head, seq])
+                p_cnt = p_i.size
                 p_i[-1] = p[-1]
                 if p[0] <= 0:
                     sa_i, ct_i = gsw.library.interp_SA_CT(sa, ct, p, p_i)
@@ -696,17 +666,10 @@ class Oceanography:
             b = gsw.density_enthalpy_48.specvol_anom(sa_i, ct_i, p_i)
             # "geo_strf_dyn_height0" is the dynamic height anomaly with respect to p_ref = 0 (the surface).
             geo_strf_dyn_height0 = np.zeros(p_cnt)
+            b_av = 0.5 * (b[1:p_cnt] + b[:p_cnt - 1])
+            geo_strf_dyn_height0[1:] = -np.cumsum(b_av * (p_i[1:p_cnt] - p_i[:p_cnt - 1]))
 
-            for i in range(p_cnt)[1:]:
-                b_av = 0.5 * (b[i] + b[i - 1])
-                dp_i = p_i[i] - p_i[i - 1]
-                geo_strf_dyn_height0[i] = b_av * dp_i
-
-            for i in range(p_cnt)[1:]:  # cumulative sum
-                geo_strf_dyn_height0[i] = geo_strf_dyn_height0[i - 1] - geo_strf_dyn_height0[i]
-
-            for i in range(nz):
-                dyn_height[i] = (geo_strf_dyn_height0[int(ii_data[i])] - geo_strf_dyn_height0[i_bpr]) * 1e4
+            dyn_height = (geo_strf_dyn_height0[ii_data[:nz]] - geo_strf_dyn_height0[i_bpr]) * 1e4
 
         return dyn_height
 
@@ -718,6 +681,8 @@ class Oceanography:
         # S Salinity (ppt)
         # D Depth (m)
         # pH Acidity
+        # The inputs are broadcast: e.g., f[:, np.newaxis] with sample arrays gives a (freqs, samples) table
+        f, t, s, d = (np.asarray(v, dtype=np.float64) for v in (f, t, s, d))
         abs_temp = 273.0 + t
 
         # sound speed calculation
@@ -727,18 +692,17 @@ class Oceanography:
         A1 = (8.86 / c) * math.pow(10.0, (0.78 * ph - 5.0))
         P1 = 1.0
 
-        f1 = 2.8 * math.pow((s / 35.0), 0.5) * math.pow(10.0, 4.0 - (1245.0 / abs_temp))
+        f1 = 2.8 * np.power((s / 35.0), 0.5) * np.power(10.0, 4.0 - (1245.0 / abs_temp))
 
         # MgSO4 Contribution
         A2 = (21.44 * s / c) * (1.0 + 0.025 * t)
         P2 = (1.0 - 1.37E-4 * d) + (6.2E-9 * d * d)
-        f2 = (8.17 * math.pow(10.0, 8.0 - 1990.0 / abs_temp)) / (1.0 + 0.0018 * (s - 35.0))
+        f2 = (8.17 * np.power(10.0, 8.0 - 1990.0 / abs_temp)) / (1.0 + 0.0018 * (s - 35.0))
 
         # Pure Water Contribution
-        if t <= 20.0:
-            A3 = 4.937E-4 - 2.59E-5 * t + 9.11E-7 * t * t - 1.50E-8 * t * t * t
-        else:
-            A3 = 3.964E-4 - 1.146E-5 * t + 1.45E-7 * t * t - 6.5E-10 * t * t * t
+        A3 = np.where(t <= 20.0,
+                      4.937E-4 - 2.59E-5 * t + 9.11E-7 * t * t - 1.50E-8 * t * t * t,
+                      3.964E-4 - 1.146E-5 * t + 1.45E-7 * t * t - 6.5E-10 * t * t * t)
 
         P3 = 1.0 - 3.83E-5 * d + 4.9E-10 * d * d
 
@@ -748,4 +712,6 @@ class Oceanography:
 
         atten = boric + magnes + purewat
 
+        if atten.ndim == 0:
+            return float(atten)
         return atten
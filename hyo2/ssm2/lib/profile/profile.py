@@ -21,11 +21,11 @@ logger = logging.getLogger(__name__)
 class Profile:
     """"A sound speed profile with 3 sections: metadata, data specific to the task, and additional data"""
 
-    def __init__(self):
+    def __init__(self, dtype=np.float64):
         self.meta = Metadata()  # metadata
-        self.data = Samples()  # raw data
-        self.proc = Samples()  # processed data
-        self.sis = Samples()  # sis data
+        self.data = Samples(dtype=dtype)  # raw data
+        self.proc = Samples(dtype=dtype)  # processed data
+        self.sis = Samples(dtype=dtype)  # sis data
         self.more = More()  # additional fields
 
         self.woa09 = None
@@ -90,9 +90,8 @@ class Profile:
         return math.sqrt(var)
 
     def weighted_harmonic_std(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        avg = self.weighted_harmonic_mean()
-        var = np.average((self.proc.speed[self.proc_valid] - avg) ** 2, weights=w)
+        avg = self.proc_speed_mean
+        var = np.average((self._proc_valid_field('speed') - avg) ** 2, weights=self._proc_weights)
         return math.sqrt(var)
 
     def init_data(self, num_samples):
@@ -141,131 +140,153 @@ class Profile:
         self.data.resize(count)
         self.more.resize(count)
 
+    @classmethod
+    def _mask(cls, array, value):
+        """Return a read-only mask of the array entries equal to value (safe to share among callers)"""
+        mask = np.equal(array, value)
+        mask.flags.writeable = False
+        return mask
+
     @property
     def data_valid(self):
         """Return indices of valid data"""
-        return np.equal(self.data.flag, Dicts.flags['valid'])
+        return self.data.cached('valid', lambda: self._mask(self.data.flag, Dicts.flags['valid']))
 
     @property
     def proc_valid(self):
         """Return indices of valid proc samples"""
-        return np.equal(self.proc.flag, Dicts.flags['valid'])
+        return self.proc.cached('valid', lambda: self._mask(self.proc.flag, Dicts.flags['valid']))
 
     @property
     def nr_valid_proc_samples(self):
         """Return the number of valid proc samples"""
-        return len(self.proc.depth[self.proc_valid])
+        return self.proc.cached('nr_valid', lambda: int(np.count_nonzero(self.proc_valid)))
+
+    def _calc_proc_dqa_valid(self):
+        mask = np.logical_and(self.proc_valid, np.logical_or(np.equal(self.proc.source, Dicts.sources['raw']),
+                                                             np.equal(self.proc.source, Dicts.sources['smoothing'])))
+        mask.flags.writeable = False
+        return mask
 
     @property
     def proc_dqa_valid(self):
         """Return indices of DQA valid proc samples"""
-        return np.logical_and(self.proc_valid, np.logical_or(np.equal(self.proc.source, Dicts.sources['raw']),
-                                                             np.equal(self.proc.source, Dicts.sources['smoothing'])))
+        return self.proc.cached('dqa_valid', self._calc_proc_dqa_valid)
 
     @property
     def sis_valid(self):
         """Return indices of valid sis samples"""
-        return np.equal(self.sis.flag, Dicts.flags['valid'])
+        return self.sis.cached('valid', lambda: self._mask(self.sis.flag, Dicts.flags['valid']))
 
     @property
     def sis_thinned(self):
         """Return indices of thinned sis samples"""
-        return np.equal(self.sis.flag, Dicts.flags['thin'])
+        return self.sis.cached('thinned', lambda: self._mask(self.sis.flag, Dicts.flags['thin']))
 
     @property
     def proc_invalid_direction(self):
         """Return indices of invalid data for direction"""
-        return np.equal(self.proc.flag, Dicts.flags['direction'])  # numpy 1.10.4 if a warning
+        return self.proc.cached('invalid_direction', lambda: self._mask(self.proc.flag, Dicts.flags['direction']))
+
+    def _proc_valid_field(self, name):
+        """Return the valid proc samples of the named field (memoized)"""
+        return self.proc.cached('valid_%s' % name, lambda: getattr(self.proc, name)[self.proc_valid])
+
+    @property
+    def _proc_weights(self):
+        return self.proc.cached('weights', lambda: self.calc_weights(self._proc_valid_field('depth')))
 
     @property
     def proc_depth_min(self):
-        return self.proc.depth[self.proc_valid].min()
+        return self.proc.cached('depth_min', lambda: self._proc_valid_field('depth').min())
 
     @property
     def proc_speed_min(self):
-        return self.proc.speed[self.proc_valid].min()
+        return self.proc.cached('speed_min', lambda: self._proc_valid_field('speed').min())
 
     @property
     def proc_temp_min(self):
-        return self.proc.temp[self.proc_valid].min()
+        return self.proc.cached('temp_min', lambda: self._proc_valid_field('temp').min())
 
     @property
     def proc_sal_min(self):
-        return self.proc.sal[self.proc_valid].min()
+        return self.proc.cached('sal_min', lambda: self._proc_valid_field('sal').min())
 
     @property
     def proc_depth_max(self):
-        return self.proc.depth[self.proc_valid].max()
+        return self.proc.cached('depth_max', lambda: self._proc_valid_field('depth').max())
 
     @property
     def proc_speed_max(self):
-        return self.proc.speed[self.proc_valid].max()
+        return self.proc.cached('speed_max', lambda: self._proc_valid_field('speed').max())
 
     @property
     def proc_temp_max(self):
-        return self.proc.temp[self.proc_valid].max()
+        return self.proc.cached('temp_max', lambda: self._proc_valid_field('temp').max())
 
     @property
     def proc_sal_max(self):
-        return self.proc.sal[self.proc_valid].max()
+        return self.proc.cached('sal_max', lambda: self._proc_valid_field('sal').max())
+
+    def _proc_median(self, name):
+        return self.proc.cached('%s_median' % name,
+                                lambda: self.weighted_median(self._proc_valid_field(name), self._proc_weights))
 
     @property
     def proc_depth_median(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return self.weighted_median(self.proc.depth[self.proc_valid], w)
+        return self._proc_median('depth')
 
     @property
     def proc_speed_median(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return self.weighted_median(self.proc.speed[self.proc_valid], w)
+        return self._proc_median('speed')
 
     @property
     def proc_temp_median(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return self.weighted_median(self.proc.temp[self.proc_valid], w)
+        return self._proc_median('temp')
 
     @property
     def proc_sal_median(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return self.weighted_median(self.proc.sal[self.proc_valid], w)
+        return self._proc_median('sal')
+
+    def _proc_mean(self, name):
+        return self.proc.cached('%s_mean' % name,
+                                lambda: np.average(self._proc_valid_field(name), weights=self._proc_weights))
 
     @property
     def proc_depth_mean(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return np.average(self.proc.depth[self.proc_valid], weights=w)
+        return self._proc_mean('depth')
 
     @property
     def proc_speed_mean(self):
-        return self.weighted_harmonic_mean()
+        return self.proc.cached('speed_mean', self.weighted_harmonic_mean)
 
     @property
     def proc_temp_mean(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return np.average(self.proc.temp[self.proc_valid], weights=w)
+        return self._proc_mean('temp')
 
     @property
     def proc_sal_mean(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return np.average(self.proc.sal[self.proc_valid], weights=w)
+        return self._proc_mean('sal')
+
+    def _proc_std(self, name):
+        return self.proc.cached('%s_std' % name,
+                                lambda: self.weighted_arithmetic_std(self._proc_valid_field(name), self._proc_weights))
 
     @property
     def proc_depth_std(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return self.weighted_arithmetic_std(self.proc.depth[self.proc_valid], w)
+        return self._proc_std('depth')
 
     @property
     def proc_speed_std(self):
-        return self.weighted_harmonic_std()
+        return self.proc.cached('speed_std', self.weighted_harmonic_std)
 
     @property
     def proc_temp_std(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return self.weighted_arithmetic_std(self.proc.temp[self.proc_valid], w)
+        return self._proc_std('temp')
 
     @property
     def proc_sal_std(self):
-        w = self.calc_weights(self.proc.depth[self.proc_valid])
-        return self.weighted_arithmetic_std(self.proc.sal[self.proc_valid], w)
+        return self._proc_std('sal')
 
     def _calc_water_salinity_threshold(self):
         """Determine salinity threshold from min/max values to help determine where instrument entered water"""
@@ -306,6 +327,7 @@ class Profile:
         in_air_ii = np.arange(0, len(self.proc_valid)) < water_i
         valid_and_in_air_ii = np.logical_and(self.proc_valid, in_air_ii)
         self.proc.flag[valid_and_in_air_ii] = Dicts.flags['filtered']
+        self.proc.modified()
 
         # remove samples out of water within the profile using salinity
         try:
@@ -313,6 +335,7 @@ class Profile:
             in_air_ii = self.proc.sal <= sal_th
             valid_and_in_air_ii = np.logical_and(self.proc_valid, in_air_ii)
             self.proc.flag[valid_and_in_air_ii] = Dicts.flags['filtered']
+            self.proc.modified()
         except IndexError:
             logger.warning("issue with removing samples out of the water using salinity")
 
@@ -322,6 +345,7 @@ class Profile:
             in_air_ii = self.proc.pressure <= press_th
             valid_and_in_air_ii = np.logical_and(self.proc_valid, in_air_ii)
             self.proc.flag[valid_and_in_air_ii] = Dicts.flags['filtered']
+            self.proc.modified()
         except IndexError:
             logger.warning("issue with removing samples out of the water using salinity")
 
@@ -339,22 +363,15 @@ class Profile:
 
         # Calculate local mean and std dev for each sample, use 2 neighbors on either sides.
         # Endpoints treated separately. Target: single point fliers
-        for i in range(2, nr_samples - 2):
-            speed_sum = 0
-            speed_sum_sq = 0
-            for k in range(-2, 3):
-                if k == 0:  # skip itself
-                    continue
-                speed_sum += speed[i + k]
-                speed_sum_sq += speed[i + k] * speed[i + k]
+        if nr_samples > 4:
+            speed_sq = speed * speed
+            speed_sum = speed[:-4] + speed[1:-3] + speed[3:-1] + speed[4:]  # skip itself
+            speed_sum_sq = speed_sq[:-4] + speed_sq[1:-3] + speed_sq[3:-1] + speed_sq[4:]
 
             variance = ((4 * speed_sum_sq) - speed_sum * speed_sum) / (4 * 3)  # unbiased variance
-            speed_mean[i] = speed_sum / 4
-            if variance < 0:
-                variance = 0
-            sigma[i] = np.sqrt(variance)  # Local standard deviation
-            if sigma[i] < sigma_min_th:
-                sigma[i] = sigma_min_th
+            speed_mean[2:-2] = speed_sum / 4
+            variance[variance < 0] = 0
+            sigma[2:-2] = np.maximum(np.sqrt(variance), sigma_min_th)  # Local standard deviation
 
         # Endpoints (use only three neighboring points). Relax tolerance.
         c_end = 1.3  # Relaxed tolerance factor at endpoints.
@@ -383,22 +400,20 @@ class Profile:
         nr_std_dev = 2  # number of standard deviations to use for error band.
         tolerance_factor = 1.3  # Tolerance factor.
         depth_th = 33.0  # Depth at which to relax error band.
-        factor = tolerance_factor
-        stat_filtered = np.zeros(nr_samples, dtype=bool)
-        for i in range(nr_samples):
-            if depth[i] > depth_th:
-                factor = 1.0
-            th = factor * nr_std_dev * sigma[i]
-            if np.absolute(speed[i] - speed_mean[i]) > th:
-                logger.debug("statistical filtering for sample #%d (%.2f, %.2f, th: %.2f)"
-                             % (i, speed[i], speed_mean[i], th))
-                stat_filtered[i] = True
+        # the tolerance is relaxed once the depth threshold has been passed
+        factor = np.where(np.logical_or.accumulate(depth > depth_th), 1.0, tolerance_factor)
+        th = factor * nr_std_dev * sigma
+        stat_filtered = np.absolute(speed - speed_mean) > th
+        for i in np.flatnonzero(stat_filtered):
+            logger.debug("statistical filtering for sample #%d (%.2f, %.2f, th: %.2f)"
+                         % (i, speed[i], speed_mean[i], th[i]))
 
         # finally apply the statistical filtering
         filtered_ii = np.zeros(len(self.proc_valid), dtype=bool)
         filtered_ii[self.proc_valid] = stat_filtered
         valid_and_filtered_ii = np.logical_and(self.proc_valid, filtered_ii)
         self.proc.flag[valid_and_filtered_ii] = Dicts.flags['filtered']
+        self.proc.modified()
 
     def cosine_smooth(self):
         """Cosine-averaging to smooth the profile data"""
@@ -447,35 +462,28 @@ class Profile:
             logger.debug("cosine avg -> storage: rows %s, columns %s" % (storage.shape[0], storage.shape[1]))
 
         # populate bin values (row #0)
-        for i in range(storage.shape[1]):
-            storage[0][i] = z_min + (- bin_width + i) * bin_size
+        storage[0] = z_min + (np.arange(storage.shape[1]) - bin_width) * bin_size
         if verbose:
             logger.debug("cosine avg -> storage bin values: %s" % (storage[0],))
 
         # populate weights
-        for i, z in enumerate(zs):
+        # - calculate the index of the central bin value, then the bin indices of each averaging window
+        center_idx = ((zs - z_min) / bin_size + .5).astype(int) + bin_width
+        bin_idx = center_idx[:, np.newaxis] + np.arange(-bin_width, bin_width + 1)
 
-            # calculate the index of the central bin value
-            center_idx = int((z - z_min) / bin_size + .5) + bin_width
-            # if debug:
-            #     logger.debug("cosine avg -> z: %s, center index: %s" % (z, center_idx))
+        # - calculate the differences from the current z values in the averaging windows
+        z_diff = zs[:, np.newaxis] - storage[0][bin_idx]
 
-            # calculate the differences from the current z values in the averaging windows
-            z_diff = z - storage[0][center_idx - bin_width:center_idx + bin_width + 1]
-            # if debug:
-            #     logger.debug("cosine avg -> z: %s, z diff: %s" % (z, z_diff))
-
-            # Insure that weight will be .1 at a window width from point I
-            bin_weights = 1.0 + np.cos(2.69 * z_diff / window_width[i])
-            bin_weights *= np.absolute(z_diff) < window_width[i]  # set to 0 when outside the window width
-            # if debug:
-            #     logger.debug("cosine avg -> z: %s, bin weights: %s" % (z, bin_weights))
-
-            for j, name in enumerate(names):
-                # summing up for all the types, row is j + 1 since the first row is for bin values
-                storage[1 + j][center_idx - bin_width:center_idx + bin_width + 1] += records[name][i] * bin_weights
+        # - Insure that weight will be .1 at a window width from point I
+        bin_weights = 1.0 + np.cos(2.69 * z_diff / window_width[:, np.newaxis])
+        bin_weights *= np.absolute(z_diff) < window_width[:, np.newaxis]  # set to 0 when outside the window width
 
-            storage[-1][center_idx - bin_width:center_idx + bin_width + 1] += bin_weights
+        # - summing up for all the types (in sample order), row is j + 1 since the first row is for bin values
+        bin_idx = bin_idx.ravel()
+        for j, name in enumerate(names):
+            storage[1 + j] += np.bincount(bin_idx, weights=(records[name][:, np.newaxis] * bin_weights).ravel(),
+                                          minlength=storage.shape[1])
+        storage[-1] += np.bincount(bin_idx, weights=bin_weights.ravel(), minlength=storage.shape[1])
 
         if verbose:
             logger.debug("cosine avg -> storage weights: %s" % (storage[-1],))
@@ -498,34 +506,46 @@ class Profile:
 
         # logger.debug(self.proc.depth)
 
-        # insert created data into the self.proc arrays
+        # insert created data into the self.proc arrays (skipping the negative depths)
         last_depth = 0.0
-        for row in storage.T:
-
-            # index of where the storage record falls
-            d_th = float(row[0])
+        keep = np.zeros(storage.shape[1], dtype=bool)
+        for k, d_th in enumerate(storage[0]):
             if d_th < last_depth:
                 continue
             last_depth = d_th
-            try:
-                z_bools = np.logical_and(self.proc_valid, self.proc.depth > d_th)
-                i = np.argwhere(z_bools)[0]
-            except IndexError:
-                i = zs.size
-
-            self.proc.depth = np.insert(self.proc.depth, i, d_th)
+            keep[k] = True
+        storage = storage[:, keep]
+
+        # each record goes before the first valid sample deeper than it: since the records are sorted by depth,
+        # this is where the running max of the valid depths first exceeds the record depth
+        valid_idx = np.flatnonzero(self.proc_valid)
+        running_max = np.maximum.accumulate(self.proc.depth[valid_idx])
+        positions = np.searchsorted(running_max, storage[0], side='right')
+        is_inside = positions < valid_idx.size
+
+        inside = storage[:, is_inside]
+        inside_idx = valid_idx[positions[is_inside]]
+        self.proc.depth = np.insert(self.proc.depth, inside_idx, inside[0])
+        self.proc.source = np.insert(self.proc.source, inside_idx, Dicts.sources['smoothing'])
+        self.proc.flag = np.insert(self.proc.flag, inside_idx, Dicts.flags['valid'])
+        for j, name in enumerate(names):
+            setattr(self.proc, name, np.insert(getattr(self.proc, name), inside_idx, inside[j + 1]))
+
+        # the deepest records (with no deeper valid sample) go at the position after the last valid sample
+        for row in storage[:, ~is_inside].T:
+            i = zs.size
+            self.proc.depth = np.insert(self.proc.depth, i, row[0])
             self.proc.source = np.insert(self.proc.source, i, Dicts.sources['smoothing'])
             self.proc.flag = np.insert(self.proc.flag, i, Dicts.flags['valid'])
             for j, name in enumerate(names):
                 setattr(self.proc, name, np.insert(getattr(self.proc, name), i, row[j + 1]))
 
-            # logger.debug(self.proc.depth)
-
         # since we inserted new samples
         self.proc.num_samples = self.proc.depth.size
 
         # mark previous 'valid' data as 'smoothed'
         self.proc.flag[self.proc.source != Dicts.sources['smoothing']] = Dicts.flags['smoothed']
+        self.proc.modified()
 
     def reduce_up_down(self, ssp_direction, use_pressure=False):
         """Reduce the raw data samples based on the passed direction"""
@@ -541,46 +561,32 @@ class Profile:
             max_value = self.data.depth[self.data_valid].max()  # max depth
             logger.debug("reduce up/down > max depth: %s" % max_value)
 
-        # loop through the sample using max depth as turning point
-        max_reached = False
-        last_value = None
-        for i in range(self.data.num_samples):
-
-            if use_pressure:
-                value = self.data.pressure[i]
-            else:
-                value = self.data.depth[i]
-
-            if (ssp_direction == Dicts.ssp_directions['up'] and not max_reached) \
-                    or (ssp_direction == Dicts.ssp_directions['down'] and max_reached):
-                self.data.flag[i] = Dicts.flags['direction']  # set invalid for direction
-
-            elif ssp_direction == Dicts.ssp_directions['down'] and not max_reached:
-
-                if (i != 0) and (last_value is not None):
-                    if value <= last_value:
-                        # print(last_value, value)
-                        self.data.flag[i] = Dicts.flags['direction']  # set invalid for direction
-                    else:
-                        last_value = value
-                else:
-                    last_value = value
-
-            elif ssp_direction == Dicts.ssp_directions['up'] and max_reached:
-
-                if (i != 0) and (last_value is not None):
-                    if value >= last_value:
-                        self.data.flag[i] = Dicts.flags['direction']  # set invalid for direction
-                    else:
-                        last_value = value
-                else:
-                    last_value = value
-
-            if (value == max_value) and (max_reached is False):
-                max_reached = True
-                last_value = value
-                if ssp_direction == Dicts.ssp_directions['up']:
-                    self.data.flag[i] = Dicts.flags['valid']  # switch back to valid the last flagged one
+        if use_pressure:
+            values = self.data.pressure[:self.data.num_samples]
+        else:
+            values = self.data.depth[:self.data.num_samples]
+
+        # use max depth as turning point
+        turning_idx = np.flatnonzero(values == max_value)
+        turning_idx = turning_idx[0] if turning_idx.size > 0 else values.size
+        before = values[:turning_idx + 1]
+        after = values[turning_idx + 1:]
+        flags = self.data.flag[:self.data.num_samples]
+
+        if ssp_direction == Dicts.ssp_directions['down']:
+            # before the turning point, keep only the samples deeper than all the previous ones
+            previous_max = np.concatenate(([-np.inf], np.fmax.accumulate(before)[:-1]))
+            flags[:turning_idx + 1][before <= previous_max] = Dicts.flags['direction']  # set invalid for direction
+            flags[turning_idx + 1:] = Dicts.flags['direction']
+
+        elif ssp_direction == Dicts.ssp_directions['up']:
+            flags[:turning_idx + 1] = Dicts.flags['direction']
+            if turning_idx < values.size:
+                flags[turning_idx] = Dicts.flags['valid']  # switch back to valid the last flagged one
+                # after the turning point, keep only the samples shallower than all the previous ones
+                previous_min = np.fmin.accumulate(values[turning_idx:])[:-1]
+                flags[turning_idx + 1:][after >= previous_min] = Dicts.flags['direction']
+        self.data.modified()
 
         if np.sum(self.data_valid) <= 1:
             raise RuntimeError('Unable to locate the upcast values. Double check their presence in the input file.')
@@ -595,6 +601,7 @@ class Profile:
             self.data.sal[:] = np.flipud(self.data.sal)
             self.data.source[:] = np.flipud(self.data.source)
             self.data.flag[:] = np.flipud(self.data.flag)
+            self.data.modified()
 
     def calc_salinity_from_conductivity(self):
         if np.count_nonzero(self.data.pressure):
@@ -624,9 +631,10 @@ class Profile:
         else:
             latitude = self.meta.latitude
 
-        for count in range(self.data.num_samples):
-            self.data.sal[count] = Oc.sal(d=self.data.depth[count], speed=self.data.speed[count],
-                                          t=self.data.temp[count], lat=latitude)
+        n = self.data.num_samples
+        self.data.sal[:n] = Oc.sal(d=self.data.depth[:n], speed=self.data.speed[:n], t=self.data.temp[:n],
+                                   lat=latitude)
+        self.data.modified()
         self.modify_proc_info(Dicts.proc_import_infos['CALC_SAL'])
 
     def calc_dyn_height(self):
@@ -683,6 +691,7 @@ class Profile:
         self.data.depth = np.zeros_like(self.data.pressure)
         self.data.depth[self.data_valid] = Oc.p2d(p=self.data.pressure[self.data_valid], lat=latitude,
                                                   dyn_height=dyn_height, debug=True)
+        self.data.modified()
         self.modify_proc_info(Dicts.proc_import_infos['CALC_DEP'])
 
     def calc_data_speed(self):
@@ -694,11 +703,9 @@ class Profile:
         else:
             latitude = self.meta.latitude
 
-        for count in range(self.data.num_samples):
-            self.data.speed[count] = Oc.speed(self.data.depth[count],
-                                              self.data.temp[count],
-                                              self.data.sal[count],
-                                              latitude)
+        n = self.data.num_samples
+        self.data.speed[:n] = Oc.speed(self.data.depth[:n], self.data.temp[:n], self.data.sal[:n], latitude)
+        self.data.modified()
         self.modify_proc_info(Dicts.proc_import_infos['CALC_SPD'])
 
     def calc_proc_speed(self):
@@ -710,21 +717,16 @@ class Profile:
         else:
             latitude = self.meta.latitude
 
-        for count in range(self.proc.num_samples):
-            self.proc.speed[count] = Oc.speed(self.proc.depth[count],
-                                              self.proc.temp[count],
-                                              self.proc.sal[count],
-                                              latitude)
+        n = self.proc.num_samples
+        self.proc.speed[:n] = Oc.speed(self.proc.depth[:n], self.proc.temp[:n], self.proc.sal[:n], latitude)
+        self.proc.modified()
         self.modify_proc_info(Dicts.proc_user_infos['RECALC_SPD'])
 
     def calc_attenuation(self, frequency, ph):
         """Helper method to calculation attenuation [unused]"""
-        depth = np.zeros(self.proc.num_samples)
-        attenuation = np.zeros(self.proc.num_samples)
-        for i in range(self.proc.num_samples):
-            depth[i] = self.proc.depth[i]
-            attenuation[i] = Oc.a(frequency, self.proc.temp[i], self.proc.sal[i],
-                                  self.proc.depth[i], ph)
+        n = self.proc.num_samples
+        depth = self.proc.depth[:n].copy()
+        attenuation = Oc.a(frequency, self.proc.temp[:n], self.proc.sal[:n], depth, ph)
 
         return attenuation, depth
 
@@ -733,11 +735,8 @@ class Profile:
         attenuation, depth = self.calc_attenuation(frequency, ph)
         cumulative_attenuation = np.zeros(len(attenuation))
 
-        total_loss = 0
-        for count in range(len(attenuation) - 1):
-            layer_loss = attenuation[count] * (depth[count + 1] - depth[count]) / 1000.0
-            total_loss += layer_loss
-            cumulative_attenuation[count] = total_loss / (depth[count + 1] / 1000.0)
+        total_loss = np.cumsum(attenuation[:-1] * (depth[1:] - depth[:-1]) / 1000.0)
+        cumulative_attenuation[:-1] = total_loss / (depth[1:] / 1000.0)
 
         cumulative_attenuation[-1] = cumulative_attenuation[-2]
 
@@ -778,6 +777,7 @@ class Profile:
             self.proc.speed[i] = speed
             self.proc.source[i] = src
             self.proc.flag[i] = Dicts.flags['valid']
+            self.proc.modified()
         else:
             # print('new depth')
             if depth < self.proc.depth[valid][0]:
@@ -802,33 +802,22 @@ class Profile:
             # interpolate for pressure
             pi = np.array([self.proc.pressure[valid][m_ids[0]], self.proc.pressure[valid][m_ids[1]]])
             pm, pc = np.linalg.lstsq(a, pi, rcond=None)[0]
-            self.proc.pressure = np.insert(self.proc.pressure, j, pm * depth + pc)
-            # print(self.proc.pressure[0], self.proc.pressure.size)
 
             # interpolate for temp
             ti = np.array([self.proc.temp[valid][m_ids[0]], self.proc.temp[valid][m_ids[1]]])
             tm, tc = np.linalg.lstsq(a, ti, rcond=None)[0]
-            self.proc.temp = np.insert(self.proc.temp, j, tm * depth + tc)
-            # print(self.proc.temp[0], self.proc.temp.size)
 
             # interpolate for conductivity
             ci = np.array([self.proc.conductivity[valid][m_ids[0]], self.proc.conductivity[valid][m_ids[1]]])
             cm, cc = np.linalg.lstsq(a, ci, rcond=None)[0]
-            self.proc.conductivity = np.insert(self.proc.conductivity, j, cm * depth + cc)
-            # print(self.proc.conductivity[0], self.proc.conductivity.size)
 
             # interpolate for sal
             si = np.array([self.proc.sal[valid][m_ids[0]], self.proc.sal[valid][m_ids[1]]])
             sm, sc = np.linalg.lstsq(a, si, rcond=None)[0]
-            self.proc.sal = np.insert(self.proc.sal, j, sm * depth + sc)
-            # print(self.proc.sal[0], self.proc.sal.size)
 
-            self.proc.depth = np.insert(self.proc.depth, j, depth)
-            self.proc.speed = np.insert(self.proc.speed, j, speed)
-            self.proc.source = np.insert(self.proc.source, j, src)
-            self.proc.flag = np.insert(self.proc.flag, j, Dicts.flags['valid'])
-
-            self.proc.num_samples += 1
+            self.proc.insert(j, pressure=pm * depth + pc, depth=depth, speed=speed, temp=tm * depth + tc,
+                             conductivity=cm * depth + cc, sal=sm * depth + sc, source=src,
+                             flag=Dicts.flags['valid'])
 
     def insert_sis_speed(self, depth, speed, src=Dicts.sources['user'], temp=None, cond=None, sal=None):
         # logger.debug("insert speed to sis data: d:%s, vs:%s" % (depth, speed))
@@ -872,6 +861,7 @@ class Profile:
                 self.sis.conductivity[i] = cond
             if sal is not None:
                 self.sis.sal[i] = sal
+            self.sis.modified()
 
         else:
             # logger.debug("added new sample at depth: %s" % depth)
@@ -897,43 +887,28 @@ class Profile:
             # interpolate for pressure
             pi = np.array([self.sis.pressure[valid][m_ids[0]], self.sis.pressure[valid][m_ids[1]]])
             pm, pc = np.linalg.lstsq(a, pi, rcond=None)[0]
-            self.sis.pressure = np.insert(self.sis.pressure, j, pm * depth + pc)
-            # print(self.sis.pressure[0], self.sis.pressure.size)
 
             # interpolate for temp
             if temp is None:
                 ti = np.array([self.sis.temp[valid][m_ids[0]], self.sis.temp[valid][m_ids[1]]])
                 tm, tc = np.linalg.lstsq(a, ti, rcond=None)[0]
-                self.sis.temp = np.insert(self.sis.temp, j, tm * depth + tc)
-            else:
-                self.sis.temp = np.insert(self.sis.temp, j, temp)
-            # logger.debug("added temperature: %s" % self.sis.temp[j])
+                temp = tm * depth + tc
 
             # interpolate for conductivity
             if cond is None:
                 ci = np.array([self.sis.conductivity[valid][m_ids[0]], self.sis.conductivity[valid][m_ids[1]]])
                 cm, cc = np.linalg.lstsq(a, ci, rcond=None)[0]
-                self.sis.conductivity = np.insert(self.sis.conductivity, j, cm * depth + cc)
-            else:
-                self.sis.conductivity = np.insert(self.sis.conductivity, j, cond)
-            # logger.debug("added conductivity: %s" % self.sis.conductivity[j])
+                cond = cm * depth + cc
 
             # interpolate for sal
             if sal is None:
                 si = np.array([self.sis.sal[valid][m_ids[0]], self.sis.sal[valid][m_ids[1]]])
                 sm, sc = np.linalg.lstsq(a, si, rcond=None)[0]
-                self.sis.sal = np.insert(self.sis.sal, j, sm * depth + sc)
-            else:
-                self.sis.sal = np.insert(self.sis.sal, j, sal)
-            # logger.debug("added salinity: %s" % self.sis.sal[j])
+                sal = sm * depth + sc
 
-            self.sis.depth = np.insert(self.sis.depth, j, depth)
-            self.sis.speed = np.insert(self.sis.speed, j, speed)
-            self.sis.source = np.insert(self.sis.source, j, src)
             # we flag it as thin since the user most likely wants to have this value in the export
-            self.sis.flag = np.insert(self.sis.flag, j, Dicts.flags['thin'])
-
-            self.sis.num_samples += 1
+            self.sis.insert(j, pressure=pm * depth + pc, depth=depth, speed=speed, temp=temp, conductivity=cond,
+                            sal=sal, source=src, flag=Dicts.flags['thin'])
 
     def insert_proc_temp_sal(self, depth, temp, sal):
         logger.debug("insert temp, sal to proc data: d:%s, t:%s, s:%s" % (depth, temp, sal))
@@ -974,6 +949,7 @@ class Profile:
             self.proc.speed[i] = speed
             self.proc.source[i] = Dicts.sources['user']
             self.proc.flag[i] = Dicts.flags['valid']
+            self.proc.modified()
         else:
             # print('new depth')
             if depth < self.proc.depth[valid][0]:
@@ -998,29 +974,21 @@ class Profile:
             # interpolate for pressure
             pi = np.array([self.proc.pressure[valid][m_ids[0]], self.proc.pressure[valid][m_ids[1]]])
             pm, pc = np.linalg.lstsq(a, pi, rcond=None)[0]
-            self.proc.pressure = np.insert(self.proc.pressure, j, pm * depth + pc)
-            # print(self.proc.pressure[0], self.proc.pressure.size)
 
             # interpolate for conductivity
             ci = np.array([self.proc.conductivity[valid][m_ids[0]], self.proc.conductivity[valid][m_ids[1]]])
             cm, cc = np.linalg.lstsq(a, ci, rcond=None)[0]
-            self.proc.conductivity = np.insert(self.proc.conductivity, j, cm * depth + cc)
-            # print(self.proc.conductivity[0], self.proc.conductivity.size)
 
-            self.proc.depth = np.insert(self.proc.depth, j, depth)
-            self.proc.speed = np.insert(self.proc.speed, j, speed)
-            self.proc.temp = np.insert(self.proc.temp, j, temp)
-            self.proc.sal = np.insert(self.proc.sal, j, sal)
-            self.proc.source = np.insert(self.proc.source, j, Dicts.sources['user'])
-            self.proc.flag = np.insert(self.proc.flag, j, Dicts.flags['valid'])
-
-            self.proc.num_samples += 1
+            self.proc.insert(j, pressure=pm * depth + pc, depth=depth, speed=speed, temp=temp,
+                             conductivity=cm * depth + cc, sal=sal, source=Dicts.sources['user'],
+                             flag=Dicts.flags['valid'])
 
     def extend_profile(self, extender, ext_type):
         """ Use the extender samples to extend the profile """
         logger.debug("extension source type: %s" % Dicts.first_match(Dicts.sources, ext_type))
         try:
             extender.cur.proc.source[:] = ext_type
+            extender.cur.proc.modified()
         except AttributeError:
             return False
 
@@ -1139,6 +1107,7 @@ class Profile:
         if self.data.num_samples == 0:
             return
 
+        self.data.modified()  # the readers populate the raw samples in-place
         vi = self.data_valid  # invalid samples (no direction-flagged)
 
         self.init_proc(np.sum(vi))
@@ -1150,6 +1119,7 @@ class Profile:
         self.proc.sal[:] = self.data.sal[vi]
         self.proc.source[:] = self.data.source[vi]
         self.proc.flag[:] = self.data.flag[vi]
+        self.proc.modified()
 
         self.update_proc_time()
 
@@ -1169,6 +1139,7 @@ class Profile:
         self.sis.sal[:] = self.proc.sal
         self.sis.source[:] = self.proc.source
         self.sis.flag[:] = self.proc.flag
+        self.sis.modified()
 
     def update_proc_time(self):
         self.meta.update_proc_time()
@@ -1195,60 +1166,85 @@ class Profile:
     def thin(self, tolerance):
         """Thin the sis data"""
         # logger.info("thinning the sis samples")
+        valid = self.sis_valid
 
         # if the profile is too short, we just pass it back
-        sis_valid_size = self.sis.depth[self.sis_valid].size
+        sis_valid_size = np.count_nonzero(valid)
         if sis_valid_size < 570:
-            self.sis.flag[self.sis_valid] = Dicts.flags['thin']
+            self.sis.flag[valid] = Dicts.flags['thin']
+            self.sis.modified()
             logger.debug("skipping thinning for short profile (%d samples)" % sis_valid_size)
             return True
 
         # - 1000 points for: EM2040, EM710, EM302 and EM122;
         # - 570 points for: EM3000, EM3002, EM1002, EM300, EM120
-        flagged = self.sis.flag[self.sis_valid][:]
-        idx_start = 0
-        idx_end = self.sis.depth[self.sis_valid].size - 1
-        # logger.debug('first: %s, last: %s[%s]'
-        #              % (self.sis.depth[self.sis_valid][idx_start],
-        #                 self.sis.depth[self.sis_valid][idx_end],
-        #                 self.sis.flag[self.sis_valid][idx_end]))
-        self.douglas_peucker_1d(idx_start, idx_end, tolerance=tolerance, data=flagged)
-        self.sis.flag[self.sis_valid] = flagged[:]
+        keep = self.douglas_peucker_1d(self.sis.depth[valid], self.sis.speed[valid], tolerance=tolerance)
+        flagged = self.sis.flag[valid]
+        flagged[keep] = Dicts.flags['thin']
+        self.sis.flag[valid] = flagged
+        self.sis.modified()
 
         # logger.info("thinned: %s" % self.sis.flag[self.sis_thinned].size)
         return True
 
-    def douglas_peucker_1d(self, start, end, tolerance, data):
-        """ Recursive implementation """
-        # logger.debug("dp: %s, %s" % (start, end))
+    def thin_counts(self, tolerances):
+        """Return the number of sis samples that thinning with each of the passed tolerances would keep
 
-        # We always keep end points
-        data[start] = Dicts.flags['thin']
-        data[end] = Dicts.flags['thin']
+        A single Douglas-Peucker pass (down to the smallest tolerance) provides the whole tolerance curve.
+        """
+        valid = self.sis_valid
+        sis_valid_size = np.count_nonzero(valid)
+        if sis_valid_size < 570:  # no thinning for short profiles
+            return [sis_valid_size for _ in tolerances]
 
-        slope = (self.sis.speed[self.sis_valid][end] - self.sis.speed[self.sis_valid][start]) / \
-                (self.sis.depth[self.sis_valid][end] - self.sis.depth[self.sis_valid][start])
+        significance = self.douglas_peucker_significance(self.sis.depth[valid], self.sis.speed[valid],
+                                                         min_tolerance=min(tolerances))
+        significance = np.sort(significance)
+        return [int(sis_valid_size - np.searchsorted(significance, tolerance, side='right'))
+                for tolerance in tolerances]
 
-        max_dist = 0
-        max_ind = 0
-        for ind in range(start + 1, end):
-            dist = abs(self.sis.speed[self.sis_valid][start] +
-                       slope * (self.sis.depth[self.sis_valid][ind] - self.sis.depth[self.sis_valid][start]) -
-                       self.sis.speed[self.sis_valid][ind])
+    @classmethod
+    def douglas_peucker_1d(cls, depths, speeds, tolerance):
+        """Return the keep-mask of the Douglas-Peucker thinning of the passed (contiguous) profile"""
+        return cls.douglas_peucker_significance(depths, speeds, min_tolerance=tolerance) > tolerance
 
-            if dist > max_dist:
-                max_dist = dist
-                max_ind = ind
+    @classmethod
+    def douglas_peucker_significance(cls, depths, speeds, min_tolerance=0.0):
+        """Iterative Douglas-Peucker: for each sample, return the largest tolerance for which it is kept
 
-        if max_dist <= tolerance:
-            return
+        The end points are always kept (infinite significance). The splits are only explored down to the passed
+        min tolerance, thus the samples with a significance <= min_tolerance are all reported as 0.
+        """
+        nr_samples = depths.shape[0]
+        significance = np.zeros(nr_samples)
+        if nr_samples == 0:
+            return significance
+        significance[0] = np.inf
+        significance[-1] = np.inf
+
+        stack = [(0, nr_samples - 1, np.inf)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            while len(stack) > 0:
+                start, end, parent_significance = stack.pop()
+                if end - start < 2:
+                    continue
 
-        else:
-            data[max_ind] = Dicts.flags['thin']
-            # print(max_ind, max_dist, data[max_ind])
-            self.douglas_peucker_1d(start, max_ind, tolerance, data=data)
-            self.douglas_peucker_1d(max_ind, end, tolerance, data=data)
-            return
+                slope = (speeds[end] - speeds[start]) / (depths[end] - depths[start])
+                dist = np.abs(speeds[start] + slope * (depths[start + 1:end] - depths[start]) - speeds[start + 1:end])
+                dist[~(dist > 0.0)] = 0.0  # NaN distances are never selected
+
+                max_ind = int(np.argmax(dist))
+                max_dist = dist[max_ind]
+                if max_dist <= min_tolerance:
+                    continue
+
+                # a sample is only kept if the segment that contains it is split
+                max_ind += start + 1
+                significance[max_ind] = min(max_dist, parent_significance)
+                stack.append((max_ind, end, significance[max_ind]))
+                stack.append((start, max_ind, significance[max_ind]))
+
+        return significance
 
     # - debugging
 
@@ -65,6 +65,7 @@ class ProfileList:
             ssp.cur.sis.sal[1] = end_sal
             ssp.cur.sis.speed[1] = end_speed
             ssp.cur.sis.flag[1] = Dicts.flags['thin']
+            ssp.cur.sis.modified()
         else:
             ssp.cur.init_sis()  # initialize to zero
 
@@ -14,28 +14,29 @@ class TracedProfile:
         self.half_swath = half_swath
 
         # select samples for the ray tracing (must be deeper than the transducer depth)
+        vi = ssp.proc_valid
+        valid_depths = ssp.proc.depth[vi]
+        valid_speeds = ssp.proc.speed[vi]
+
+        # skip samples at depth less than the draft
+        if tss_depth is not None:
+            below_draft = valid_depths > tss_depth
+            valid_depths = valid_depths[below_draft]
+            valid_speeds = valid_speeds[below_draft]
+
+        # stop after the first sample deeper than the avg depth (safer)
+        too_deep = np.nonzero(valid_depths > self.avg_depth)[0]
+        if too_deep.size > 0:
+            valid_depths = valid_depths[:too_deep[0] + 1]
+            valid_speeds = valid_speeds[:too_deep[0] + 1]
+
         depths = list()
         speeds = list()
         if (tss_depth is not None) and (tss_value is not None):
             depths.append(tss_depth)
             speeds.append(tss_value)
-
-        vi = ssp.proc_valid
-
-        for z_idx in range(0, len(ssp.proc.depth[vi])):
-
-            # skip samples at depth less than the draft
-            if tss_depth is not None:
-                if ssp.proc.depth[vi][z_idx] <= tss_depth:
-                    # logger.debug("skipping sample at depth: %.1f" % ssp.proc.depth[z_idx])
-                    continue
-
-            depths.append(ssp.proc.depth[vi][z_idx])
-            speeds.append(ssp.proc.speed[vi][z_idx])
-
-            # stop after the first sample deeper than the avg depth (safer)
-            if ssp.proc.depth[vi][z_idx] > self.avg_depth:
-                break
+        depths.extend(valid_depths.tolist())
+        speeds.extend(valid_speeds.tolist())
 
         # remove extension value (if any)
         if len(depths) > 3:
@@ -50,104 +51,30 @@ class TracedProfile:
         # logger.debug("speeds: %s" % speed)
 
         # ray-trace a few angles (ref: Lurton, An Introduction to UA, p.50-52)
+        angles = np.arange(0, int(math.ceil(self.half_swath + 1)))
+        total_z, total_x, total_t = self.trace_angles(angles=angles, depths=depths, speeds=speeds[:len(depths)])
+
+        if len(depths) > 1:
+            self.harmonic_means = ((total_z[-1] - total_z[0]) / (total_t[:, -1] - total_t[:, 0])).tolist()
+        elif len(depths) == 1:
+            self.harmonic_means = [depths[0]] * len(angles)
+        else:
+            raise RuntimeError("invalid profile with zero valid depth values")
+
+        # interpolate between 0 and 5000 meters with decimetric resolution (all the angles at once)
         self.rays = list()
-        self.harmonic_means = list()
-        for angle in np.arange(0, int(math.ceil(self.half_swath + 1))):
-
-            # ray angles
-            beta = list()
-            beta.append(math.radians(90.0 - angle))
-            total_z = list()
-            total_z.append(depths[0])
-            total_x = list()
-            total_x.append(0)
-            total_t = list()  # total travel time
-            total_t.append(0)
-
-            # logger.debug("angle %d: beta0 %s" % (angle, math.degrees(beta[0])))
-
-            for idx in range(len(depths) - 1):
-
-                # calculate delta (next - current)
-                dz = depths[idx+1] - depths[idx]
-                dc = speeds[idx+1] - speeds[idx]
-                # logger.debug("%s: dy %s, dc %s" % (x, dy, dc))
-
-                if dc == 0:  # "constant speed" case: no curvature
-
-                    if dz == 0:  # if (dc == 0) and (dy == 0):
-
-                        # logger.debug("duplicated point: #%d" % idx)
-                        beta.append(beta[idx])  # beta does not change
-                        continue
-
-                    # gradient = dc/dy
-                    beta.append(beta[idx])  # beta does not change
-                    dx = dz / (math.tan(beta[idx+1]))  # no curvature!
-                    dt = (((dx**2)+(dz**2))**.5) / speeds[idx+1]
-
-                elif dz == 0:  # "same depth" case: just adjust the ray angle
-
-                    beta.append(math.acos((speeds[idx + 1] / speeds[idx]) * (math.cos(beta[idx]))))
-                    continue
-
-                else:  # if (dc != 0) and (dz != 0):
-
-                    gradient = dc / dz  # Lurton, (2.64)
-                    if math.cos(beta[idx]) == 0:
-                        curve = 0
-                    else:  # if math.cos(beta[x]) != 0:
-                        curve = speeds[idx] / (gradient * math.cos(beta[idx]))  # Lurton, (2.66)
-
-                    beta_cos = speeds[idx + 1] * (math.cos(beta[idx])) / speeds[idx]
-                    if beta_cos > 1.0:
-                        logger.warning("angle %d, sample %d -> invalid beta cos: %s" %
-                                       (angle, idx, beta_cos))
-                        beta_cos = 1.0
-                    if beta_cos < -1.0:
-                        logger.warning("angle %d, sample %d -> invalid beta cos: %s" %
-                                       (angle, idx, beta_cos))
-                        beta_cos = -1.0
-
-                    beta.append(math.acos(beta_cos))  # Derived from Lurton, (2.65)
-
-                    dx = curve * ((math.sin(beta[idx])) - (math.sin(beta[idx + 1])))  # Lurton, (2.67)
-                    dt = abs((1 / gradient) *
-                             math.log(
-                                (speeds[idx + 1] / speeds[idx]) *
-                                (abs((1 + math.sin(beta[idx])) / (1 + math.sin(beta[idx + 1]))))))  # Lurton, (2.70)
-
-                total_z.append(total_z[-1] + dz)
-                total_x.append(total_x[-1] + dx)
-                total_t.append(total_t[-1] + dt)
-
-            # logger.debug("z:\n%s" % total_z)
-            # logger.debug("x:\n%s" % total_x)
-            # logger.debug("t:\n%s" % total_t)
-
-            if len(depths) > 1:
-                harm_mean = (total_z[-1] - total_z[0]) / (total_t[-1] - total_t[0])
-            elif len(depths) == 1:
-                harm_mean = depths[0]
-            else:
-                raise RuntimeError("invalid profile with zero valid depth values")
-            self.harmonic_means.append(harm_mean)
-
-            # interpolate between 0 and 5000 meters with decimetric resolution
-            if len(depths) > 1:
-                interp_z = np.linspace(0, 5000, num=25001, endpoint=True)
-                fx = interp1d(total_z, total_x, kind='cubic', bounds_error=False, fill_value=np.nan)
-                interp_x = fx(interp_z)
-                ft = interp1d(total_z, total_t, kind='cubic', bounds_error=False, fill_value=np.nan)
-                interp_t = ft(interp_z)
-            elif len(depths) == 1:
-                interp_z = total_z
-                interp_x = total_x
-                interp_t = total_t
-            else:
-                raise RuntimeError("invalid profile with zero valid depth values")
-
-            self.rays.append(np.array([interp_t, interp_x, interp_z]))
+        if len(depths) > 1:
+            interp_z = np.linspace(0, 5000, num=25001, endpoint=True)
+            fx = interp1d(total_z, total_x, kind='cubic', axis=-1, bounds_error=False, fill_value=np.nan)
+            interp_x = fx(interp_z)
+            ft = interp1d(total_z, total_t, kind='cubic', axis=-1, bounds_error=False, fill_value=np.nan)
+            interp_t = ft(interp_z)
+            for angle_idx in range(len(angles)):
+                self.rays.append(np.array([interp_t[angle_idx], interp_x[angle_idx], interp_z]))
+
+        else:
+            for angle_idx in range(len(angles)):
+                self.rays.append(np.array([total_t[angle_idx], total_x[angle_idx], total_z]))
 
         logger.debug("rays: %d (%d samples per-ray)" % (len(self.rays), len(self.rays[0][0])))
         self.date_time = ssp.meta.utc_time
@@ -155,6 +82,73 @@ class TracedProfile:
         self.longitude = ssp.meta.longitude
         self.data = [depths, speeds]
 
+    @classmethod
+    def trace_angles(cls, angles, depths, speeds):
+        """Ray-trace all the passed launch angles (in degrees from nadir) across all the profile layers
+
+        The layers are evaluated as 2D arrays (angles x layers), using the ray parameter (Snell's law) to
+        retrieve the ray angle at each interface without iterating sample by sample.
+
+        Returns the cumulative depths (shared by all the angles), and the across-track distances and travel
+        times (one row per angle).
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        depths = np.asarray(depths, dtype=np.float64)
+        speeds = np.asarray(speeds, dtype=np.float64)
+        if depths.size == 0:
+            raise RuntimeError("invalid profile with zero valid depth values")
+
+        # delta (next - current) for each layer
+        dz = np.diff(depths)
+        dc = np.diff(speeds)
+
+        # ray angles at each interface: the ray parameter can only decrease when the ray is bent horizontal
+        beta_0 = np.radians(90.0 - angles)
+        ray_param = np.minimum((np.cos(beta_0) / speeds[0])[:, np.newaxis],
+                               1.0 / np.maximum.accumulate(speeds[1:])[np.newaxis, :])
+        beta_cos = speeds[1:] * ray_param
+        nr_invalid = np.count_nonzero(beta_cos > 1.0)
+        if nr_invalid > 0:
+            logger.warning("invalid beta cos: %d (clipped to 1.0)" % nr_invalid)
+        beta = np.empty((angles.size, depths.size), dtype=np.float64)
+        beta[:, 0] = beta_0
+        beta[:, 1:] = np.arccos(np.clip(beta_cos, -1.0, 1.0))  # Derived from Lurton, (2.65)
+
+        # "same depth" layers just adjust the ray angle
+        is_layer = dz != 0
+        is_constant = is_layer & (dc == 0)
+        is_gradient = is_layer & (dc != 0)
+
+        beta_top = beta[:, :-1]
+        beta_bottom = beta[:, 1:]
+        sin_top = np.sin(beta_top)
+        sin_bottom = np.sin(beta_bottom)
+        cos_top = np.cos(beta_top)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gradient = np.where(is_gradient, dc / np.where(is_layer, dz, 1.0), np.nan)  # Lurton, (2.64)
+
+            # "constant speed" case: no curvature
+            dx_constant = dz / np.tan(beta_bottom)
+            dt_constant = np.sqrt(dx_constant ** 2 + dz ** 2) / speeds[1:]
+
+            curve = np.where(cos_top == 0, 0., speeds[:-1] / (gradient * cos_top))  # Lurton, (2.66)
+            dx_gradient = curve * (sin_top - sin_bottom)  # Lurton, (2.67)
+            dt_gradient = np.abs((1 / gradient) *
+                                 np.log((speeds[1:] / speeds[:-1]) *
+                                        np.abs((1 + sin_top) / (1 + sin_bottom))))  # Lurton, (2.70)
+
+        dx = np.where(is_constant, dx_constant, dx_gradient)[:, is_layer]
+        dt = np.where(is_constant, dt_constant, dt_gradient)[:, is_layer]
+
+        total_z = np.cumsum(np.concatenate(([depths[0]], dz[is_layer])))
+        total_x = np.zeros((angles.size, dx.shape[1] + 1), dtype=np.float64)
+        np.cumsum(dx, axis=1, out=total_x[:, 1:])
+        total_t = np.zeros((angles.size, dt.shape[1] + 1), dtype=np.float64)
+        np.cumsum(dt, axis=1, out=total_t[:, 1:])
+
+        return total_z, total_x, total_t
+
     def debug_rays(self, ray_idx=0):
         nr_rays = len(self.rays)
         if (ray_idx < 0) or (ray_idx >= nr_rays):
@@ -5,63 +5,193 @@ logger = logging.getLogger(__name__)
 
 
 class Samples:
-    def __init__(self):
-        self.num_samples = 0
-        self.pressure = None
-        self.depth = None
-        self.speed = None
-        self.temp = None
-        self.conductivity = None
-        self.sal = None
-        self.source = None
-        self.flag = None
+    """Columnar storage of the samples of a profile section
+
+    All the initialized fields are rows of a single 2-D buffer, and each field attribute is a view of the first
+    'num_samples' values of its row. The buffer capacity grows by doubling, so that the resizes and the insertion of
+    single samples are amortized. Assigning an array with a different number of samples (e.g., after a np.insert)
+    keeps it apart from the buffer until the next resize.
+
+    The values derived from the samples (e.g., the validity masks) can be memoized with 'cached'. The memoized
+    values are dropped at each change of the version counter: this happens automatically when the fields are
+    assigned, initialized, resized or inserted, while the code writing in-place into a field must call 'modified'.
+    """
+
+    fields = ('pressure', 'depth', 'speed', 'temp', 'conductivity', 'sal', 'source', 'flag')
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self._num_samples = 0
+        self._rows = dict()  # field name -> row in the buffer
+        self._buffer = np.zeros((0, 0), dtype=self.dtype)
+        self._detached = dict()  # field name -> array not (yet) stored in the buffer
+        self._version = 0
+        self._cache = dict()  # key -> value derived from the current version of the samples
+
+    pressure = property(lambda self: self._get_field('pressure'), lambda self, v: self._set_field('pressure', v))
+    depth = property(lambda self: self._get_field('depth'), lambda self, v: self._set_field('depth', v))
+    speed = property(lambda self: self._get_field('speed'), lambda self, v: self._set_field('speed', v))
+    temp = property(lambda self: self._get_field('temp'), lambda self, v: self._set_field('temp', v))
+    conductivity = property(lambda self: self._get_field('conductivity'),
+                            lambda self, v: self._set_field('conductivity', v))
+    sal = property(lambda self: self._get_field('sal'), lambda self, v: self._set_field('sal', v))
+    source = property(lambda self: self._get_field('source'), lambda self, v: self._set_field('source', v))
+    flag = property(lambda self: self._get_field('flag'), lambda self, v: self._set_field('flag', v))
+
+    @property
+    def num_samples(self):
+        return self._num_samples
+
+    @num_samples.setter
+    def num_samples(self, value):
+        self.resize(value)
+
+    @property
+    def capacity(self):
+        return self._buffer.shape[1]
+
+    @property
+    def version(self):
+        return self._version
+
+    def modified(self):
+        """Signal that the samples have been changed (e.g., by writing in-place into a field)"""
+        self._version += 1
+        self._cache.clear()
+
+    def cached(self, key, func):
+        """Return the value for the passed key, calling func only if not already computed for this version"""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = func()
+            self._cache[key] = value
+            return value
+
+    def _get_field(self, name):
+        if name in self._detached:
+            return self._detached[name]
+        row = self._rows.get(name)
+        if row is None:
+            return None
+        return self._buffer[row, :self._num_samples]
+
+    def _set_field(self, name, value):
+        self.modified()
+        if value is None:
+            self._detached.pop(name, None)
+            self._rows.pop(name, None)  # the row is reused by the next initialized field
+            return
+
+        value = np.asarray(value)
+        if (value.ndim == 1) and (value.shape[0] == self._num_samples):
+            self._detached.pop(name, None)
+            row = self._add_row(name)
+            self._buffer[row, :self._num_samples] = value
+            return
+
+        self._detached[name] = value
+
+    def _add_row(self, name):
+        row = self._rows.get(name)
+        if row is not None:
+            return row
+
+        used = set(self._rows.values())
+        free = [r for r in range(self._buffer.shape[0]) if r not in used]
+        if len(free) > 0:
+            row = free[0]
+            self._buffer[row] = 0.0
+        else:
+            row = self._buffer.shape[0]
+            buffer = np.zeros((row + 1, self._buffer.shape[1]), dtype=self.dtype)
+            buffer[:row] = self._buffer
+            self._buffer = buffer
+
+        self._rows[name] = row
+        return row
+
+    def _reserve(self, count):
+        """Make room for at least 'count' samples (by doubling the capacity)"""
+        if count <= self.capacity:
+            return
+
+        capacity = max(count, 2 * self.capacity)
+        buffer = np.zeros((self._buffer.shape[0], capacity), dtype=self.dtype)
+        buffer[:, :self._num_samples] = self._buffer[:, :self._num_samples]
+        self._buffer = buffer
+
+    def _init_field(self, name):
+        self.modified()
+        self._detached.pop(name, None)
+        row = self._add_row(name)
+        self._buffer[row, :self._num_samples] = 0.0
 
     def init_pressure(self):
-        self.pressure = np.zeros(self.num_samples)
+        self._init_field('pressure')
 
     def init_depth(self):
-        self.depth = np.zeros(self.num_samples)
+        self._init_field('depth')
 
     def init_speed(self):
-        self.speed = np.zeros(self.num_samples)
+        self._init_field('speed')
 
     def init_temp(self):
-        self.temp = np.zeros(self.num_samples)
+        self._init_field('temp')
 
     def init_conductivity(self):
-        self.conductivity = np.zeros(self.num_samples)
+        self._init_field('conductivity')
 
     def init_sal(self):
-        self.sal = np.zeros(self.num_samples)
+        self._init_field('sal')
 
     def init_source(self):
-        self.source = np.zeros(self.num_samples)
+        self._init_field('source')
 
     def init_flag(self):
-        self.flag = np.zeros(self.num_samples)
+        self._init_field('flag')
 
     def resize(self, count):
-        """Resize the arrays (if present) to the new given number of elements"""
-        if self.num_samples == count:
+        """Resize the arrays (if present) to the new given number of elements
+
+        The new samples are zero-filled. Shrinking keeps the allocated capacity.
+        """
+        if (self._num_samples == count) and (len(self._detached) == 0):
             return
-        self.num_samples = count
-
-        if self.pressure is not None:
-            self.pressure = np.resize(self.pressure, count)
-        if self.depth is not None:
-            self.depth = np.resize(self.depth, count)
-        if self.speed is not None:
-            self.speed = np.resize(self.speed, count)
-        if self.temp is not None:
-            self.temp = np.resize(self.temp, count)
-        if self.conductivity is not None:
-            self.conductivity = np.resize(self.conductivity, count)
-        if self.sal is not None:
-            self.sal = np.resize(self.sal, count)
-        if self.source is not None:
-            self.source = np.resize(self.source, count)
-        if self.flag is not None:
-            self.flag = np.resize(self.flag, count)
+
+        self.modified()
+        self._reserve(count)
+        if count > self._num_samples:
+            self._buffer[:, self._num_samples:count] = 0.0
+        self._num_samples = count
+
+        for name, value in list(self._detached.items()):
+            del self._detached[name]
+            row = self._add_row(name)
+            nr = min(value.shape[0], count)
+            self._buffer[row, :nr] = value[:nr]
+            self._buffer[row, nr:count] = 0.0
+
+    def insert(self, index, **values):
+        """Insert a sample before the passed index (the missing fields are zero-filled)"""
+        if len(self._detached) > 0:
+            self.resize(self._num_samples)
+
+        self.modified()
+        self._reserve(self._num_samples + 1)
+        self._buffer[:, index + 1:self._num_samples + 1] = self._buffer[:, index:self._num_samples]
+        self._buffer[:, index] = 0.0
+        self._num_samples += 1
+
+        for name, value in values.items():
+            if name not in self.fields:
+                raise RuntimeError("unknown sample field: %s" % name)
+            row = self._add_row(name)
+            self._buffer[row, index] = value
+
+    def append(self, **values):
+        """Append a sample (the missing fields are zero-filled)"""
+        self.insert(self._num_samples, **values)
 
     def __repr__(self):
         msg = "  <Samples>\n"
@@ -1,6 +1,8 @@
+import copy
 import logging
 import time
 import traceback
+from collections import OrderedDict
 from datetime import datetime
 from threading import Thread, Event
 from typing import List, Optional, TYPE_CHECKING
@@ -11,6 +13,14 @@ logger = logging.getLogger(__name__)
 
 
 class Server(Thread):
+    """Synthetic profile server
+
+    The loop is woken up by the position updates of the SIS (or, as a fallback, NMEA) listener, so that a new
+    profile is transmitted as soon as the vessel enters a new atlas grid cell. The synthetic profiles are cached
+    by source, grid cell, and period (month for the climatological atlases, day for the forecast ones).
+    """
+
+    cache_size = 64
 
     # noinspection PyUnresolvedReferences
     def __init__(self, prj: Optional['SoundSpeedLibrary']):
@@ -19,7 +29,15 @@ class Server(Thread):
         self.delivered_casts = 0
         self.force_send = False
         self.shutdown = Event()
-        self.wait_time = 5
+        self.new_event = Event()  # set by the listeners on new positions, and to force a transmission
+        self.wait_time = 5  # max seconds between two checks (without any event)
+        self.check_interval = 1.0  # min seconds between two checks (the position may be updated at high rate)
+        self.max_pos_wait_time = 60  # max seconds without a valid position
+
+        self.last_pos_time = None  # type: Optional[float]
+        self.pos_warnings = 0
+        self.last_nmea_time = None  # type: Optional[datetime]
+        self.profile_cache = OrderedDict()
 
         self.last_tx_tss = None
 
@@ -223,8 +241,14 @@ class Server(Thread):
 
         self.force_send = False
         self.delivered_casts = 0
+        self.last_pos_time = time.monotonic()
+        self.pos_warnings = 0
+        self.new_event.set()  # first check without waiting
+        self.prj.listeners.sis.subscribe(self.new_event)
+        self.prj.listeners.nmea.subscribe(self.new_event)
 
         count = 0
+        last_check = 0.0
         while True:
             if self.shutdown.is_set():
                 # reset alive all the clients
@@ -232,6 +256,16 @@ class Server(Thread):
                     client.alive = True
                 logger.debug("Shutdown Server Mode")
                 break
+
+            self.new_event.wait(timeout=self.wait_time)
+            elapsed = time.monotonic() - last_check
+            if elapsed < self.check_interval:
+                self.shutdown.wait(self.check_interval - elapsed)
+            self.new_event.clear()
+            if self.shutdown.is_set():
+                continue
+            last_check = time.monotonic()
+
             if (count % 100) == 0:
                 logger.debug("#%05d: running" % count)
 
@@ -245,11 +279,17 @@ class Server(Thread):
                 self.shutdown.set()
                 continue
 
-            time.sleep(60)  # TODO
             count += 1
 
+        self.prj.listeners.sis.unsubscribe(self.new_event)
+        self.prj.listeners.nmea.unsubscribe(self.new_event)
         logger.debug("%s -> ended" % self.name)
 
+    def force(self) -> None:
+        """Request the transmission of a synthetic profile at the next check"""
+        self.force_send = True
+        self.new_event.set()
+
     def check(self) -> None:
         # Retrieve current location/time
         if not self._retrieve_cur_pos():
@@ -276,38 +316,43 @@ class Server(Thread):
         self._transmit_profile()
 
     def _retrieve_cur_pos(self) -> bool:
+        """Retrieve the latest position (not yet used), from SIS or, as a fallback, from NMEA"""
+        self.cur_lat = self.prj.listeners.sis.nav_latitude
+        self.cur_lon = self.prj.listeners.sis.nav_longitude
+        self.cur_tm = self.prj.listeners.sis.nav_timestamp
+        from_nmea = False
+
+        if (self.cur_lat is None) or (self.cur_lon is None) or (self.cur_tm is None):
+            nmea = self.prj.listeners.nmea
+            if (nmea.nav_last_time is not None) and (nmea.nav_last_time != self.last_nmea_time):
+                self.cur_lat = nmea.nav_latitude
+                self.cur_lon = nmea.nav_longitude
+                self.cur_tm = nmea.nav_last_time
+                from_nmea = True
+
+        if (self.cur_lat is None) or (self.cur_lon is None) or (self.cur_tm is None):
+            elapsed = time.monotonic() - self.last_pos_time
+            if elapsed >= self.max_pos_wait_time:
+                self.shutdown.set()
+                msg = 'Unable to retrieve current location and timestamp after %d seconds' % elapsed
+                self.runtime_errors.append(msg)
+                logging.error(msg)
+                return False
 
-        max_attempts = 12
-        cur_attempts = 0
-
-        while True:
-            self.cur_lat = self.prj.listeners.sis.nav_latitude
-            self.cur_lon = self.prj.listeners.sis.nav_longitude
-            self.cur_tm = self.prj.listeners.sis.nav_timestamp
-
-            if (self.cur_lat is None) or (self.cur_lon is None) or (self.cur_tm is None):
-
-                if cur_attempts < max_attempts:
-                    logger.warning("Possible issues in retrieving current location and timestamp. "
-                                   "Waiting %s secs (Ongoing attempt #%d/%d)"
-                                   % (self.wait_time, cur_attempts, max_attempts))
-                    cur_attempts += 1
-                    count = 0
-                    while count < self.wait_time:
-                        time.sleep(1)
-                        count += 1
-
-                else:
-                    self.shutdown.set()
-                    msg = 'Unable to retrieve current location and timestamp after %s seconds' \
-                          % (max_attempts * self.wait_time)
-                    self.runtime_errors.append(msg)
-                    logging.error(msg)
-                    return False
+            # warn once for each wait-time period without a valid position
+            if int(elapsed // self.wait_time) > self.pos_warnings:
+                self.pos_warnings = int(elapsed // self.wait_time)
+                logger.warning("Possible issues in retrieving current location and timestamp. "
+                               "Waited %d secs (max: %d secs)" % (elapsed, self.max_pos_wait_time))
+            return False
 
-            else:
-                self.prj.listeners.sis.clear_nav()
-                return True
+        self.last_pos_time = time.monotonic()
+        self.pos_warnings = 0
+        if from_nmea:
+            self.last_nmea_time = self.cur_tm
+        else:
+            self.prj.listeners.sis.clear_nav()
+        return True
 
     def _retrieve_cur_source_idx(self) -> bool:
         if self.prj.setup.server_source == 'WOA09':  # WOA09 case
@@ -429,31 +474,68 @@ class Server(Thread):
 
         return False
 
-    def _retrieve_new_profile(self) -> bool:
-        # retrieve profile
+    def _cache_key(self) -> tuple:
+        if self.prj.setup.server_source in ['WOA09', 'WOA13', 'WOA18']:
+            period = self.cur_tm.month
+        else:
+            period = self.cur_tm.date()
+        return self.prj.setup.server_source, self.cur_lat_idx, self.cur_lon_idx, period
+
+    def _query_source(self):
         if self.prj.setup.server_source == 'WOA09':  # WOA09 case
-            self.prj.ssp = self.prj.atlases.woa09.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
-                                                        server_mode=True)
+            return self.prj.atlases.woa09.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
+                                                server_mode=True)
 
         elif self.prj.setup.server_source == 'WOA13':  # WOA13 case
-            self.prj.ssp = self.prj.atlases.woa13.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
-                                                        server_mode=True)
+            return self.prj.atlases.woa13.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
+                                                server_mode=True)
 
         elif self.prj.setup.server_source == 'WOA18':  # WOA18 case
-            self.prj.ssp = self.prj.atlases.woa18.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
-                                                        server_mode=True)
+            return self.prj.atlases.woa18.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
+                                                server_mode=True)
 
         elif self.prj.setup.server_source == 'RTOFS':  # RTOFS case
-            self.prj.ssp = self.prj.atlases.rtofs.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
-                                                        server_mode=True)
+            return self.prj.atlases.rtofs.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
+                                                server_mode=True)
 
         elif self.prj.setup.server_source == 'GoMOFS':  # GoMOFS case
-            self.prj.ssp = self.prj.atlases.gomofs.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
-                                                         server_mode=True)
+            return self.prj.atlases.gomofs.query(lat=self.cur_lat, lon=self.cur_lon, dtstamp=self.cur_tm,
+                                                 server_mode=True)
 
         else:
             raise RuntimeError('unable to understand server source: %s' % self.prj.setup.server_source)
 
+    def _cached_profile(self):
+        """Return a copy of the synthetic profile for the current grid cell, stamped with the current position"""
+        key = self._cache_key()
+        ssp = self.profile_cache.get(key)
+        if ssp is None:
+            ssp = self._query_source()
+            if ssp is None:
+                return None
+            self.profile_cache[key] = ssp
+            while len(self.profile_cache) > self.cache_size:
+                self.profile_cache.popitem(last=False)
+        else:
+            self.profile_cache.move_to_end(key)
+            logger.debug('Using the cached synthetic profile for %s' % (key, ))
+
+        ssp = copy.deepcopy(ssp)
+        utc_time = datetime(year=self.cur_tm.year, month=self.cur_tm.month, day=self.cur_tm.day,
+                            hour=self.cur_tm.hour, minute=self.cur_tm.minute, second=self.cur_tm.second)
+        for pr in ssp.l:
+            pr.meta.latitude = self.cur_lat
+            pr.meta.longitude = self.cur_lon
+            pr.meta.utc_time = utc_time
+            if pr.meta.original_path:
+                pr.meta.original_path = "%s_%s" % (pr.meta.original_path.rsplit('_', 2)[0],
+                                                   utc_time.strftime("%Y%m%d_%H%M%S"))
+        return ssp
+
+    def _retrieve_new_profile(self) -> bool:
+        # retrieve profile
+        self.prj.ssp = self._cached_profile()
+
         if not self.prj.has_ssp():
             logger.warning("Unable to retrieve a synthetic cast > Continue the loop")
             return False
@@ -479,3 +561,4 @@ class Server(Thread):
 
     def stop(self) -> None:
         self.shutdown.set()
+        self.new_event.set()
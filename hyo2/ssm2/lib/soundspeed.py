@@ -1,10 +1,12 @@
 import copy
 import logging
+import multiprocessing
 import os
 import re
 import shutil
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Optional, TYPE_CHECKING
 
 from appdirs import user_data_dir
@@ -16,7 +18,9 @@ from hyo2.abc2.lib.progress.cli_progress import CliProgress
 from hyo2.ssm2 import pkg_info
 from hyo2.ssm2.lib import formats
 from hyo2.ssm2.lib.atlas.atlases import Atlases
+from hyo2.ssm2.lib.base import batch
 from hyo2.ssm2.lib.base.callbacks.abstract_callbacks import AbstractCallbacks
+from hyo2.ssm2.lib.base.callbacks.batch_callbacks import BatchCallbacks
 from hyo2.ssm2.lib.base.callbacks.cli_callbacks import CliCallbacks
 from hyo2.ssm2.lib.base.setup import Setup
 from hyo2.ssm2.lib.db.db import ProjectDb
@@ -105,6 +109,8 @@ class SoundSpeedLibrary:
             self.server.stop()
             self.server.join(2)
 
+        self.setup.client_list.close()
+
         logger.info("** > LIB: closed!")
 
     # --- library, release, atlases, and projects folders
@@ -452,8 +458,11 @@ class SoundSpeedLibrary:
         self._retrieve_atlases()
 
     def _retrieve_atlases(self):
-        # retrieve atlases data for each retrieved profile
-        for pr in self.ssp.l:
+        self.query_atlases(ssp=self.ssp)
+
+    def query_atlases(self, ssp: ProfileList) -> None:
+        """Retrieve the atlases data (used to augment and extend) for each profile in the passed list"""
+        for pr in ssp.l:
 
             if self.use_woa09() and self.has_woa09():
                 pr.woa09 = self.atlases.woa09.query(lat=pr.meta.latitude, lon=pr.meta.longitude,
@@ -990,20 +999,23 @@ class SoundSpeedLibrary:
             # special case for Kongsberg asvp/ssp format
             if name == 'asvp/ssp':
 
+                # pick the smallest tolerance that leaves room for the samples added at 0 and 12000 m
                 tolerances = [0.01, 0.03, 0.06, 0.1, 0.5]
-                for tolerance in tolerances:
-
-                    if not self.prepare_sis(thin_tolerance=tolerance):
-                        logger.warning("issue in preparing the data for SIS")
-                        return False
-
-                    si = self.cur.sis_thinned
-                    thin_profile_length = self.cur.sis.flag[si].size
-                    logger.debug("thin profile size: %d (with tolerance: %.3f)" % (thin_profile_length, tolerance))
-                    if thin_profile_length < 1000:
+                self.cur.clone_proc_to_sis()
+                thin_counts = self.cur.thin_counts(tolerances)
+                for tolerance, thin_count in zip(tolerances, thin_counts):
+                    if thin_count + 2 < 1000:
                         break
+                    logger.info("too many samples with tolerance %.3f (%d), using a looser one"
+                                % (tolerance, thin_count))
 
-                    logger.info("too many samples, attempting with a lower tolerance")
+                if not self.prepare_sis(thin_tolerance=tolerance):
+                    logger.warning("issue in preparing the data for SIS")
+                    return False
+
+                si = self.cur.sis_thinned
+                thin_profile_length = self.cur.sis.flag[si].size
+                logger.debug("thin profile size: %d (with tolerance: %.3f)" % (thin_profile_length, tolerance))
 
             # special case (currently only used for Fugro ISS)
             if name == 'ncei':
@@ -1027,6 +1039,81 @@ class SoundSpeedLibrary:
         if self.has_mvp_to_process():
             self.listeners.mvp_to_process = False
 
+    # --- batch processing
+
+    def batch_process(self, data_paths: list, data_format: str, data_formats: Optional[list] = None,
+                      output_paths: Optional[dict] = None, store: bool = True, skip_atlas: bool = False,
+                      max_workers: Optional[int] = None, callbacks: Optional[AbstractCallbacks] = None) -> tuple:
+        """Import, process and (optionally) export and store several files on a pool of worker processes
+
+        Each worker has its own library instance (thus, its own readers and writers), while the profiles are
+        stored in the project db by this process, one at a time. The worker callbacks must be picklable; by
+        default, no user interaction is possible and the files missing required information (e.g., the
+        location) are reported as issues. The workers use the settings saved in the setup db, and the current
+        profile is left unchanged.
+
+        Return the list of data paths with issues and the list of the ones successfully processed.
+        """
+        if data_format not in self.name_readers:
+            raise RuntimeError("unknown input format: %s" % data_format)
+        if data_formats is None:
+            data_formats = list()
+        for name in data_formats:
+            if name not in self.name_writers:
+                raise RuntimeError("unknown output format: %s" % name)
+
+        if output_paths is None:
+            output_paths = dict()
+            for name in data_formats:
+                output_paths[name] = self.outputs_folder
+
+        if callbacks is None:
+            callbacks = BatchCallbacks()
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(min(max_workers, len(data_paths)), 1)
+
+        path_issues = list()
+        path_done = list()
+        if len(data_paths) == 0:
+            return path_issues, path_done
+
+        db = None
+        if store:
+            db = ProjectDb(projects_folder=self.projects_folder, project_name=self.current_project)
+
+        self.progress.start(text="Batch processing")
+        try:
+            # 'spawn' is used since the fork of a process with running threads (e.g., the GUI) is unsafe
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=batch.init_worker,
+                                     initargs=(self.data_folder, self.current_project, callbacks)) as executor:
+                futures = [executor.submit(batch.process_file, data_path, data_format, skip_atlas, data_formats,
+                                           output_paths) for data_path in data_paths]
+
+                for future in as_completed(futures):
+                    data_path, ssp, msg = future.result()
+                    if ssp is None:
+                        logger.warning("unable to process %s: %s" % (data_path, msg))
+                        path_issues.append(data_path)
+
+                    elif (db is not None) and not db.add_casts(ssp):
+                        logger.warning("unable to store %s" % data_path)
+                        path_issues.append(data_path)
+
+                    else:
+                        path_done.append(data_path)
+
+                    self.progress.update(value=int(100 * (len(path_issues) + len(path_done)) / len(data_paths)))
+
+        finally:
+            if db is not None:
+                db.disconnect()
+            self.progress.end()
+
+        logger.info("batch processed: %d files (%d issues)" % (len(path_done), len(path_issues)))
+        return path_issues, path_done
+
     # --- project db
 
     @property
@@ -1067,12 +1154,16 @@ class SoundSpeedLibrary:
         shutil.copy(old_db_path, new_db_path)
         if not os.path.exists(new_db_path):
             raise RuntimeError("unable to copy the project db: %s" % new_db_path)
+        # write-ahead log not yet checkpointed in the project db (if any)
+        if os.path.exists(old_db_path + "-wal"):
+            shutil.copy(old_db_path + "-wal", new_db_path + "-wal")
 
         self.setup.current_project = name
         self.save_settings_to_db()
         self.reload_settings_from_db()
 
         os.remove(old_db_path)
+        self._remove_project_db_sidecars(old_db_path)
 
     def remove_project(self, name: str) -> None:
         if name == self.current_project:
@@ -1083,6 +1174,14 @@ class SoundSpeedLibrary:
             raise RuntimeError("unable to locate the project to delete: %s" % db_path)
 
         os.remove(db_path)
+        self._remove_project_db_sidecars(db_path)
+
+    @classmethod
+    def _remove_project_db_sidecars(cls, db_path: str) -> None:
+        """Remove the write-ahead log and shared-memory files of a project db (if any)"""
+        for suffix in ["-wal", "-shm"]:
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
 
     def list_projects(self) -> list:
         """Return a list with all the available projects"""
@@ -1781,6 +1880,7 @@ class SoundSpeedLibrary:
                 return False
         else:
             self.cur.sis.flag[self.cur.sis_valid] = Dicts.flags['thin']
+            self.cur.sis.modified()
 
         # filter the data for depth
         si = self.cur.sis_thinned
@@ -1801,6 +1901,7 @@ class SoundSpeedLibrary:
             last_depth = depth
 
         self.cur.sis.flag[si] = valid[:]
+        self.cur.sis.modified()
 
         # check depth 0.0
         si = self.cur.sis_thinned
@@ -2014,6 +2115,15 @@ class SoundSpeedLibrary:
     def download_woa18(self) -> bool:
         return self.atlases.woa18.download_db()
 
+    def convert_woa09(self) -> bool:
+        return self.atlases.woa09.convert_grids()
+
+    def convert_woa13(self) -> bool:
+        return self.atlases.woa13.convert_grids()
+
+    def convert_woa18(self) -> bool:
+        return self.atlases.woa18.convert_grids()
+
     def download_rtofs(self, datestamp: Optional['datetime'] = None) -> bool:
         return self.atlases.rtofs.download_db(dtstamp=datestamp)
 
@@ -2142,8 +2252,7 @@ class SoundSpeedLibrary:
         if not self.server.is_alive():
             raise RuntimeError("Server is not alive")
 
-        self.server.force_send = True
-        self.server.check()
+        self.server.force()
 
         return self.server.is_alive()
 
@@ -1,6 +1,11 @@
 import unittest
 import os
 import logging
+import shutil
+import tempfile
+
+import numpy as np
+from netCDF4 import Dataset
 
 from hyo2.ssm2.lib.atlas.regofsoffline import RegOfsOffline
 from hyo2.ssm2.lib.soundspeed import SoundSpeedLibrary
@@ -18,6 +23,50 @@ class TestSoundSpeedAtlasRegofsOffline(unittest.TestCase):
         _ = RegOfsOffline(data_folder=prj.regofs_folder, prj=prj)
         prj.close()
 
+    def test_nearest_node(self):
+        folder = tempfile.mkdtemp()
+        nc_path = os.path.join(folder, "nos.cbofs.fields.n001.nc")
+        rng = np.random.default_rng(42)
+        lats = rng.uniform(36.5, 39.5, 5000)
+        lons = rng.uniform(283.5, 285.0, 5000)  # FVCOM longitudes are positive east
+
+        ds = Dataset(nc_path, "w")
+        ds.title = "CBOFS"
+        ds.createDimension('time', 1)
+        ds.createDimension('node', lats.size)
+        ds.createDimension('siglay', 5)
+        time = ds.createVariable('time', 'f4', ('time', ))
+        time.units = "days since 2020-01-01 00:00:00"
+        time[:] = [10.0]
+        ds.createVariable('lat', 'f4', ('node', ))[:] = lats
+        ds.createVariable('lon', 'f4', ('node', ))[:] = lons
+        ds.createVariable('zeta', 'f4', ('time', 'node'))[:] = np.zeros((1, lats.size))
+        ds.createVariable('siglay', 'f4', ('siglay', 'node'))[:] = \
+            np.repeat(np.linspace(-0.1, -0.9, 5)[:, np.newaxis], lats.size, axis=1)
+        ds.createVariable('h', 'f4', ('node', ))[:] = np.full(lats.size, 20.0)
+        ds.createVariable('temp', 'f4', ('time', 'siglay', 'node'))[:] = np.full((1, 5, lats.size), 12.0)
+        ds.createVariable('salinity', 'f4', ('time', 'siglay', 'node'))[:] = np.full((1, 5, lats.size), 30.0)
+        ds.close()
+
+        prj = SoundSpeedLibrary(data_folder=self.cur_dir)
+        offofs = RegOfsOffline(data_folder=prj.regofs_folder, prj=prj)
+        trees = list()
+        for lat, lon in ((37.0, -75.9), (38.2, -76.4), (39.3, -75.2)):
+            profiles = offofs.query(nc_path=nc_path, lat=lat, lon=lon)
+            nc_lats = offofs._lats
+            nc_lons = offofs._lons - 360.0
+            dists = [offofs.g.distance(nc_lons[i], nc_lats[i], lon, lat) for i in range(nc_lats.size)]
+            closest = int(np.argmin(dists))
+            self.assertAlmostEqual(profiles.cur.meta.latitude, nc_lats[closest])
+            self.assertAlmostEqual(profiles.cur.meta.longitude, nc_lons[closest], places=4)
+            trees.append(offofs._tree)
+            offofs.clear_data()
+        self.assertTrue(all(tree is trees[0] for tree in trees))  # reused across the queries
+        self.assertEqual(os.listdir(folder), ["nos.cbofs.fields.n001.nc"])  # nothing persisted
+
+        prj.close()
+        shutil.rmtree(folder)
+
 
 def suite():
     s = unittest.TestSuite()
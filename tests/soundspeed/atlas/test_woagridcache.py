@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from netCDF4 import Dataset
+
+from hyo2.ssm2.lib.atlas.woagridcache import WoaGridCache
+
+
+class TestSoundSpeedAtlasWoaGridCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.lat = np.arange(-1.5, 2.0, 1.0)
+        self.lon = np.arange(0.5, 5.0, 1.0)
+        self.ds = [self.make_dataset("monthly.nc", num_levels=3),
+                   self.make_dataset("seasonal.nc", num_levels=5)]
+
+    def tearDown(self):
+        for ds in self.ds:
+            ds.close()
+        shutil.rmtree(self.folder)
+
+    def make_dataset(self, name: str, num_levels: int) -> Dataset:
+        ds = Dataset(os.path.join(self.folder, name), "w", diskless=True)
+        ds.createDimension('time', 1)
+        ds.createDimension('depth', num_levels)
+        ds.createDimension('lat', self.lat.size)
+        ds.createDimension('lon', self.lon.size)
+        ds.createVariable('depth', 'f4', ('depth', ))[:] = np.arange(num_levels) * 10.0
+        shape = (1, num_levels, self.lat.size, self.lon.size)
+        for i, name in enumerate(WoaGridCache.grid_names):
+            var = ds.createVariable(name, 'f4', ('time', 'depth', 'lat', 'lon'), fill_value=9.96921E36)
+            values = np.ma.masked_array(np.arange(np.prod(shape), dtype=np.float32).reshape(shape) + i)
+            values[0, -1, 0, 0] = np.ma.masked
+            var[:] = values
+        return ds
+
+    def test_convert_and_load(self):
+        cache = WoaGridCache(data_folder=self.folder, extra_names=['time'])
+        self.assertFalse(cache.load())
+
+        landsea = np.zeros((self.lat.size, self.lon.size))
+        sources = [(self.ds[0], self.ds[0], 0), (self.ds[1], self.ds[1], 0)]
+        self.assertTrue(cache.convert(sources=sources, lat=self.lat, lon=self.lon, landsea=landsea,
+                                      extras={'time': np.array([15.5])}))
+        self.assertTrue(cache.load())
+        self.assertTrue(cache.is_loaded)
+        np.testing.assert_array_equal(cache.levels, [3, 5])
+        self.assertEqual(cache.period_depth(0).size, 3)
+        self.assertEqual(cache.period_depth(1).size, 5)
+
+        for period_idx, ds in enumerate(self.ds):
+            for name in WoaGridCache.grid_names:
+                for lat_idx, lon_idx in ((0, 0), (2, 3)):
+                    expected = ds.variables[name][0, :, lat_idx, lon_idx]
+                    profile = cache.profile(name, period_idx, lat_idx, lon_idx)
+                    np.testing.assert_array_equal(profile.mask, np.ma.getmaskarray(expected))
+                    np.testing.assert_array_equal(profile.compressed(), expected.compressed())
+
+        cache.clear()
+        self.assertFalse(cache.is_loaded)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedAtlasWoaGridCache))
+    return s
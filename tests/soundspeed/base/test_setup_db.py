@@ -220,6 +220,35 @@ class TestSoundSpeedSetupDb(unittest.TestCase):
         self.assertTrue(db.server_apply_surface_sound_speed)
         db.close()
 
+    def test_settings_flushed_on_commit_and_close(self):
+        db = SetupDb(data_folder=self.data_folder, db_file=self.db_name)
+        db.rx_max_wait_time = 123
+        db.use_sippican = True
+        other_db = SetupDb(data_folder=self.data_folder, db_file=self.db_name)
+        self.assertNotEqual(other_db.rx_max_wait_time, 123)
+
+        db.commit()
+        other_db.reload_settings()
+        self.assertEqual(other_db.rx_max_wait_time, 123)
+        self.assertTrue(other_db.use_sippican)
+
+        db.default_vessel = "dummy"
+        db.close()
+        other_db.reload_settings()
+        self.assertEqual(other_db.default_vessel, "dummy")
+        other_db.close()
+
+    def test_settings_follow_setup_activation(self):
+        db = SetupDb(data_folder=self.data_folder, db_file=self.db_name)
+        db.rx_max_wait_time = 123
+        db.add_setup('dummy')
+        db.activate_setup('dummy')
+        self.assertEqual(db.setup_name, 'dummy')
+        self.assertNotEqual(db.rx_max_wait_time, 123)
+        db.activate_setup('default')
+        self.assertEqual(db.rx_max_wait_time, 123)
+        db.close()
+
 
 def suite():
     s = unittest.TestSuite()
@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import platform
+import statistics
+import struct
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+import numpy as np
+
+from hyo2.ssm2 import __version__ as ssm_version
+from hyo2.ssm2.lib.profile.dicts import Dicts
+from hyo2.ssm2.lib.profile.profile import Profile
+
+logger = logging.getLogger(__name__)
+
+
+class Benchmark:
+    """Minimal timing harness for the benchmark tests
+
+    The results are stored with the same layout used by pytest-benchmark ('machine_info' and a list of
+    'benchmarks', each with its 'stats' in seconds), so that the two can be compared with the same tools.
+    The results file is updated in place: a run only replaces the entries with the same name.
+    """
+
+    env_rounds = "SSM_BENCHMARK_ROUNDS"
+    env_output = "SSM_BENCHMARK_JSON"
+
+    def __init__(self, output_path: str, rounds: Optional[int] = None, warmup: int = 1) -> None:
+        self.output_path = os.environ.get(self.env_output, output_path)
+        if rounds is None:
+            rounds = int(os.environ.get(self.env_rounds, 5))
+        self.rounds = max(rounds, 1)
+        self.warmup = warmup
+        self.results = list()
+
+    def run(self, name: str, group: str, func: Callable, *args, **kwargs):
+        """Time the passed function, and return its (last) output"""
+        ret = None
+        for _ in range(self.warmup):
+            ret = func(*args, **kwargs)
+
+        timings = list()
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            ret = func(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+
+        stats = {
+            "min": min(timings),
+            "max": max(timings),
+            "mean": statistics.mean(timings),
+            "median": statistics.median(timings),
+            "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "rounds": len(timings),
+        }
+        self.results.append({"name": name, "group": group, "stats": stats})
+        logger.info("%s [%s]: min %.6f s, median %.6f s" % (name, group, stats["min"], stats["median"]))
+        return ret
+
+    @classmethod
+    def machine_info(cls) -> dict:
+        return {
+            "node": platform.node(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "release": platform.release(),
+            "python_version": platform.python_version(),
+            "numpy_version": np.__version__,
+            "ssm_version": ssm_version,
+        }
+
+    def save(self) -> bool:
+        if len(self.results) == 0:
+            return True
+
+        benchmarks = list()
+        if os.path.exists(self.output_path):
+            try:
+                with open(self.output_path) as fid:
+                    benchmarks = json.load(fid).get("benchmarks", list())
+            except (OSError, ValueError) as e:
+                logger.warning("unable to read previous results in %s: %s" % (self.output_path, e))
+
+        names = {result["name"] for result in self.results}
+        benchmarks = [bench for bench in benchmarks if bench["name"] not in names] + self.results
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+            with open(self.output_path, "w") as fid:
+                json.dump({"machine_info": self.machine_info(), "datetime": datetime.utcnow().isoformat(),
+                           "benchmarks": benchmarks}, fid, indent=2)
+        except OSError as e:
+            logger.error("unable to write the benchmark results to %s: %s" % (self.output_path, e))
+            return False
+
+        logger.info("benchmark results: %s" % self.output_path)
+        self.results = list()
+        return True
+
+
+# --- synthetic data ---
+
+def synthetic_profile(num_samples: int, max_depth: float = 1000.0, seed: int = 42) -> Profile:
+    """A noisy downcast with a thermocline, with raw and processed samples"""
+    rng = np.random.default_rng(seed)
+
+    depth = np.linspace(0.5, max_depth, num_samples)
+    temp = 4.0 + 16.0 / (1.0 + np.exp((depth - 0.1 * max_depth) / (0.02 * max_depth)))
+    temp += rng.normal(0.0, 0.02, num_samples)
+    sal = 34.5 + 0.5 * depth / max_depth + rng.normal(0.0, 0.005, num_samples)
+    speed = 1449.2 + 4.6 * temp - 0.055 * temp ** 2 + 1.34 * (sal - 35.0) + 0.016 * depth
+    speed += rng.normal(0.0, 0.05, num_samples)
+
+    ssp = Profile()
+    ssp.meta.sensor_type = Dicts.sensor_types['Synthetic']
+    ssp.meta.probe_type = Dicts.probe_types['Unknown']
+    ssp.meta.latitude = 43.13555
+    ssp.meta.longitude = -70.9395
+    ssp.meta.utc_time = datetime(2020, 1, 1)
+    ssp.meta.original_path = "synthetic_%d" % num_samples
+
+    ssp.init_data(num_samples)
+    ssp.data.depth[:] = depth
+    ssp.data.pressure[:] = depth
+    ssp.data.speed[:] = speed
+    ssp.data.temp[:] = temp
+    ssp.data.sal[:] = sal
+    ssp.clone_data_to_proc()
+    ssp.init_sis()
+    return ssp
+
+
+def xyz88_datagram(nr_beams: int) -> bytes:
+    """An EM series XYZ88 datagram (as received by the SIS listener)"""
+    data = struct.pack("<BBHIIHH", 2, 0x58, 712, 20200101, 3600000, 1, 123)
+    data += struct.pack("<HHfHHfi", 12000, 15000, 4.5, nr_beams, nr_beams, 12000.0, 0)
+    for idx in range(nr_beams):
+        across = -1000.0 + 2000.0 * idx / max(nr_beams - 1, 1)
+        data += struct.pack("<fffHBbBbh", 50.0 + 0.01 * idx, across, 0.5, 3, 50, -5, 0x00, 1, -300)
+    data += b'\x03\x00\x00'
+    return data
+
+
+def mrz_datagram(nr_soundings: int) -> bytes:
+    """A kmall MRZ datagram with valid soundings, each with a few seabed image samples"""
+    body = struct.pack("<2H", 1, 1) + struct.pack("<2H8B", 12, 1, 1, 0, 1, 0, 0, 0, 1, 0)
+    ping_info_struct = "<2Hf6BH11f2h2BHI3f2Hf2H6f4B2df"
+    ping_info = list(struct.unpack(ping_info_struct, bytes(144)))
+    ping_info[0] = 144  # ping info length
+    ping_info[36] = 1500.0  # tss
+    ping_info[37] = 3.5  # transducer depth
+    body += struct.pack(ping_info_struct, *ping_info)
+    body += struct.pack("<4H4f4H", 32, nr_soundings, nr_soundings, 120, 0, 0, 0, 0, 0, 0, 0, 0)
+    si_samples = 4
+    for idx in range(nr_soundings):
+        values = [idx, 0, 0, 1] + [0] * 6 + [0.0] * 6 + [0, 0] + [0.0] * 14 + \
+                 [50.0 + 0.01 * idx, 0.0, 0.0, 0.0] + [0, 0, 0, si_samples]
+        body += struct.pack('<H8BH6f2H18f4H', *values)
+    body += bytes(2 * si_samples * nr_soundings)
+    length = 20 + len(body) + 4
+    header = struct.pack("<I4cBBHII", length, b'#', b'M', b'R', b'Z', 0, 0, 2040, 1600000000, 0)
+    return header + body + struct.pack("<I", length)
+
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from netCDF4 import Dataset
+
+from hyo2.ssm2.lib import formats
+from hyo2.ssm2.lib.atlas.woagridcache import WoaGridCache
+from hyo2.ssm2.lib.base.callbacks.fake_callbacks import FakeCallbacks
+from hyo2.ssm2.lib.base.setup import Setup
+from hyo2.ssm2.lib.base.testing import SoundSpeedTesting
+from hyo2.ssm2.lib.db.db import ProjectDb
+from hyo2.ssm2.lib.profile.profilelist import ProfileList
+from tests.soundspeed.benchmarks.benchmark import Benchmark, synthetic_profile
+
+
+class TestSoundSpeedBenchmarksMacro(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        data_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir))
+        cls.testing = SoundSpeedTesting(root_folder=data_folder)
+        cls.bench = Benchmark(output_path=os.path.join(cls.testing.output_data_folder(), "benchmarks.json"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.bench.save()
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_readers(self):
+        setup = Setup(release_folder=self.folder)
+        setup.load_from_db()
+
+        # one large recorded cast for each of the most common text formats
+        casts = [("seabird", os.path.join("seabird", "stn_003.cnv")),
+                 ("sippican", os.path.join("sippican", "C4_00003.EDF")),
+                 ("valeport", os.path.join("valeport", "midas", "svp", "FILE9.000"))]
+        for reader_name, cast in casts:
+            path = os.path.join(self.testing.input_data_folder(), cast)
+            if not os.path.exists(path):
+                continue
+            reader = formats.readers[formats.name_readers.index(reader_name)]
+
+            ret = self.bench.run("reader_%s" % reader_name, "readers", reader.read, data_path=path,
+                                 settings=setup, callbacks=FakeCallbacks())
+            self.assertTrue(ret)
+            self.assertGreater(reader.ssp.cur.data.num_samples, 0)
+
+    def test_project_db(self):
+        ssp = ProfileList()
+        for i in range(10):
+            profile = synthetic_profile(2000, seed=i)
+            profile.meta.latitude += 0.1 * i
+            profile.clone_proc_to_sis()
+            ssp.append_profile(profile)
+
+        db = ProjectDb(projects_folder=self.folder, project_name="benchmark")
+        try:
+            self.assertTrue(self.bench.run("project_db_save_10x2000", "project_db", db.add_casts, ssp))
+            pks = [row[0] for row in db.list_profiles()]
+            self.assertEqual(len(pks), 10)
+
+            loaded = self.bench.run("project_db_load_10x2000", "project_db",
+                                    lambda: [db.profile_by_pk(pk) for pk in pks])
+            self.assertEqual(loaded[0].cur.data.num_samples, 2000)
+            bulk = self.bench.run("project_db_bulk_load_10x2000", "project_db", db.samples_by_pks, pks)
+            self.assertEqual(bulk[pks[0]].shape[0], loaded[0].cur.proc.num_samples)
+            self.bench.run("project_db_list_10", "project_db", db.list_profiles)
+
+        finally:
+            db.disconnect()
+
+    def test_atlas_grid_queries(self):
+        lat = np.arange(-89.5, 90.0, 1.0)
+        lon = np.arange(-179.5, 180.0, 1.0)
+        depth = np.arange(57) * 100.0
+        ds = Dataset(os.path.join(self.folder, "grid.nc"), "w", diskless=True)
+        ds.createDimension('time', 1)
+        ds.createDimension('depth', depth.size)
+        ds.createDimension('lat', lat.size)
+        ds.createDimension('lon', lon.size)
+        ds.createVariable('depth', 'f4', ('depth', ))[:] = depth
+        for name in WoaGridCache.grid_names:
+            var = ds.createVariable(name, 'f4', ('time', 'depth', 'lat', 'lon'), fill_value=9.96921E36)
+            for i in range(depth.size):
+                var[0, i] = np.full((lat.size, lon.size), 10.0 - 0.1 * i, dtype=np.float32)
+
+        cache = WoaGridCache(data_folder=self.folder)
+        try:
+            self.assertTrue(cache.convert(sources=[(ds, ds, 0)] * 4, lat=lat, lon=lon,
+                                          landsea=np.zeros((lat.size, lon.size))))
+            self.assertTrue(cache.load())
+
+            rng = np.random.default_rng(42)
+            nodes = list(zip(rng.integers(0, 4, 100), rng.integers(0, lat.size, 100), rng.integers(0, lon.size, 100)))
+
+            def query():
+                return [cache.profile(name, *node) for node in nodes for name in WoaGridCache.grid_names]
+
+            profiles = self.bench.run("atlas_grid_cache_100_queries", "atlas", query)
+            self.assertEqual(profiles[0].size, depth.size)
+
+        finally:
+            cache.clear()
+            ds.close()
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedBenchmarksMacro))
+    return s
@@ -0,0 +1,87 @@
+import os
+import unittest
+
+import numpy as np
+
+from hyo2.ssm2.lib.base.testing import SoundSpeedTesting
+from hyo2.ssm2.lib.formats.km import KmXyz88
+from hyo2.ssm2.lib.formats.kmall import KmallMRZ
+from hyo2.ssm2.lib.profile.dicts import Dicts
+from hyo2.ssm2.lib.profile.oceanography import Oceanography as Oc
+from hyo2.ssm2.lib.profile.ray_tracing.tracedprofile import TracedProfile
+from tests.soundspeed.benchmarks.benchmark import Benchmark, synthetic_profile, xyz88_datagram, mrz_datagram
+
+
+class TestSoundSpeedBenchmarksMicro(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        data_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir))
+        output_folder = SoundSpeedTesting(root_folder=data_folder).output_data_folder()
+        cls.bench = Benchmark(output_path=os.path.join(output_folder, "benchmarks.json"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.bench.save()
+
+    def test_oceanography(self):
+        ssp = synthetic_profile(5000)
+        d, t, s = ssp.proc.depth, ssp.proc.temp, ssp.proc.sal
+
+        speed = self.bench.run("oceanography_speed_5000", "oceanography", Oc.speed, d=d, t=t, s=s, lat=43.0)
+        sal = self.bench.run("oceanography_sal_5000", "oceanography", Oc.sal, d=d, speed=speed, t=t, lat=43.0)
+        np.testing.assert_allclose(sal, s, atol=0.01)
+
+    def test_profile_processing(self):
+        for name, func in (("statistical_filter", "statistical_filter"), ("cosine_smooth", "cosine_smooth")):
+            def process():
+                ssp = synthetic_profile(5000)
+                getattr(ssp, func)()
+                return ssp
+
+            ssp = self.bench.run("profile_%s_5000" % name, "profile", process)
+            self.assertGreater(ssp.proc.num_samples, 0)
+
+        def reduce():
+            ssp = synthetic_profile(5000)
+            ssp.reduce_up_down(Dicts.ssp_directions['down'])
+            return ssp
+
+        ssp = self.bench.run("profile_reduce_up_down_5000", "profile", reduce)
+        self.assertGreater(ssp.data.num_samples, 0)
+
+    def test_thinning(self):
+        def thin():
+            ssp = synthetic_profile(5000)
+            ssp.clone_proc_to_sis()
+            ssp.thin(tolerance=0.1)
+            return ssp
+
+        ssp = self.bench.run("profile_thin_5000", "thinning", thin)
+        self.assertLess(ssp.sis.depth[ssp.sis_thinned].size, ssp.sis.num_samples)
+
+        thinned_size = ssp.sis.depth[ssp.sis_thinned].size
+        ssp.clone_proc_to_sis()
+        counts = self.bench.run("profile_thin_counts_5000", "thinning", ssp.thin_counts, [0.01, 0.03, 0.06, 0.1, 0.5])
+        self.assertEqual(counts[3], thinned_size)
+
+    def test_ray_tracing(self):
+        ssp = synthetic_profile(1000)
+
+        tp = self.bench.run("ray_tracing_66_angles_1000", "ray_tracing", TracedProfile, ssp=ssp, avg_depth=1000.0)
+        self.assertEqual(len(tp.rays), 66)
+
+    def test_datagrams(self):
+        xyz88 = xyz88_datagram(400)
+        mrz = mrz_datagram(1024)
+
+        dg = self.bench.run("datagram_xyz88_400_beams", "datagrams", KmXyz88, xyz88)
+        self.assertEqual(dg.number_beams, 400)
+        dg = self.bench.run("datagram_mrz_1024_soundings", "datagrams", KmallMRZ, mrz)
+        self.assertEqual(dg.soundings.size, 1024)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedBenchmarksMicro))
+    return s
@@ -0,0 +1,86 @@
+import socket
+import struct
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+from hyo2.abc2.lib.progress.cli_progress import CliProgress
+
+from hyo2.ssm2.lib.client.clientlist import ClientList
+from hyo2.ssm2.lib.listener.sis.sis import Sis
+
+
+class TestSoundSpeedClientClientList(unittest.TestCase):
+
+    listen_port = 16310
+    client_ports = [16311, 16312]
+    depth = [0.0, 10.0, 100.0]
+    speed = [1500.0, 1490.0, 1480.0]
+
+    @classmethod
+    def svp_datagram(cls) -> bytes:
+        body = struct.pack('<2H4BIdd', 28, len(cls.depth), 0, 0, 0, 0, 1600000000, 0.0, 0.0)
+        for d, s in zip(cls.depth, cls.speed):
+            body += struct.pack('<2fI2f', d, s, 0, 10.0, 35.0)
+        length = 20 + len(body) + 4
+        return struct.pack("<I4cBBHII", length, b'#', b'S', b'V', b'P', 0, 0, 2040, 1600000000, 0) + body + \
+            struct.pack('<I', length)
+
+    def fake_sis(self, port: int) -> None:
+        """Reply to the received cast with the applied profile, once all the servers have received their cast"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', port))
+        sock.settimeout(5)
+        try:
+            sock.recvfrom(2 ** 16)
+            self.barrier.wait(timeout=5)
+            sock.sendto(self.svp_datagram(), ('127.0.0.1', self.listen_port))
+        finally:
+            sock.close()
+
+    def setUp(self):
+        self.sis = Sis(port=self.listen_port, use_sis5=True)
+        self.sis.start()
+        self.msgs = list()
+        cb = SimpleNamespace(msg_tx_no_verification=lambda **kw: self.msgs.append('no verification'),
+                             msg_tx_sis_wait=lambda **kw: self.msgs.append('wait'),
+                             msg_tx_sis_confirmed=lambda **kw: self.msgs.append('confirmed'),
+                             msg_tx_sis_not_confirmed=lambda **kw: self.msgs.append('not confirmed'))
+        setup = SimpleNamespace(rx_max_wait_time=3, sis_auto_apply_manual_casts=True,
+                                sis_listen_port=self.listen_port)
+        sis_data = SimpleNamespace(depth=np.array(self.depth), speed=np.array(self.speed))
+        self.prj = SimpleNamespace(progress=CliProgress(), listeners=SimpleNamespace(sis=self.sis), cb=cb,
+                                   setup=setup, cur=SimpleNamespace(sis_thinned=np.ones(3, dtype=bool), sis=sis_data))
+
+        self.clients = ClientList()
+        for idx, port in enumerate(self.client_ports):
+            self.clients.add_client('SIS%d:127.0.0.1:%d:SIS' % (idx, port))
+        for client in self.clients.clients:
+            client.prepare_cast = lambda prj, server_mode=False: 'cast'
+
+    def tearDown(self):
+        self.clients.close()
+        self.sis.stop()
+        self.sis.join(3)
+
+    def test_concurrent_confirmation(self):
+        self.barrier = threading.Barrier(len(self.client_ports))
+        servers = [threading.Thread(target=self.fake_sis, args=(port, )) for port in self.client_ports]
+        for server in servers:
+            server.start()
+        time.sleep(0.2)
+
+        # the servers only confirm when both the clients are waiting at the same time
+        self.assertTrue(self.clients.transmit_ssp(prj=self.prj))
+        self.assertEqual(self.msgs, ['confirmed', 'confirmed'])
+
+        for server in servers:
+            server.join()
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedClientClientList))
+    return s
@@ -57,6 +57,64 @@ class TestSoundSpeedDb(unittest.TestCase):
             pk = i % self.max_pk + 1
             test_pk(pk)
 
+    def test_ssp_pk_indices(self):
+        from hyo2.ssm2.lib.db.db import ProjectDb
+        db = ProjectDb(projects_folder=self.lib.projects_folder, project_name=self.lib.current_project)
+        indices = [row['tbl_name'] for row in
+                   db.conn.execute("SELECT tbl_name FROM sqlite_master WHERE type='index' AND name LIKE '%ssp_pk_idx'")]
+        db.disconnect()
+        self.assertEqual(sorted(indices), ['data', 'proc', 'sis'])
+
+    def test_skip_samples_without_depth(self):
+        self.lib.ssp = self.lib.db_retrieve_profile(1)
+        self.lib.ssp.cur.data.depth[0] = np.nan
+        self.assertTrue(self.lib.store_data())
+        self.lib.ssp = self.lib.db_retrieve_profile(1)
+        self.assertEqual(self.lib.ssp.cur.data.num_samples, self.levels - 1)
+        self.assertEqual(self.lib.ssp.cur.proc.num_samples, self.levels)
+
+    def test_skip_samples_without_flag(self):
+        self.lib.ssp = self.lib.db_retrieve_profile(1)
+        self.lib.ssp.cur.data.flag[2] = np.nan  # stored as NULL in a NOT NULL column
+        self.lib.ssp.cur.data.modified()
+        self.assertTrue(self.lib.store_data())
+        self.lib.ssp = self.lib.db_retrieve_profile(1)
+        # the rows before the invalid one are not added twice
+        self.assertEqual(self.lib.ssp.cur.data.num_samples, self.levels - 1)
+        np.testing.assert_array_equal(self.lib.ssp.cur.data.depth, np.delete(self.depth, 2))
+
+    def test_samples_by_pks(self):
+        from hyo2.ssm2.lib.db.db import ProjectDb
+        db = ProjectDb(projects_folder=self.lib.projects_folder, project_name=self.lib.current_project)
+        pks = [row[0] for row in db.list_profiles()]
+        samples = db.samples_by_pks(pks=pks + [999, ], table="proc")
+        db.max_query_params = 2  # multiple chunks
+        self.assertEqual(sorted(db.samples_by_pks(pks=pks).keys()), sorted(pks))
+        self.assertEqual(sorted(db.samples_by_pks().keys()), sorted(pks))
+
+        for pk in pks:
+            ssp = db.profile_by_pk(pk)
+            np.testing.assert_array_equal(samples[pk][:, 1], ssp.cur.proc.depth)
+            np.testing.assert_array_equal(samples[pk][:, 2], ssp.cur.proc.speed)
+            np.testing.assert_array_equal(samples[pk][:, 7], ssp.cur.proc.flag)
+        self.assertEqual(samples[999].shape, (0, 8))
+        self.assertIsNone(db.samples_by_pks(table="ssp"))
+        db.disconnect()
+
+    def test_avg_ssp(self):
+        from hyo2.ssm2.lib.db.plot import PlotDb
+        avg_ssp = PlotDb.AvgSsp()
+        for i in range(5):
+            depths = np.arange(0., 800., 2.5)
+            avg_ssp.add_samples(depths, 1500. + depths * 0.1 + i)
+        avg_ssp.calc_avg()
+
+        self.assertEqual(len(avg_ssp.bins), 78)
+        self.assertEqual(len(avg_ssp.bins[0]), 20)  # [0, 10) m
+        self.assertEqual(avg_ssp.depths[0], 0.)
+        self.assertEqual(avg_ssp.depths[-1], 780.)
+        self.assertAlmostEqual(avg_ssp.mean[1], 1500. + 13.75 * 0.1 + 2.)
+
 
 def suite():
     s = unittest.TestSuite()
@@ -0,0 +1,45 @@
+import io
+import unittest
+from types import SimpleNamespace
+
+from hyo2.ssm2.lib.formats.writers.asvp import Asvp
+from hyo2.ssm2.lib.profile.dicts import Dicts
+from hyo2.ssm2.lib.profile.profilelist import ProfileList
+
+
+class TestSoundSpeedFormatsAsvp(unittest.TestCase):
+
+    def _abs_body(self, nr_thinned):
+        ssp = ProfileList.constant_gradient()
+        ssp.cur.init_sis(3)
+        ssp.cur.sis.depth[:] = [5.0, 10.0, 20.0]
+        ssp.cur.sis.speed[:] = 1490.0
+        ssp.cur.sis.temp[:] = 10.0
+        ssp.cur.sis.sal[:] = 35.0
+        ssp.cur.sis.flag[:] = Dicts.flags['valid']
+        ssp.cur.sis.flag[:nr_thinned] = Dicts.flags['thin']
+        ssp.cur.sis.modified()
+
+        writer = Asvp()
+        writer.ssp = ssp
+        writer.fod = SimpleNamespace(io=io.StringIO())
+        writer._write_body_abs(12)
+        return writer.fod.io.getvalue().splitlines()
+
+    def test_abs_body(self):
+        self.assertEqual(len(self._abs_body(nr_thinned=3)), 3)
+
+    def test_abs_body_few_samples(self):
+        self.assertEqual(self._abs_body(nr_thinned=0), [])
+
+        lines = self._abs_body(nr_thinned=1)
+        self.assertEqual(len(lines), 1)
+        depth, abs_value, mean_abs, _ = lines[0].split()
+        self.assertEqual(depth, "5.000")
+        self.assertEqual(abs_value, mean_abs)  # the mean of a single layer
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedFormatsAsvp))
+    return s
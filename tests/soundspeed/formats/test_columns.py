@@ -0,0 +1,62 @@
+import os
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from hyo2.ssm2.lib.base.callbacks.fake_callbacks import FakeCallbacks
+from hyo2.ssm2.lib.base.testing import SoundSpeedTesting
+from hyo2.ssm2.lib.formats.readers.aml import Aml
+from hyo2.ssm2.lib.formats.readers.mvp import Mvp
+from hyo2.ssm2.lib.profile.dicts import Dicts
+
+
+class TestSoundSpeedColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = SimpleNamespace(ssp_up_or_down=Dicts.ssp_directions['down'], auto_apply_default_metadata=False)
+        data_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir))
+        self.testing = SoundSpeedTesting(root_folder=data_folder)
+
+    def test_parse_columns(self):
+        lines = [
+            "2012-11-05,07:43:35,1.5,1490.25,",
+            "2012-11-05,07:43:36,2.5,1490.50,",
+            "",  # empty
+            "2012-11-05,07:43:37,n/a,1490.75,",  # non-numeric value
+            "2012-11-05,3.5,1491.00,",  # too few fields
+            "2012-11-05,07:43:38,4.5,1491.25,",
+        ]
+        reader = Mvp()
+        columns = reader._parse_columns(lines, columns={'depth': 2, 'speed': -2}, delimiter=",", min_fields=5)
+        np.testing.assert_array_equal(columns['depth'], [1.5, 2.5, 4.5])
+        np.testing.assert_array_equal(columns['speed'], [1490.25, 1490.5, 1491.25])
+
+        reader.batch_size = 2
+        batched = reader._parse_columns(lines, columns={'depth': 2, 'speed': -2}, delimiter=",", min_fields=5)
+        np.testing.assert_array_equal(columns['depth'], batched['depth'])
+        np.testing.assert_array_equal(columns['speed'], batched['speed'])
+
+    def test_nr_fields(self):
+        lines = ["1.0 1500.0", "2.0 1501.0 8.0", "3.0 1502.0"]
+        columns = Mvp()._parse_columns(iter(lines), columns={'depth': 0, 'speed': 1}, nr_fields=2)
+        np.testing.assert_array_equal(columns['depth'], [1.0, 3.0])
+
+        columns = Mvp()._parse_columns([], columns={'depth': 0, 'speed': 1})
+        self.assertEqual(columns['depth'].shape, (0,))
+
+    def test_aml_csv_rows(self):
+        path = os.path.join(self.testing.input_data_folder(), "aml", "030940_2018-01-04_12-03-37.csv")
+        reader = Aml()
+        self.assertTrue(reader.read(data_path=path, settings=self.settings, callbacks=FakeCallbacks()))
+        # 2018-01-04,12:03:38.87,1538.750,0.14,26.654,35.415,1023.141,1538.74
+        self.assertAlmostEqual(reader.ssp.cur.data.depth[0], 0.14)
+        self.assertAlmostEqual(reader.ssp.cur.data.speed[0], 1538.75)
+        self.assertAlmostEqual(reader.ssp.cur.data.temp[0], 26.654)
+        self.assertAlmostEqual(reader.ssp.cur.data.sal[0], 35.415)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedColumns))
+    return s
@@ -0,0 +1,49 @@
+import struct
+import unittest
+
+from hyo2.ssm2.lib.formats import km
+
+
+class TestSoundSpeedFormatsKm(unittest.TestCase):
+
+    @classmethod
+    def header(cls, dg_id: int) -> bytes:
+        return struct.pack("<BBHIIHH", 2, dg_id, 712, 20200101, 3600000, 1, 123)
+
+    def test_xyz88(self):
+        data = self.header(0x58) + struct.pack("<HHfHHfi", 12000, 15000, 4.5, 3, 2, 12000.0, 0)
+        data += struct.pack("<fffHBbBbh", 50.0, -10.0, 0.5, 3, 50, -5, 0x00, 1, -300)
+        data += struct.pack("<fffHBbBbh", 99.0, 0.0, 0.5, 3, 50, -5, 0x80, 1, -300)  # invalid detection
+        data += struct.pack("<fffHBbBbh", 52.0, 10.0, 0.5, 3, 50, -5, 0x00, 1, -250)
+        data += b'\x03\x00\x00'
+
+        xyz88 = km.KmXyz88(data)
+        self.assertEqual(xyz88.number_beams, 3)
+        self.assertAlmostEqual(xyz88.heading, 120.0)
+        self.assertAlmostEqual(xyz88.sound_speed, 1500.0)
+        self.assertEqual(list(xyz88.across), [-10.0, 0.0, 10.0])
+        self.assertEqual(list(xyz88.reflectivity), [-30.0, -30.0, -25.0])
+        self.assertAlmostEqual(xyz88.beam_incidence_angle_adjustment[0], -0.5)
+        self.assertAlmostEqual(xyz88.mean_depth, 51.0 + 4.5)
+
+    def test_watercolumn(self):
+        data = self.header(0x6b) + struct.pack("<6HIhBbB3B", 1, 1, 1, 2, 2, 15000, 1200000, -5, 3, 10, 0, 0, 0, 0)
+        data += struct.pack("<hHBB", -150, 3000, 0, 0)
+        data += struct.pack("<h3H2B", -4500, 0, 3, 2, 0, 0) + b'\x01\x02\x03'
+        data += struct.pack("<h3H2B", 4500, 0, 2, 1, 0, 1) + b'\x04\x05'
+        data += b'\x03\x00\x00'
+
+        wc = km.KmWatercolumn(data)
+        self.assertEqual(list(wc.sector_frequency), [30000.0])
+        self.assertEqual(list(wc.beam_pointing_angle), [-45.0, 45.0])
+        self.assertEqual(wc.samples, [b'\x01\x02\x03', b'\x04\x05'])
+
+    def test_checksum(self):
+        data = bytes(range(20))
+        self.assertEqual(km.Km.calc_2bytes_checksum(data), sum(range(5, 17)))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedFormatsKm))
+    return s
@@ -0,0 +1,50 @@
+import struct
+import unittest
+
+from hyo2.ssm2.lib.formats.kmall import KmallMRZ
+
+
+class TestSoundSpeedFormatsKmall(unittest.TestCase):
+
+    @classmethod
+    def mrz(cls, soundings: list, nr_extra_detections: int = 0) -> bytes:
+        body = struct.pack("<2H", 1, 1) + struct.pack("<2H8B", 12, 1, 1, 0, 1, 0, 0, 0, 1, 0)
+        ping_info_struct = "<2Hf6BH11f2h2BHI3f2Hf2H6f4B2df"
+        ping_info = list(struct.unpack(ping_info_struct, bytes(144)))
+        ping_info[0] = 144  # ping info length
+        ping_info[36] = 1500.0  # tss
+        ping_info[37] = 3.5  # transducer depth
+        body += struct.pack(ping_info_struct, *ping_info)
+        nr_soundings = len(soundings) - nr_extra_detections
+        body += struct.pack("<4H4f4H", 32, nr_soundings, nr_soundings, 120, 0, 0, 0, 0, 0, nr_extra_detections, 0, 0)
+        si_samples = 0
+        for idx, (detection_type, detection_method, z, si_num_samples) in enumerate(soundings):
+            values = [idx, 0, detection_type, detection_method] + [0] * 6 + [0.0] * 6 + [0, 0] + [0.0] * 14 + \
+                     [z, 0.0, 0.0, 0.0] + [0, 0, 0, si_num_samples]
+            body += struct.pack('<H8BH6f2H18f4H', *values)
+            si_samples += si_num_samples
+        body += struct.pack("<%dh" % si_samples, *range(si_samples))
+        length = 20 + len(body) + 4
+        header = struct.pack("<I4cBBHII", length, b'#', b'M', b'R', b'Z', 0, 0, 2040, 1600000000, 0)
+        return header + body + struct.pack("<I", length)
+
+    def test_soundings(self):
+        soundings = [(0, 1, 10.0, 2), (0, 1, 20.0, 3), (1, 1, 99.0, 0), (0, 0, 99.0, 1), (0, 1, 50.0, 4)]
+        mrz = KmallMRZ(self.mrz(soundings, nr_extra_detections=1))
+        self.assertAlmostEqual(mrz.tss, 1500.0)
+        self.assertEqual(mrz.soundings.size, 4)
+        self.assertEqual(mrz.extra_detections.size, 1)
+        self.assertEqual(mrz.extra_detections['z_re_ref_point_m'][0], 50.0)
+        self.assertEqual(list(mrz.seabed_image_samples), list(range(10)))
+        # only the valid main soundings are used
+        self.assertAlmostEqual(mrz.mean_depth, 15.0 + 3.5, places=5)
+
+    def test_no_valid_soundings(self):
+        mrz = KmallMRZ(self.mrz([(1, 1, 10.0, 0)]))
+        self.assertIsNone(mrz.mean_depth)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedFormatsKmall))
+    return s
@@ -0,0 +1,32 @@
+import unittest
+
+from hyo2.ssm2.lib import formats
+from hyo2.ssm2.lib.formats.registry import FormatEntry, FormatRegistry
+
+
+class TestSoundSpeedFormatsRegistry(unittest.TestCase):
+
+    def test_lazy_loading(self):
+        registry = FormatRegistry([FormatEntry(".writers.csv", "Csv", "csv", {"csv"}, "CSV"),
+                                   FormatEntry(".writers.unb", "Unb", "unb", {"unb"}, "UNB")])
+        self.assertEqual(len(registry), 2)
+        self.assertEqual(registry.names, ["csv", "unb"])
+        self.assertFalse(registry.entries[0].is_loaded)
+
+        writer = registry[1]
+        self.assertEqual(writer.name, "unb")
+        self.assertIs(registry[1], writer)
+        self.assertFalse(registry.entries[0].is_loaded)
+
+    def test_metadata_match_formats(self):
+        for registry in (formats.readers, formats.writers):
+            for entry, fmt in zip(registry.entries, registry):
+                self.assertEqual(entry.name, fmt.name)
+                self.assertEqual(entry.ext, fmt.ext)
+                self.assertEqual(entry.desc, fmt.desc)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedFormatsRegistry))
+    return s
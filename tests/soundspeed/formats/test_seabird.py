@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from hyo2.ssm2.lib.base.callbacks.fake_callbacks import FakeCallbacks
+from hyo2.ssm2.lib.base.testing import SoundSpeedTesting
+from hyo2.ssm2.lib.formats.readers.seabird import Seabird
+from hyo2.ssm2.lib.profile.dicts import Dicts
+
+
+class TestSoundSpeedSeabird(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = SimpleNamespace(ssp_up_or_down=Dicts.ssp_directions['down'], auto_apply_default_metadata=False)
+        data_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir))
+        self.testing = SoundSpeedTesting(root_folder=data_folder)
+        self.path = os.path.join(self.testing.input_data_folder(), "seabird", "SBE19Plus_CTP_2013_066_200153.cnv")
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _read(self, path, batch_size=Seabird.batch_size):
+        reader = Seabird()
+        reader.batch_size = batch_size
+        self.assertTrue(reader.read(data_path=path, settings=self.settings, callbacks=FakeCallbacks()))
+        return reader.ssp.cur
+
+    def test_malformed_lines(self):
+        with open(self.path, encoding="utf8") as fid:
+            lines = fid.read().splitlines()
+        end = lines.index("*END*")
+        lines[end + 10] = lines[end + 10] + " 1.0"  # extra value
+        lines[end + 20] = lines[end + 20].replace(".", ",", 1)  # non-numeric value
+        lines.insert(end + 30, "")  # empty line
+        path = os.path.join(self.folder, "malformed.cnv")
+        with open(path, "w", encoding="utf8") as fod:
+            fod.write("\n".join(lines) + "\n")
+
+        clean = self._read(self.path)
+        bulk = self._read(path)
+        batched = self._read(path, batch_size=7)
+
+        self.assertEqual(bulk.data.num_samples, clean.data.num_samples - 2)
+        # the depths are not compared since they depend on the (random) location from the callbacks
+        np.testing.assert_array_equal(bulk.data.pressure, batched.data.pressure)
+        np.testing.assert_array_equal(bulk.data.temp, batched.data.temp)
+        np.testing.assert_array_equal(np.delete(clean.data.pressure, [9, 19]), bulk.data.pressure)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedSeabird))
+    return s
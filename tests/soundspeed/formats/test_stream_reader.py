@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from hyo2.abc2.lib.progress.cli_progress import CliProgress
+from hyo2.ssm2.lib.base.callbacks.fake_callbacks import FakeCallbacks
+from hyo2.ssm2.lib.formats.readers.rbr import RBR
+from hyo2.ssm2.lib.profile.dicts import Dicts
+
+
+class RecordingProgress(CliProgress):
+
+    def __init__(self):
+        super().__init__(use_logger=True)
+        self.texts = list()
+
+    def update(self, value=None, text=None, restart=False):
+        self.texts.append(text)
+        super().update(value=value, text=text, restart=restart)
+
+
+class TestSoundSpeedStreamReader(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = SimpleNamespace(ssp_up_or_down=Dicts.ssp_directions['down'], auto_apply_default_metadata=False)
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "cast_data.txt")
+        with open(self.path, "w", encoding="latin") as fod:
+            fod.write("Time,Conductivity,Temperature,Pressure,Depth,Salinity,Speed of sound,Comment\n")
+            for i in range(5000):
+                fod.write("2020-11-06 11:07:%02d.000,%.3f,%.3f,%.3f,%.3f,%.3f,%.3f,%d\n"
+                          % (i % 60, 40.0, 10.0 - 0.001 * i, 0.1 * i + 1.0, 0.1 * i + 1.0, 35.0, 1490.0 + 0.01 * i, i))
+            fod.write("2020-11-06 12:00:00.000,n/a,,,,,,\n")  # malformed
+            fod.write("2020-11-06 12:00:00.000,40.0,5.0,501.5,501.5,35.0,1540.0,\xb0\n")  # latin only char
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_streamed_read(self):
+        reader = RBR()
+        reader.chunk_size = 4096  # to have several chunks
+        progress = RecordingProgress()
+        self.assertTrue(reader.read(data_path=self.path, settings=self.settings, callbacks=FakeCallbacks(),
+                                    progress=progress))
+
+        self.assertEqual(reader.encoding, 'utf8')  # the latin character is after the first chunk
+        self.assertTrue(reader.fid.io.closed)
+        self.assertGreater(len(progress.texts), 5)
+        self.assertTrue(progress.texts[-1].endswith("100%"))
+
+        profile = reader.ssp.cur
+        self.assertEqual(profile.data.num_samples, 5001)
+        self.assertEqual(profile.more.sa.shape[0], 5001)
+        self.assertAlmostEqual(profile.data.depth[4999], 500.9)
+        self.assertAlmostEqual(profile.data.speed[5000], 1540.0)
+        self.assertEqual(profile.meta.utc_time.second, 2)
+
+    def test_estimate(self):
+        reader = RBR()
+        reader.chunk_size = 4096
+        reader._open(data_path=self.path)
+        next(reader.stream)
+        estimate = reader._estimate_nr_lines()
+        reader._close()
+        self.assertLess(abs(estimate - 5003), 500)
+
+    def test_encoding(self):
+        reader = RBR()
+        self.assertEqual(reader._detect_encoding(self.path), 'latin')
+        reader.chunk_size = 4096
+        self.assertEqual(reader._detect_encoding(self.path), 'utf8')
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedStreamReader))
+    return s
@@ -0,0 +1,40 @@
+import struct
+import unittest
+
+from hyo2.ssm2.lib.listener.sis.sis import Sis
+
+
+class TestSoundSpeedListenerAbstract(unittest.TestCase):
+
+    @classmethod
+    def kmall(cls, dg_type: bytes) -> bytes:
+        return struct.pack('<I', 20) + dg_type + bytes(12)
+
+    def test_bounded_queue(self):
+        listener = Sis(port=16200, use_sis5=True, queue_size=3)
+        for _ in range(5):
+            listener.enqueue(self.kmall(b'#MRZ'), ('127.0.0.1', 16200))
+        self.assertEqual(listener.queue.qsize(), 3)
+        self.assertEqual(listener.dropped_count, 2)
+
+        # a priority datagram replaces the oldest queued one
+        listener.enqueue(self.kmall(b'#SVP'), ('127.0.0.1', 16200))
+        self.assertEqual(listener.queue.qsize(), 3)
+        self.assertEqual(listener.dropped_count, 3)
+        queued = [listener.queue.get_nowait()[0][4:8] for _ in range(3)]
+        self.assertEqual(queued, [b'#MRZ', b'#MRZ', b'#SVP'])
+
+    def test_is_priority(self):
+        listener = Sis(port=16200, use_sis5=True)
+        self.assertTrue(listener.is_priority(self.kmall(b'#SPO')))
+        self.assertFalse(listener.is_priority(self.kmall(b'#MRZ')))
+
+        listener = Sis(port=16200, use_sis5=False)
+        self.assertTrue(listener.is_priority(b'\x02\x55' + bytes(10)))
+        self.assertFalse(listener.is_priority(b'\x02\x58' + bytes(10)))
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedListenerAbstract))
+    return s
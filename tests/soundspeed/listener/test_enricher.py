@@ -0,0 +1,97 @@
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+
+from hyo2.ssm2.lib.base.testing import SoundSpeedTesting
+from hyo2.ssm2.lib.listener.enricher import Enricher
+from hyo2.ssm2.lib.listener.mvp.mvp import Mvp
+from hyo2.ssm2.lib.profile.profilelist import ProfileList
+
+
+class FakeProject:
+
+    def __init__(self):
+        self.setup = SimpleNamespace(auto_apply_default_metadata=True, default_institution="CCOM",
+                                     default_survey="", default_vessel="R/V Gulf Surveyor")
+        self.setup.mvp_transmission_protocol = "UNDEFINED"
+        self.setup.mvp_format = "S12"
+        self.release = threading.Event()
+        self.query_thread = None
+        self.ssp = None
+
+    def query_atlases(self, ssp):
+        self.release.wait(5)
+        self.query_thread = threading.current_thread()
+        for pr in ssp.l:
+            pr.woa13 = "woa13"
+
+
+class TestSoundSpeedListenerEnricher(unittest.TestCase):
+
+    def test_enrich_asynchronously(self):
+        prj = FakeProject()
+        enricher = Enricher(prj=prj)
+        ssp = ProfileList.constant_gradient()
+        published = list()
+
+        # the submission does not wait for the (blocked) atlas query
+        future = enricher.submit(ssp, publish=published.append)
+        self.assertFalse(future.done())
+        self.assertIsNone(ssp.cur.woa13)
+
+        prj.release.set()
+        self.assertIs(future.result(timeout=5), ssp)
+        self.assertEqual(published, [ssp, ])
+        self.assertIsNot(prj.query_thread, threading.current_thread())
+        self.assertEqual(ssp.cur.woa13, "woa13")
+        self.assertEqual(ssp.cur.meta.institution, "CCOM")
+        self.assertEqual(ssp.cur.meta.survey, "")
+        self.assertEqual(ssp.cur.meta.vessel, "R/V Gulf Surveyor")
+
+        enricher.stop()
+
+    def test_publish_on_failure(self):
+        prj = FakeProject()
+        prj.query_atlases = None  # not callable: the enrichment fails
+        enricher = Enricher(prj=prj)
+        ssp = ProfileList.constant_gradient()
+        published = list()
+
+        enricher.submit(ssp, publish=published.append).result(timeout=5)
+        self.assertEqual(published, [ssp, ])
+
+        # a stopped enricher is restarted by a new submission
+        enricher.stop()
+        enricher.submit(ssp, publish=published.append).result(timeout=5)
+        self.assertEqual(len(published), 2)
+        enricher.stop()
+
+    def test_mvp_signal_after_enrichment(self):
+        data_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir))
+        path = os.path.join(SoundSpeedTesting(root_folder=data_folder).input_data_folder(), "mvp",
+                            "MVP_2017-05-20_220137.s12")
+        with open(path, "rb") as fid:
+            data = fid.read()
+
+        prj = FakeProject()
+        enricher = Enricher(prj=prj)
+        listener = Mvp(port=0, prj=prj, enricher=enricher)
+        listener.data = data
+        listener.parse()
+
+        # the GUI is not signaled while the cast is still enriched
+        self.assertFalse(listener.new_ssp.is_set())
+        self.assertIsNone(prj.ssp.cur.woa13)
+
+        prj.release.set()
+        self.assertTrue(listener.new_ssp.wait(5))
+        self.assertEqual(prj.ssp.cur.woa13, "woa13")
+        self.assertTrue(prj.ssp.cur.listener_completed)
+        enricher.stop()
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedListenerEnricher))
+    return s
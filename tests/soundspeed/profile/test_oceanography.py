@@ -76,6 +76,40 @@ class TestSoundSpeedOceanography(unittest.TestCase):
 
         self.assertAlmostEqual(calc_s, trusted_fof_s, places=1)
 
+    def test_sal_array(self):
+        d = np.array([0.0, 10.0, 500.0, 9712.653])
+        t = np.array([10.0, 15.0, 5.0, 20.0])
+        vs = np.array([1480.0, 1505.0, 1480.0, 1687.198])
+
+        calc_s = Oc.sal(d=d, speed=vs, t=t, lat=30.0)
+
+        self.assertEqual(calc_s.shape, d.shape)
+        for i in range(d.size):
+            self.assertEqual(calc_s[i], Oc.sal(d=d[i], speed=vs[i], t=t[i], lat=30.0))
+
+    def test_sal_missing_values(self):
+        self.assertTrue(np.isnan(Oc.sal(d=10.0, speed=np.nan, t=10.0)))
+        self.assertTrue(np.isnan(Oc.sal(d=10.0, speed=1490.0, t=np.nan)))
+        self.assertTrue(np.isnan(Oc.sal(d=np.nan, speed=1490.0, t=10.0)))
+
+        calc_s = Oc.sal(d=np.array([10.0, 10.0]), speed=np.array([1490.0, np.nan]), t=np.array([10.0, 10.0]))
+        self.assertEqual(calc_s[0], Oc.sal(d=10.0, speed=1490.0, t=10.0))
+        self.assertTrue(np.isnan(calc_s[1]))
+
+    def test_attenuation_table(self):
+        f = np.array([12.0, 100.0, 400.0])
+        t = np.array([25.0, 10.0, 2.0])
+        s = np.array([35.0, 34.0, 36.0])
+        d = np.array([0.0, 500.0, 3000.0])
+
+        calc_a = Oc.attenuation(f=f[:, np.newaxis], t=t, s=s, d=d, ph=8.1)
+
+        self.assertEqual(calc_a.shape, (3, 3))
+        for i in range(f.size):
+            for j in range(t.size):
+                self.assertAlmostEqual(calc_a[i, j], Oc.attenuation(f=f[i], t=t[j], s=s[j], d=d[j], ph=8.1),
+                                       places=12)
+
     def test_atg(self):
         # check values from Fofonoff and Millard(1983)
         atg_ck = 3.255976e-4
@@ -125,6 +159,20 @@ class TestSoundSpeedOceanography(unittest.TestCase):
 
         self.assertAlmostEqual(c_calc, c_ck, places=1)
 
+    def test_temp_and_conductivity_array(self):
+        s = np.array([35.0, 30.0, 36.616, 0.0])
+        t = np.array([10.0, 2.0, 40.0, 20.0])
+        p = np.array([0.0, 500.0, 10000.0, 100.0])
+
+        calc_t = Oc.in_situ_temp(s=s, t=t, p=p, pr=0.0)
+        calc_c = Oc.s2c(s=s, p=p, t=t)
+
+        self.assertEqual(calc_t.shape, s.shape)
+        self.assertEqual(calc_c.shape, s.shape)
+        for i in range(s.size):
+            self.assertEqual(calc_t[i], Oc.in_situ_temp(s=s[i], t=t[i], p=p[i], pr=0.0))
+            self.assertEqual(calc_c[i], Oc.s2c(s=s[i], p=p[i], t=t[i]))
+
     def test_dyn_height_1000(self):
         # absolute salinity
         sa = np.array([34.7118, 34.8915, 35.0256, 34.8472, 34.7366, 34.7324])
@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+
+from hyo2.ssm2.lib.profile.dicts import Dicts
+from hyo2.ssm2.lib.profile.more import More
+from hyo2.ssm2.lib.profile.profile import Profile
+from hyo2.ssm2.lib.profile.samples import Samples
+
+
+class TestSoundSpeedSamples(unittest.TestCase):
+
+    def test_columnar_views(self):
+        samples = Samples()
+        samples.num_samples = 10
+        samples.init_depth()
+        samples.init_speed()
+        self.assertIsNone(samples.temp)
+
+        samples.depth[:] = np.arange(10)
+        samples.speed = np.full(10, 1500.0)
+        self.assertIs(samples.depth.base, samples.speed.base)  # same buffer
+
+        samples.resize(4)
+        np.testing.assert_array_equal(samples.depth, np.arange(4))
+        self.assertEqual(samples.capacity, 10)  # shrinking does not reallocate
+
+        samples.resize(6)
+        np.testing.assert_array_equal(samples.depth, [0, 1, 2, 3, 0, 0])
+
+    def test_amortized_growth(self):
+        samples = Samples()
+        capacities = set()
+        for i in range(1000):
+            samples.append(depth=float(i), speed=1500.0 + i)
+            capacities.add(samples.capacity)
+        self.assertEqual(samples.num_samples, 1000)
+        self.assertLessEqual(len(capacities), 11)  # doubling
+        np.testing.assert_array_equal(samples.depth, np.arange(1000))
+
+        samples.insert(0, depth=-1.0, speed=1499.0)
+        self.assertEqual(samples.num_samples, 1001)
+        np.testing.assert_array_equal(samples.depth[:3], [-1.0, 0.0, 1.0])
+        np.testing.assert_array_equal(samples.speed[:2], [1499.0, 1500.0])
+
+        with self.assertRaises(RuntimeError):
+            samples.append(density=1.0)
+
+    def test_detached_assignment(self):
+        samples = Samples()
+        samples.num_samples = 3
+        samples.init_depth()
+        samples.init_flag()
+        samples.depth = np.insert(samples.depth, 1, 5.0)
+        self.assertEqual(samples.depth.size, 4)
+        self.assertEqual(samples.flag.size, 3)
+
+        samples.num_samples = samples.depth.size
+        np.testing.assert_array_equal(samples.depth, [0.0, 5.0, 0.0, 0.0])
+        self.assertEqual(samples.flag.size, 4)
+
+    def test_float32(self):
+        ssp = Profile(dtype=np.float32)
+        ssp.init_data(100)
+        self.assertEqual(ssp.data.speed.dtype, np.float32)
+        self.assertEqual(ssp.data._buffer.nbytes, 8 * 100 * 4)
+
+    def test_version(self):
+        samples = Samples()
+        samples.num_samples = 3
+        samples.init_flag()
+        version = samples.version
+        self.assertEqual(samples.cached('key', lambda: 1), 1)
+        self.assertEqual(samples.cached('key', lambda: 2), 1)  # memoized
+
+        samples.flag[0] = 1
+        self.assertEqual(samples.version, version)  # in-place writes are not tracked
+        samples.modified()
+        self.assertGreater(samples.version, version)
+        self.assertEqual(samples.cached('key', lambda: 3), 3)
+
+        version = samples.version
+        samples.insert(0, flag=0)
+        self.assertGreater(samples.version, version)
+        self.assertEqual(samples.cached('key', lambda: 4), 4)
+
+    def test_cached_masks(self):
+        ssp = Profile()
+        ssp.init_data(10)
+        ssp.data.depth[:] = np.arange(10)
+        ssp.data.speed[:] = 1500.0 + np.arange(10)
+        ssp.clone_data_to_proc()
+
+        valid = ssp.proc_valid
+        self.assertIs(ssp.proc_valid, valid)
+        self.assertFalse(valid.flags.writeable)
+        self.assertEqual(ssp.proc_speed_max, 1509.0)
+        self.assertEqual(ssp.nr_valid_proc_samples, 10)
+
+        ssp.proc.flag[9] = Dicts.flags['user']
+        ssp.proc.modified()
+        self.assertIsNot(ssp.proc_valid, valid)
+        self.assertTrue(valid[9])  # the previously returned mask is not changed
+        self.assertFalse(ssp.proc_valid[9])
+        self.assertEqual(ssp.proc_speed_max, 1508.0)
+        self.assertEqual(ssp.nr_valid_proc_samples, 9)
+
+        ssp.insert_proc_speed(depth=4.5, speed=1504.5)
+        self.assertEqual(ssp.nr_valid_proc_samples, 10)
+
+    def test_more(self):
+        more = More()
+        more.init_struct_array(5, ['Depth', 'Density', 'Status'])
+        self.assertEqual(more.sa.shape, (5,))
+        more.sa['Density'][2] = 1025.0
+        more.resize(3)
+        self.assertEqual(more.sa['Density'][2], 1025.0)
+        more.resize(4)
+        self.assertEqual(more.sa['Density'][3], 0.0)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedSamples))
+    return s
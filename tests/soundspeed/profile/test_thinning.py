@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+
+from hyo2.ssm2.lib.profile.dicts import Dicts
+from hyo2.ssm2.lib.profile.profile import Profile
+
+
+class TestSoundSpeedThinning(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.ssp = Profile()
+        self.ssp.init_sis(2000)
+        self.ssp.sis.depth[:] = np.linspace(0.0, 1000.0, 2000)
+        self.ssp.sis.speed[:] = 1500.0 + np.cumsum(rng.normal(0.0, 0.05, 2000))
+
+    def test_douglas_peucker_1d(self):
+        # a straight line only needs its end points
+        depths = np.linspace(0.0, 100.0, 11)
+        keep = Profile.douglas_peucker_1d(depths, 1500.0 + 0.1 * depths, tolerance=0.01)
+        np.testing.assert_array_equal(np.flatnonzero(keep), [0, 10])
+
+        speeds = 1500.0 + 0.1 * depths
+        speeds[4] += 1.0
+        keep = Profile.douglas_peucker_1d(depths, speeds, tolerance=0.5)
+        np.testing.assert_array_equal(np.flatnonzero(keep), [0, 3, 4, 5, 10])
+
+    def test_thin(self):
+        self.ssp.sis.flag[5] = Dicts.flags['user']
+        self.ssp.thin(tolerance=0.1)
+        self.assertEqual(self.ssp.sis.flag[5], Dicts.flags['user'])
+        nr_thinned = np.count_nonzero(self.ssp.sis_thinned)
+        self.assertLess(nr_thinned, 2000)
+        self.assertGreater(nr_thinned, 2)
+
+    def test_thin_counts(self):
+        tolerances = [0.01, 0.03, 0.06, 0.1, 0.5]
+        counts = self.ssp.thin_counts(tolerances)
+        self.assertEqual(counts, sorted(counts, reverse=True))
+
+        for tolerance, count in zip(tolerances, counts):
+            self.ssp.sis.flag[:] = Dicts.flags['valid']
+            self.ssp.thin(tolerance=tolerance)
+            self.assertEqual(np.count_nonzero(self.ssp.sis_thinned), count)
+
+    def test_short_profile(self):
+        self.ssp.init_sis(100)
+        self.ssp.sis.depth[:] = np.arange(100)
+        self.assertEqual(self.ssp.thin_counts([0.1, 0.5]), [100, 100])
+        self.ssp.thin(tolerance=0.5)
+        self.assertEqual(np.count_nonzero(self.ssp.sis_thinned), 100)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedThinning))
+    return s
@@ -0,0 +1,56 @@
+import math
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from hyo2.ssm2.lib.profile.profile import Profile
+from hyo2.ssm2.lib.profile.ray_tracing.tracedprofile import TracedProfile
+
+
+class TestSoundSpeedTracedProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.ssp = Profile()
+        self.ssp.init_proc(101)
+        self.ssp.proc.depth = np.linspace(0.0, 100.0, 101)
+        self.ssp.proc.speed = np.full(101, 1500.0)
+        self.ssp.meta.latitude = 43.13555
+        self.ssp.meta.longitude = -70.9395
+        self.ssp.meta.utc_time = datetime.utcnow()
+
+    def test_constant_speed(self):
+        tp = TracedProfile(ssp=self.ssp, avg_depth=100.0, half_swath=60)
+        self.assertEqual(len(tp.rays), 61)
+        self.assertEqual(len(tp.harmonic_means), 61)
+        for angle, hm in enumerate(tp.harmonic_means):
+            self.assertAlmostEqual(hm, 1500.0 * math.cos(math.radians(angle)), places=6)
+
+        # straight rays: x = z * tan(angle)
+        z_idx = 250  # 50 m
+        for angle in (0, 30, 60):
+            ray = tp.rays[angle]
+            self.assertAlmostEqual(ray[2][z_idx], 50.0, places=6)
+            self.assertAlmostEqual(ray[1][z_idx], 50.0 * math.tan(math.radians(angle)), places=3)
+
+    def test_all_angles_match_single_angle_trace(self):
+        self.ssp.proc.speed = np.linspace(1530.0, 1490.0, 101)
+        depths = self.ssp.proc.depth
+        speeds = self.ssp.proc.speed
+        angles = np.arange(0, 66)
+
+        total_z, total_x, total_t = TracedProfile.trace_angles(angles=angles, depths=depths, speeds=speeds)
+        self.assertEqual(total_x.shape, (66, 101))
+        self.assertEqual(total_t.shape, (66, 101))
+        np.testing.assert_allclose(total_z, depths)
+
+        for angle in (0, 20, 45, 65):
+            z, x, t = TracedProfile.trace_angles(angles=[angle], depths=depths, speeds=speeds)
+            np.testing.assert_allclose(x[0], total_x[angle])
+            np.testing.assert_allclose(t[0], total_t[angle])
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedTracedProfile))
+    return s
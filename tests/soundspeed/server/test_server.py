@@ -0,0 +1,101 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+from hyo2.ssm2.lib.listener.nmea.nmea import Nmea
+from hyo2.ssm2.lib.listener.sis.sis import Sis
+from hyo2.ssm2.lib.profile.profilelist import ProfileList
+from hyo2.ssm2.lib.server.server import Server
+
+
+class FakeAtlas:
+
+    def __init__(self):
+        self.queries = 0
+
+    def query(self, lat, lon, dtstamp, server_mode=False):
+        self.queries += 1
+        ssp = ProfileList.constant_gradient()
+        ssp.cur.meta.latitude = lat
+        ssp.cur.meta.longitude = lon
+        ssp.cur.meta.utc_time = dtstamp
+        ssp.cur.meta.original_path = "WOA13_%s" % dtstamp.strftime("%Y%m%d_%H%M%S")
+        return ssp
+
+
+class CountingServer(Server):
+
+    def __init__(self, prj):
+        super().__init__(prj=prj)
+        self.checked = threading.Event()
+
+    def check(self) -> None:
+        self.checked.set()
+
+
+class TestSoundSpeedServer(unittest.TestCase):
+
+    def setUp(self):
+        self.prj = SimpleNamespace(
+            setup=SimpleNamespace(server_source='WOA13', server_max_failed_attempts=5,
+                                  client_list=SimpleNamespace(clients=list())),
+            listeners=SimpleNamespace(sis=Sis(port=16201), nmea=Nmea(port=16202)),
+            atlases=SimpleNamespace(woa13=FakeAtlas()))
+
+    def test_cached_profile(self):
+        server = Server(prj=self.prj)
+        server.cur_lat, server.cur_lon = 43.1, -70.9
+        server.cur_lat_idx, server.cur_lon_idx = 10, 20
+        server.cur_tm = datetime(2020, 6, 1, 12, 0, 0)
+
+        ssp = server._cached_profile()
+        self.assertEqual(self.prj.atlases.woa13.queries, 1)
+
+        # same grid cell and month: no new query, but the profile is stamped with the new position and time
+        server.cur_lat, server.cur_lon = 43.2, -70.8
+        server.cur_tm = datetime(2020, 6, 20, 8, 30, 0)
+        cached = server._cached_profile()
+        self.assertEqual(self.prj.atlases.woa13.queries, 1)
+        self.assertIsNot(cached, ssp)
+        self.assertEqual(cached.cur.meta.latitude, 43.2)
+        self.assertEqual(cached.cur.meta.utc_time, datetime(2020, 6, 20, 8, 30, 0))
+        self.assertEqual(cached.cur.meta.original_path, "WOA13_20200620_083000")
+        self.assertEqual(ssp.cur.meta.latitude, 43.1)
+
+        # new grid cell
+        server.cur_lat_idx = 11
+        server._cached_profile()
+        self.assertEqual(self.prj.atlases.woa13.queries, 2)
+
+        # new month
+        server.cur_tm = datetime(2020, 7, 1, 0, 0, 0)
+        server._cached_profile()
+        self.assertEqual(self.prj.atlases.woa13.queries, 3)
+
+    def test_woken_by_listener(self):
+        server = CountingServer(prj=self.prj)
+        server.wait_time = 30
+        server.check_interval = 0.0
+        server.start()
+        try:
+            self.assertTrue(server.checked.wait(5))  # first check at start
+            server.checked.clear()
+
+            self.prj.listeners.nmea.notify()
+            start = time.monotonic()
+            self.assertTrue(server.checked.wait(5))
+            self.assertLess(time.monotonic() - start, 1.0)
+
+        finally:
+            server.stop()
+            server.join(5)
+        self.assertFalse(server.is_alive())
+        self.assertEqual(self.prj.listeners.nmea.subscribers, list())
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedServer))
+    return s
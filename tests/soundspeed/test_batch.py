@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hyo2.ssm2.lib.base.callbacks.fake_callbacks import FakeCallbacks
+from hyo2.ssm2.lib.base.testing import SoundSpeedTesting
+from hyo2.ssm2.lib.soundspeed import SoundSpeedLibrary
+
+
+class TestSoundSpeedBatch(unittest.TestCase):
+
+    def setUp(self):
+        data_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+        self.testing = SoundSpeedTesting(root_folder=data_folder)
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_batch_process(self):
+        lib = SoundSpeedLibrary(data_folder=self.folder, callbacks=FakeCallbacks())
+        lib.current_project = "batch"
+
+        tests = self.testing.input_dict_test_files(inclusive_filters=["seabird", ])
+        data_paths = sorted(path for path in tests if os.path.basename(path)[0] == "_")
+        self.assertGreater(len(data_paths), 1)
+        missing_path = os.path.join(self.folder, "missing.cnv")
+
+        issues, done = lib.batch_process(data_paths=data_paths + [missing_path, ], data_format="seabird",
+                                         data_formats=["csv", ], output_paths={"csv": self.folder},
+                                         max_workers=2, callbacks=FakeCallbacks())
+
+        self.assertEqual(issues, [missing_path, ])
+        self.assertEqual(sorted(done), data_paths)
+        # casts with the same timestamp and position (e.g., reprocessed files) share the same db entry
+        self.assertGreater(len(lib.db_list_profiles()), 0)
+        self.assertLessEqual(len(lib.db_list_profiles()), len(data_paths))
+        self.assertGreater(len([name for name in os.listdir(self.folder) if name.endswith(".csv")]), 0)
+        self.assertIsNone(lib.ssp)
+
+        lib.close()
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedBatch))
+    return s
@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from hyo2.ssm2.app.gui.soundspeedmanager.widgets.decimation import decimate
+
+
+class TestSoundSpeedManagerDecimation(unittest.TestCase):
+
+    def setUp(self):
+        self.depths = np.linspace(0.0, 1000.0, 20001)
+        self.values = 1500.0 - 0.05 * self.depths
+        self.values[12345] = 1600.0  # spike
+
+    def test_small_profile(self):
+        ids = decimate(values=self.values[:100], depths=self.depths[:100], max_points=2000)
+        np.testing.assert_array_equal(ids, np.arange(100))
+
+    def test_min_max_preserving(self):
+        ids = decimate(values=self.values, depths=self.depths, max_points=2000)
+        self.assertLessEqual(ids.size, 2000)
+        self.assertTrue(np.all(np.diff(ids) > 0))
+        self.assertIn(12345, ids)  # the spike is kept
+        self.assertEqual(ids[0], 0)
+        self.assertEqual(ids[-1], self.depths.size - 1)
+
+    def test_viewport(self):
+        ids = decimate(values=self.values, depths=self.depths, depth_range=(600.0, 500.0), max_points=4000)
+        # all the visible samples, plus one on each side to cross the viewport border
+        self.assertEqual(ids[0], 9999)
+        self.assertEqual(ids[-1], 12001)
+        self.assertEqual(ids.size, 2003)
+
+        ids = decimate(values=self.values, depths=self.depths, depth_range=(700.0, 500.0), max_points=400)
+        self.assertLessEqual(ids.size, 400)
+        self.assertIn(12345, ids)
+
+
+def suite():
+    s = unittest.TestSuite()
+    s.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSoundSpeedManagerDecimation))
+    return s